@@ -0,0 +1,94 @@
+import hashlib
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from models import db, CacheEntry
+
+
+def sha256_file(path: str, chunk_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def sha256_bytes(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def sha256_text(text: str) -> str:
+    """Hash of the case- and whitespace-normalized text, so trivially different summaries share a key."""
+    return hashlib.sha256(" ".join(text.lower().split()).encode("utf-8")).hexdigest()
+
+
+class AnalysisCache:
+    def __init__(self, app, ttl_seconds: int):
+        """
+        SQLite-backed cache keyed by content hash, shared by every worker process.
+        :param app: Flask app, for an app context when called from job threads.
+        :param ttl_seconds: Entries expire this long after they were written.
+        """
+        self.app = app
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[str, int]] = {}  # namespace -> hits/misses since start
+
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        with self.app.app_context():
+            entry = db.session.get(CacheEntry, (namespace, key))
+            if entry is not None and entry.expires_at <= datetime.utcnow():
+                db.session.delete(entry)
+                db.session.commit()
+                entry = None
+
+            if entry is None:
+                self._count(namespace, "misses")
+                return None
+
+            entry.hit_count += 1
+            payload = entry.payload
+            db.session.commit()
+        self._count(namespace, "hits")
+        return payload
+
+    def put(self, namespace: str, key: str, payload: Any):
+        now = datetime.utcnow()
+        with self.app.app_context():
+            # Expired rows are dropped on write so the table stays bounded without a sweeper
+            CacheEntry.query.filter(CacheEntry.expires_at <= now).delete()
+            db.session.merge(CacheEntry(
+                namespace=namespace,
+                key=key,
+                payload=payload,
+                created_at=now,
+                expires_at=now + self.ttl,
+                hit_count=0
+            ))
+            db.session.commit()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Hit/miss counters since start-up plus live entry counts per namespace."""
+        with self.app.app_context():
+            rows = (
+                db.session.query(CacheEntry.namespace, db.func.count(), db.func.sum(CacheEntry.hit_count))
+                .filter(CacheEntry.expires_at > datetime.utcnow())
+                .group_by(CacheEntry.namespace)
+                .all()
+            )
+        with self._lock:
+            stats = {ns: dict(counters) for ns, counters in self._counters.items()}
+        for namespace, entries, total_hits in rows:
+            stats.setdefault(namespace, {}).update(entries=entries, stored_hits=int(total_hits or 0))
+        for counters in stats.values():
+            counters.setdefault("hits", 0)
+            counters.setdefault("misses", 0)
+            lookups = counters["hits"] + counters["misses"]
+            counters["hit_rate"] = round(counters["hits"] / lookups, 3) if lookups else None
+        return stats
+
+    def _count(self, namespace: str, outcome: str):
+        with self._lock:
+            counters = self._counters.setdefault(namespace, {"hits": 0, "misses": 0})
+            counters[outcome] += 1
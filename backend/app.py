@@ -1,17 +1,33 @@
-from flask import Flask, request, jsonify, send_file, render_template
+from flask import Flask, Response, g, request, jsonify, send_file, render_template
 from flask_cors import CORS
-from voice_processor import AudioTranscriber
-from resume_parser import ResumeParser
-from question_gen import QuestionGenerator
-from models import db, Interview
-from tts_generator import generate_audio_questions
-from gtts import gTTS
-from pydub import AudioSegment
+from transcription_service import TranscriptionService, TranscriptionBusy
+from incremental_transcriber import IncrementalTranscriptionRegistry
+from resume_parser import ResumeParser, ResumeAnalysis, NAME_NOT_FOUND
+from keyword_index import load_keyword_index
+from speech_analytics import SpeechAnalytics, analyze_words, speech_confidence
+from structured_output import AnswerEvaluation
+from model_registry import ModelRegistry
+from models import db, apply_sqlite_pragmas, prepare_schema
+from interview_store import InterviewStore
+from proctor_log import ProctorLog
+from stage_executor import Stage, StageExecutor
+from jobs import JobManager
+from artifact_store import ArtifactStore, atomic_output
+from analysis_cache import AnalysisCache, sha256_bytes, sha256_text
+from question_bank import QuestionBank, QUESTION_BANK_MODES, mentions_any, resume_terms
+from tts_generator import iter_audio_questions, tts_service
+from utils.audio_utils import wav_stream_header, wav_params, iter_wav_frames, iter_silence
 from datetime import datetime
+from sqlalchemy import event
+from sqlalchemy.orm import Session
 import os
 import uuid
 import json
+import random
 import re
+import time
+import config
+import metrics
 
 # ------------------- CONFIG -------------------
 BASE_DIR = os.path.abspath(os.path.dirname(__file__))
@@ -29,28 +45,147 @@ app = Flask(
 )
 CORS(app)
 
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///interviews.db'
+app.config['SQLALCHEMY_DATABASE_URI'] = config.DATABASE_URL
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 
 db.init_app(app)
+with app.app_context():
+    if db.engine.dialect.name == "sqlite":
+        event.listen(db.engine, "connect", apply_sqlite_pragmas)
+    # Migrates an old interview table and fails fast on other mismatches, rather than per request
+    prepare_schema()
+
+def start_commit_timer(session):
+    session.info["commit_start"] = time.perf_counter()
+
+def record_commit_time(session):
+    start = session.info.pop("commit_start", None)
+    if start is not None:
+        metrics.record("db_commit", time.perf_counter() - start)
+
+# Commit time includes the flush it triggers; rolled-back commits are not recorded
+event.listen(Session, "before_commit", start_commit_timer)
+event.listen(Session, "after_commit", record_commit_time)
 
 # ------------------- MODULE INIT -------------------
-transcriber = AudioTranscriber()
+# Services are cheap to construct; the models behind them load on first use (or warm-up)
+transcription_service = TranscriptionService(
+    model_size=config.WHISPER_MODEL_SIZE,
+    replicas=config.WHISPER_REPLICAS,
+    max_queue=config.WHISPER_MAX_QUEUE,
+    default_mode=config.WHISPER_DECODING_MODE
+)
 resume_parser = ResumeParser()
-question_gen = QuestionGenerator()
+analysis_cache = AnalysisCache(app, ttl_seconds=config.ANALYSIS_CACHE_TTL_HOURS * 3600)
+interview_store = InterviewStore(app)
+
+if config.QUESTION_BANK_MODE not in QUESTION_BANK_MODES:
+    raise ValueError(f"QUESTION_BANK_MODE must be one of {', '.join(QUESTION_BANK_MODES)}")
+question_bank = None if config.QUESTION_BANK_MODE == "off" else QuestionBank(
+    config.QUESTION_BANK_DIR,
+    dim=config.QUESTION_BANK_DIM,
+    seed_file=config.QUESTION_BANK_SEED_FILE,
+    dedupe_score=config.QUESTION_BANK_DEDUPE_SCORE
+)
+
+def store_proctor_events(events):
+    # Flushed batches also go to the proctor_event table in one executemany
+    interview_store.record_proctor_events([e for e in events if e["session_id"] and e["event"]])
+
+proctor_log = ProctorLog(
+    os.path.join(UPLOAD_FOLDER, 'proctor_logs'),
+    flush_max_events=config.PROCTOR_FLUSH_MAX_EVENTS,
+    flush_interval_ms=config.PROCTOR_FLUSH_INTERVAL_MS,
+    fsync=config.PROCTOR_FSYNC,
+    cached_days=config.PROCTOR_INDEX_CACHED_DAYS,
+    on_flush=store_proctor_events
+)
+
+def load_question_gen():
+    from question_gen import QuestionGenerator  # transformers/torch import is itself slow
+    return QuestionGenerator()
+
+def load_whisper():
+    transcription_service.warm_up()
+    return transcription_service
+
+def load_tts():
+    tts_service.warm_up()
+    return tts_service
+
+model_registry = ModelRegistry()
+model_registry.register("question_gen", load_question_gen)
+model_registry.register("whisper", load_whisper)
+model_registry.register("tts", load_tts)
+model_registry.warm_up(config.WARMUP_MODELS)
+
+job_manager = JobManager(max_workers=config.JOB_WORKERS, ttl_seconds=config.JOB_TTL_SECONDS)
+artifact_store = ArtifactStore(
+    AUDIO_FOLDER,
+    url_prefix='/static/audio',
+    max_age_seconds=config.ARTIFACT_MAX_AGE_HOURS * 3600,
+    max_total_bytes=config.ARTIFACT_MAX_DISK_MB * 1024 * 1024
+)
+artifact_store.start_janitor(config.ARTIFACT_SWEEP_INTERVAL_SECONDS)
+# Passes go through the registry so a stream's first pass loads Whisper with status tracking
+answer_streams = IncrementalTranscriptionRegistry(
+    lambda: model_registry.get('whisper'), transcription_service.default_mode
+)
+stage_executor = StageExecutor()
+
+# ------------------- METRICS -------------------
+# Sampled when /metrics is scraped; models that aren't loaded are simply left out
+def loaded_model_attr(name, fn):
+    return lambda: fn(model_registry.peek(name)) if model_registry.peek(name) is not None else None
+
+metrics.QUEUE_DEPTH.set_function(loaded_model_attr('question_gen', lambda m: m.scheduler.pending()), queue="llm")
+metrics.QUEUE_DEPTH.set_function(transcription_service.pending, queue="whisper")
+metrics.QUEUE_DEPTH.set_function(job_manager.active, queue="jobs")
+metrics.QUEUE_DEPTH.set_function(proctor_log.pending, queue="proctor_buffer")
+metrics.MEMORY_BYTES.set_function(loaded_model_attr('question_gen', lambda m: m.memory_bytes()), kind="question_gen_weights")
 
 # ------------------- CONSTANTS -------------------
 MIN_ANSWER_LENGTH = 5  # Minimum words to be considered valid answer
-TECHNICAL_TERMS = [
-    'algorithm', 'database', 'API', 'framework', 'JavaScript', 'Python', 
-    'React', 'Node.js', 'machine learning', 'AI', 'cloud', 'devops',
-    'backend', 'frontend', 'fullstack', 'container', 'microservices',
-    'CI/CD', 'agile', 'scrum', 'OOP', 'REST', 'GraphQL', 'SQL', 'NoSQL',
-    'Docker', 'Kubernetes', 'AWS', 'Azure', 'GCP', 'neural network',
-    'deep learning', 'natural language processing', 'computer vision'
+AUDIO_STREAM_TIMEOUT = 300  # Seconds a stream waits for the next question's audio
+TECHNICAL_TERMS = load_keyword_index(config.TECHNICAL_TERMS_FILE)
+FILLER_WORDS = load_keyword_index(config.FILLER_WORDS_FILE)
+FALLBACK_QUESTIONS = [
+    "Can you explain your experience with the technologies mentioned in your resume?",
+    "What was your most challenging technical project?",
+    "How do you approach problem-solving in your work?"
 ]
 
-FILLER_WORDS = ['um', 'uh', 'like', 'you know', 'so', 'well', 'basically', 'actually']
+# ------------------- REQUEST TIMING -------------------
+@app.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+    g.timings_token = metrics.start_timings()
+
+@app.after_request
+def record_request_time(response):
+    """Observe the request latency and log its per-stage breakdown (streamed bodies excluded)"""
+    start = g.pop('request_start', None)
+    if start is None or request.endpoint in ('static', 'metrics_endpoint'):
+        return response
+    elapsed = time.perf_counter() - start
+    endpoint = request.url_rule.rule if request.url_rule else "unmatched"
+    metrics.HTTP_REQUEST_SECONDS.observe(elapsed, endpoint=endpoint, method=request.method,
+                                         status=str(response.status_code))
+    if config.METRICS_REQUEST_LOG:
+        print("⏱️ " + json.dumps({
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            "total_ms": round(elapsed * 1000, 1),
+            "stages": metrics.current_timings()
+        }))
+    return response
+
+@app.teardown_request
+def reset_request_timings(_error=None):
+    token = g.pop('timings_token', None)
+    if token is not None:
+        metrics.reset_timings(token)
 
 # ------------------- ROUTES -------------------
 
@@ -69,87 +204,255 @@ def analyze_resume():
         if not file.filename.endswith('.pdf'):
             return jsonify({"error": "Only PDF files are allowed"}), 400
 
+        # Parsing works on these bytes; the saved copy is only kept for the interview record
+        max_bytes = int(config.RESUME_MAX_UPLOAD_MB * 1024 * 1024)
+        data = file.read(max_bytes + 1)
+        if len(data) > max_bytes:
+            return jsonify({"error": f"Resume exceeds {config.RESUME_MAX_UPLOAD_MB:g} MB"}), 413
+
         filename = f"resume_{datetime.now().timestamp()}.pdf"
         filepath = os.path.join(UPLOAD_FOLDER, filename)
-        file.save(filepath)
+        with atomic_output(filepath) as tmp_path:
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
         print(f"✅ Resume saved: {filepath}")
 
-        analysis = resume_parser.analyze(filepath)
+        session_id = request.form.get('session_id') or artifact_store.new_session_id()
+        artifact_store.session_dir(session_id)  # validates the id before queueing
+        job = job_manager.submit(run_resume_pipeline, filepath, session_id, data)
+        return jsonify({
+            "status": "queued",
+            "job_id": job.id,
+            "status_url": f"/api/jobs/{job.id}"
+        }), 202
+
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        print(f"❌ Error in analyze_resume: {e}")
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/ready', methods=['GET'])
+def readiness():
+    """Report model load status; 503 until every warm-up model is loaded"""
+    ready = model_registry.is_ready(config.WARMUP_MODELS)
+    return jsonify({"ready": ready, "models": model_registry.status()}), (200 if ready else 503)
+
+@app.route('/api/cache/stats', methods=['GET'])
+def cache_stats():
+    stats = analysis_cache.stats()
+    if question_bank is not None:
+        stats["question_bank"] = question_bank.stats()
+    return jsonify(stats)
+
+@app.route('/api/reports/proficiency', methods=['GET'])
+def proficiency_report():
+    """Average proficiency/confidence per candidate over the last `days` days (default 7)"""
+    try:
+        days = float(request.args.get('days', 7))
+    except ValueError:
+        return jsonify({"error": "days must be a number"}), 400
+
+    start = time.perf_counter()
+    candidates = interview_store.proficiency_report(days)
+    return jsonify({
+        "days": days,
+        "candidates": candidates,
+        "query_ms": round((time.perf_counter() - start) * 1000, 2)
+    })
+
+@app.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    """Prometheus text format: stage/request latency histograms, token counts, queue depths, memory"""
+    return Response(metrics.REGISTRY.render(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def job_status(job_id):
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown job id"}), 404
+    return jsonify(job.to_dict())
+
+@app.route('/api/jobs/<job_id>/audio-stream', methods=['GET'])
+def stream_question_audio(job_id):
+    """Stream question audio as one chunked WAV, starting as soon as the first question is synthesized"""
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown job id"}), 404
+
+    def audio_ready(index):
+        return lambda j: len(j.result.get('question_audio_urls', [])) > index
+
+    # Settle the status code before streaming: an empty 200 WAV looks like a broken stream
+    if not job.wait_for(audio_ready(0), timeout=AUDIO_STREAM_TIMEOUT):
+        if job.status == "failed":
+            return jsonify({"error": f"Job failed: {job.error}"}), 500
+        if job.status == "done":
+            return jsonify({"error": "Job finished without question audio"}), 500
+        return jsonify({"error": "Timed out waiting for question audio"}), 504
+
+    def generate():
+        session_id = job.result['session_id']
+        first_path = artifact_store.path(session_id, job.result['question_audio_urls'][0])
+        sample_rate, channels, sample_width = wav_params(first_path)
+
+        yield wav_stream_header(sample_rate, channels, sample_width)
+        yield from iter_silence(500, sample_rate, channels, sample_width)  # Initial padding
+
+        index = 0
+        # wait_for returns as soon as the job ends, so a failed job ends the stream without a timeout
+        while job.wait_for(audio_ready(index), timeout=AUDIO_STREAM_TIMEOUT):
+            wav_path = artifact_store.path(session_id, job.result['question_audio_urls'][index])
+            if wav_params(wav_path) != (sample_rate, channels, sample_width):
+                print(f"⚠️ Skipping question {index+1}: audio format differs from stream")
+            else:
+                yield from metrics.timed_iter("audio_concat", iter_wav_frames(wav_path))
+                yield from iter_silence(1000, sample_rate, channels, sample_width)  # 1s between questions
+            index += 1
+        if job.status == "failed":
+            print(f"⚠️ Audio stream for job {job.id} cut short: {job.error}")
+
+    return Response(generate(), mimetype='audio/wav', headers={"Cache-Control": "no-cache"})
+
+def run_resume_pipeline(job, filepath, session_id, data):
+    """Parse resume -> generate questions -> synthesize audio, publishing each stage on the job"""
+    job.update(session_id=session_id)
+
+    # Re-uploads of the same PDF skip extraction and parsing
+    resume_hash = sha256_bytes(data)
+    cached_analysis = analysis_cache.get("resume_analysis", resume_hash)
+    if cached_analysis is not None:
+        analysis = ResumeAnalysis(**cached_analysis)
+        print(f"⚡ Resume analysis cache hit: {resume_hash[:12]}")
+    else:
+        with metrics.timed("pdf_parse"):
+            analysis = resume_parser.analyze_bytes(data)
         print(f"✅ Resume parsed: {analysis}")
 
         if not analysis or not analysis.skills:
             raise Exception("Resume parsing failed or returned empty data")
+        analysis_cache.put("resume_analysis", resume_hash, analysis.__dict__)
+    job.advance("parsed", analysis=analysis.__dict__)
 
+    questions = banked_questions(analysis)
+    if questions is None:
+        # Question sets are keyed on the summary, so different PDFs with the same content share them;
+        # a pool of variants keeps repeat sessions from always getting the same five questions
         resume_summary = " ".join(analysis.skills + analysis.education + analysis.experience)
-        raw_questions = question_gen.generate(resume_summary)
-        print(f"✅ Raw questions generated: {raw_questions}")
-
-        # Clean and validate questions
-        questions = []
-        for q in raw_questions:
-            # Skip introductory statements
-            if "here are the" in q.lower() or "based on" in q.lower():
-                continue
-                
-            # Remove numbering/lettering (a., b., 1., etc.)
-            q = re.sub(r'^[a-zA-Z0-9]+[.)]\s*', '', q).strip()
+        summary_key = sha256_text(resume_summary)
+        question_sets = analysis_cache.get("question_sets", summary_key)
+        if question_sets is not None:
+            print(f"⚡ Question cache hit: {summary_key[:12]} ({len(question_sets)} variants)")
+        else:
+            raw_variants = model_registry.get('question_gen').generate_variants(resume_summary, config.QUESTION_VARIANTS)
+            print(f"✅ Raw questions generated: {raw_variants}")
+            question_sets = [clean_questions(raw_questions)[:5] for raw_questions in raw_variants]
+            # Variants that fell back to the generic questions are never cached (or served if another
+            # variant worked), so the next upload of this resume tries the LLM again
+            generated = [q for q in question_sets if q != FALLBACK_QUESTIONS]
+            if generated:
+                analysis_cache.put("question_sets", summary_key, generated)
+            question_sets = generated or question_sets
+        questions = random.choice(question_sets)
+        hold_generated_questions(session_id, questions[:5], analysis)
+
+    print(f"✅ Cleaned questions: {questions[:5]}")
+    # Recorded before audio so answers can link to these rows even while synthesis runs
+    interview_store.record_interview(session_id, filepath, analysis.name, questions[:5])
+    job.advance(
+        "questions_ready",
+        questions=questions[:5],
+        question_audio_urls=[],
+        audio_url=f"/api/jobs/{job.id}/audio-stream"
+    )
+
+    # Publish each question's audio as soon as it is synthesized; the stream endpoint follows along
+    audio_urls = []
+    session_dir = artifact_store.session_dir(session_id)
+    model_registry.get('tts')
+    for _, wav_path in metrics.timed_iter("tts", iter_audio_questions(questions[:5], output_dir=session_dir)):
+        audio_urls.append(artifact_store.url(session_id, wav_path))
+        job.update(question_audio_urls=list(audio_urls))
+    print(f"✅ Question audio ready: {audio_urls}")
+    job.advance("audio_ready")
+
+def banked_questions(analysis, count=5):
+    """Questions retrieved from the bank, or None when the LLM should generate them (QUESTION_BANK_MODE)"""
+    if question_bank is None:
+        return None
+    with metrics.timed("question_bank"):
+        picked = question_bank.select(
+            analysis.skills, " ".join(analysis.experience), count=count,
+            min_score=config.QUESTION_BANK_MIN_SCORE, rng=random
+        )
+    confident = len(picked) == count and (
+        config.QUESTION_BANK_MODE == "bank" or min(score for _, score in picked) >= config.QUESTION_BANK_MIN_SCORE
+    )
+    scores = [round(score, 2) for _, score in picked]  # for the log line only
+    metrics.CACHE_LOOKUPS.inc(cache="question_bank", result="hit" if confident else "miss")
+    if not confident:
+        print(f"🔎 Question bank miss (scores {scores}), generating")
+        return None
+    print(f"⚡ Question bank hit (scores {scores})")
+    return [question for question, _ in picked]
+
+def hold_generated_questions(session_id, questions, analysis):
+    """
+    Park a session's generated questions until they are answered; see bank_accepted_question.
+    Questions naming the candidate, an employer, school or place from the resume are never banked,
+    since banked questions are served to other candidates.
+    """
+    if question_bank is None:
+        return
+    name = analysis.name if analysis.name != NAME_NOT_FOUND else ""
+    private = resume_terms(name, analysis.education + analysis.experience, analysis.skills)
+    neutral = [q for q in questions if q not in FALLBACK_QUESTIONS and not mentions_any(q, private)]
+    if len(neutral) < len(questions):
+        print(f"🔒 {len(questions) - len(neutral)} generated questions are resume-specific or generic, not bankable")
+    if neutral:
+        analysis_cache.put("bank_candidates", session_id, {"questions": neutral, "skills": analysis.skills})
+
+def bank_accepted_question(session_id, question, feedback_data):
+    """
+    Bank a parked generated question once an answer to it got an LLM evaluation that rates the
+    answer relevant (QUESTION_BANK_MIN_RELEVANCE), so later resumes with these skills can skip the LLM
+    """
+    if question_bank is None or feedback_data.get('relevance_score', -1) < config.QUESTION_BANK_MIN_RELEVANCE:
+        return  # brief answers and unparsed evaluations carry no relevance score
+    held = analysis_cache.get("bank_candidates", session_id)
+    if not held or question not in held["questions"]:
+        return
+    added = question_bank.add([question], held["skills"], source="generated")
+    remaining = [q for q in held["questions"] if q != question]
+    analysis_cache.put("bank_candidates", session_id, {**held, "questions": remaining})
+    print(f"🏦 Answered question {'added to' if added else 'already in'} the bank ({len(question_bank)} total)")
+
+def clean_questions(raw_questions):
+    """Clean and validate LLM question lines, falling back to generic questions"""
+    questions = []
+    for q in raw_questions:
+        # Skip introductory statements
+        if "here are the" in q.lower() or "based on" in q.lower():
+            continue
             
-            # Skip statements that aren't questions
-            if not q.endswith('?'):
-                continue
-                
-            # Remove duplicate question marks
-            q = q.rstrip('?') + '?'
+        # Remove numbering/lettering (a., b., 1., etc.)
+        q = re.sub(r'^[a-zA-Z0-9]+[.)]\s*', '', q).strip()
+        
+        # Skip statements that aren't questions
+        if not q.endswith('?'):
+            continue
             
-            # Ensure minimum question length
-            if len(q.split()) >= 3:  # At least 3 words
-                questions.append(q)
+        # Remove duplicate question marks
+        q = q.rstrip('?') + '?'
         
-        # Fallback if cleaning removed all questions
-        if not questions:
-            questions = [
-                "Can you explain your experience with the technologies mentioned in your resume?",
-                "What was your most challenging technical project?",
-                "How do you approach problem-solving in your work?"
-            ]
-
-        print(f"✅ Cleaned questions: {questions[:5]}")
-
-        # Generate audio for each valid question
-        generate_audio_questions(questions[:5], output_dir=AUDIO_FOLDER)
-
-        # Combine audio with proper padding
-        combined_audio = AudioSegment.silent(duration=500)  # Initial padding
-        for i in range(min(5, len(questions))):
-            wav_file = os.path.join(AUDIO_FOLDER, f"question_{i+1}.wav")
-            try:
-                audio = AudioSegment.from_wav(wav_file)
-                combined_audio += audio + AudioSegment.silent(duration=1000)  # 1s between questions
-            except Exception as e:
-                print(f"⚠️ Error loading question {i+1}: {e}")
-                continue
-
-        final_audio_path = os.path.join(AUDIO_FOLDER, "questions.mp3")
-        combined_audio.export(final_audio_path, format="mp3")
-        print(f"✅ Final audio saved: {final_audio_path}")
-
-        interview = Interview(
-            resume_path=filepath,
-            questions=", ".join(questions[:5])  # Store cleaned questions
-        )
-        db.session.add(interview)
-        db.session.commit()
-
-        return jsonify({
-            "status": "success",
-            "analysis": analysis.__dict__,
-            "questions": questions[:5],
-            "audio_url": "/static/audio/questions.mp3"
-        })
-
-    except Exception as e:
-        print(f"❌ Error in analyze_resume: {e}")
-        return jsonify({"error": str(e)}), 500
+        # Ensure minimum question length
+        if len(q.split()) >= 3:  # At least 3 words
+            questions.append(q)
+    
+    # Fallback if cleaning removed all questions
+    if not questions:
+        questions = list(FALLBACK_QUESTIONS)
+    return questions
     
 # ----------- Process Recorded Answer and Generate Follow-Up -----------
 @app.route('/api/process-audio', methods=['POST'])
@@ -160,90 +463,303 @@ def process_audio():
 
         file = request.files['audio']
         current_question = request.form.get('question', '')
-        filename = f"answer_{datetime.now().timestamp()}.wav"
-        filepath = os.path.join(AUDIO_FOLDER, filename)
-        file.save(filepath)
+        session_id = request.form.get('session_id') or artifact_store.new_session_id()
+        filename = f"answer_{uuid.uuid4().hex}.wav"
+        filepath = artifact_store.save_upload(session_id, filename, file)
         print(f"✅ Answer audio saved: {filepath}")
 
         # Transcribe the audio
-        transcript_result = transcriber.transcribe(filepath)
+        transcript_result = model_registry.get('whisper').transcribe(filepath)
         print(f"📝 Full Whisper Output: {transcript_result}")
 
-        transcript_text = transcript_result['text'].strip()
-        if not transcript_text:
-            return jsonify({"error": "Transcription failed or empty"}), 500
+        return answer_response(session_id, current_question, transcript_result,
+                               stream_review=request.form.get('review') == 'stream')
 
-        # Generate comprehensive feedback
-        feedback_data = generate_comprehensive_feedback(current_question, transcript_text)
-        
-        # Generate audio responses
-        audio_responses = generate_audio_responses(transcript_text, feedback_data['follow_up'])
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except TranscriptionBusy as e:
+        return jsonify({"error": str(e)}), 503, {"Retry-After": "5"}
+    except Exception as e:
+        print(f"❌ Error in process_audio: {e}")
+        return jsonify({"error": str(e)}), 500
 
+def answer_response(session_id, current_question, transcript_result, stream_review=False):
+    """
+    Score a transcribed answer and build the JSON response shared by both answer paths.
+    With `stream_review` the LLM review is left to /api/stream/answer/<answer_id> instead.
+    """
+    transcript_text = transcript_result['text'].strip()
+    if not transcript_text:
+        return jsonify({"error": "Transcription failed or empty"}), 500
+
+    brief = is_brief_answer(transcript_text)
+    with metrics.timed("speech_analytics"):
+        speech = analyze_words(
+            transcript_result.get('words') or [],
+            FILLER_WORDS.terms,
+            window_seconds=config.SPEECH_WPM_WINDOW_SECONDS,
+            long_silence_seconds=config.SPEECH_LONG_SILENCE_SECONDS
+        )
+
+    if stream_review and not brief:
+        # Shared through the cache so the stream request may land on another worker
+        answer_id = uuid.uuid4().hex
+        analysis_cache.put("pending_answers", answer_id, {
+            "session_id": session_id,
+            "question": current_question,
+            "transcript": transcript_text,
+            "speech": speech.to_dict()
+        })
         return jsonify({
-            "status": "success",
+            "status": "streaming",
             "transcript": transcript_text,
-            "feedback": feedback_data['feedback'],
-            "follow_up": feedback_data['follow_up'],
-            "expected_answer": feedback_data['expected_answer'],
-            "proficiency": feedback_data['proficiency'],
-            "confidence": feedback_data['confidence'],
-            "improvement_suggestions": feedback_data['improvement_suggestions'],
-            "followup_audio": audio_responses['followup_audio'],
-            "you_said_audio": audio_responses['you_said_audio']
+            "speech_analytics": speech.to_dict(),
+            "review_url": f"/api/stream/answer/{answer_id}"
         })
 
+    # Independent stages start together: "You said" TTS needs only the transcript, and the
+    # follow-up and the schema-constrained evaluation are two rows of one batched LLM call
+    results, timings = stage_executor.run([
+        Stage("you_said_audio", lambda: synthesize_reply_audio(
+            session_id, "you_said", f"You said: {transcript_text}")),
+        Stage("llm_review", lambda: ("", brief_answer_feedback(current_question, transcript_text)) if brief
+              else llm_follow_up_and_feedback(current_question, transcript_text)),
+        Stage("followup_audio", lambda llm_review: synthesize_reply_audio(
+            session_id, "followup", f"Follow-up question: {llm_review[0]}") if llm_review[0] else None,
+            deps=["llm_review"]),
+    ])
+    print(f"⏱️ Answer stage timings: {timings}")
+
+    follow_up, feedback = results['llm_review']
+    feedback_data = finalize_feedback(feedback, current_question, transcript_text, follow_up, speech)
+    store_answer(session_id, current_question, transcript_text, feedback_data)
+    return jsonify(answer_payload(transcript_text, feedback_data, speech,
+                                  results['followup_audio'], results['you_said_audio'], timings))
+
+def store_answer(session_id, question, transcript_text, feedback_data):
+    """Record the scored answer and bank its question if accepted; neither failure blocks the reply"""
+    try:
+        interview_store.record_answer(session_id, question, transcript_text, feedback_data)
     except Exception as e:
-        print(f"❌ Error in process_audio: {e}")
+        print(f"⚠️ Could not store answer: {e}")  # scoring still goes back to the candidate
+    try:
+        bank_accepted_question(session_id, question, feedback_data)
+    except Exception as e:
+        print(f"⚠️ Could not bank question: {e}")
+
+def answer_payload(transcript_text, feedback_data, speech, followup_audio, you_said_audio, timings):
+    return {
+        "status": "success",
+        "transcript": transcript_text,
+        "feedback": feedback_data['feedback'],
+        "follow_up": feedback_data['follow_up'],
+        "expected_answer": feedback_data['expected_answer'],
+        "proficiency": feedback_data['proficiency'],
+        "confidence": feedback_data['confidence'],
+        "speech_confidence": feedback_data.get('speech_confidence'),
+        "improvement_suggestions": feedback_data['improvement_suggestions'],
+        "followup_audio": followup_audio,
+        "you_said_audio": you_said_audio,
+        "speech_analytics": speech.to_dict(),
+        "timings_ms": timings
+    }
+
+# ----------- Streamed Answer Upload (transcribed while recording) -----------
+@app.route('/api/answer-stream', methods=['POST'])
+def start_answer_stream():
+    try:
+        session_id = request.form.get('session_id') or artifact_store.new_session_id()
+        stream_dir = artifact_store.path(session_id, f"stream_{uuid.uuid4().hex}")
+        stream_id = answer_streams.create(stream_dir, session_id=session_id)
+        return jsonify({"status": "ok", "stream_id": stream_id, "session_id": session_id})
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+@app.route('/api/answer-stream/<stream_id>/chunk', methods=['POST'])
+def append_answer_chunk(stream_id):
+    stream = answer_streams.get(stream_id)
+    if stream is None:
+        return jsonify({"error": "Unknown stream id"}), 404
+
+    chunk = request.files['chunk'].read() if 'chunk' in request.files else request.get_data()
+    if not chunk:
+        return jsonify({"error": "Empty chunk"}), 400
+
+    stream.append(chunk)
+    return jsonify({"status": "ok", "partial_transcript": stream.partial_text})
+
+@app.route('/api/answer-stream/<stream_id>/finish', methods=['POST'])
+def finish_answer_stream(stream_id):
+    stream = answer_streams.pop(stream_id)
+    if stream is None:
+        return jsonify({"error": "Unknown stream id"}), 404
+
+    try:
+        current_question = request.form.get('question', '')
+        transcript_result = stream.finish()
+        print(f"📝 Streamed Whisper Output: {transcript_result}")
+        return answer_response(stream.session_id, current_question, transcript_result,
+                               stream_review=request.form.get('review') == 'stream')
+
+    except TranscriptionBusy as e:
+        return jsonify({"error": str(e)}), 503, {"Retry-After": "5"}
+    except Exception as e:
+        print(f"❌ Error in finish_answer_stream: {e}")
         return jsonify({"error": str(e)}), 500
 
-def generate_comprehensive_feedback(question, answer):
-    """Generate detailed feedback with scores and expected answer"""
-    # Validate answer length first
+# ----------- Streaming LLM Output (server-sent events) -----------
+@app.route('/api/stream/follow-up', methods=['GET'])
+def stream_follow_up():
+    """Stream follow-up question tokens; generation stops at the first complete question"""
+    question = request.args.get('question', '')
+    answer = request.args.get('answer', '')
+    if not answer:
+        return jsonify({"error": "No answer provided"}), 400
+
+    question_gen = model_registry.get('question_gen')
+    pieces = question_gen.stream_follow_up(f"Question: {question}\nAnswer: {answer}")
+    return sse_response(pieces, lambda text: {"follow_up": question_gen.parse_follow_up(text)})
+
+@app.route('/api/stream/feedback', methods=['GET'])
+def stream_feedback():
+    """Stream the LLM evaluation of an answer as it is generated"""
+    question = request.args.get('question', '')
+    answer = request.args.get('answer', '')
+    if not answer:
+        return jsonify({"error": "No answer provided"}), 400
+
+    question_gen = model_registry.get('question_gen')
+    pieces = question_gen.stream_review(f"Question: {question}\nAnswer: {answer}")
+    return sse_response(pieces, lambda text: {"review": question_gen.parse_review(text)})
+
+@app.route('/api/stream/answer/<answer_id>', methods=['GET'])
+def stream_answer_review(answer_id):
+    """
+    Review an answer submitted with review=stream: `follow_up` then `feedback` (evaluation JSON)
+    token events, then `done` with the same fields /api/process-audio returns
+    """
+    pending = analysis_cache.get("pending_answers", answer_id)
+    if pending is None:
+        return jsonify({"error": "Unknown answer id"}), 404
+    if "result" in pending:
+        # EventSource reconnects when a stream ends; replay the result instead of reviewing again
+        return sse_response(iter(()), lambda _: pending["result"])
+
+    session_id, question, transcript_text = pending["session_id"], pending["question"], pending["transcript"]
+    speech = SpeechAnalytics(**pending["speech"])
+    qa_context = f"Question: {question}\nAnswer: {transcript_text}"
+    question_gen = model_registry.get('question_gen')
+
+    def generate():
+        start = time.perf_counter()
+        you_said_audio = stage_executor.executor.submit(
+            synthesize_reply_audio, session_id, "you_said", f"You said: {transcript_text}")
+        try:
+            # Streamed rows run one at a time; the short follow-up goes first so it shows up soonest
+            text = []
+            for piece in question_gen.stream_follow_up(qa_context):
+                text.append(piece)
+                yield sse_event("follow_up", {"text": piece})
+            follow_up = question_gen.parse_follow_up("".join(text))
+            followup_audio = stage_executor.executor.submit(
+                synthesize_reply_audio, session_id, "followup", f"Follow-up question: {follow_up}")
+
+            text = []
+            for piece in question_gen.stream_review(qa_context):
+                text.append(piece)
+                yield sse_event("feedback", {"text": piece})
+            feedback = generate_llm_feedback(question, transcript_text, "".join(text))
+
+            feedback_data = finalize_feedback(feedback, question, transcript_text, follow_up, speech)
+            store_answer(session_id, question, transcript_text, feedback_data)
+            result = answer_payload(transcript_text, feedback_data, speech, followup_audio.result(),
+                                    you_said_audio.result(), {"llm_review": {
+                                        "start_ms": 0.0, "duration_ms": round((time.perf_counter() - start) * 1000, 1)}})
+            analysis_cache.put("pending_answers", answer_id, {**pending, "result": result})
+            yield sse_event("done", result)
+        except Exception as e:
+            print(f"❌ Error while streaming answer review: {e}")
+            yield sse_event("error", {"error": str(e)})
+
+    return Response(generate(), mimetype='text/event-stream',
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+def sse_event(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+def sse_response(pieces, finalize):
+    """Send each text piece as a `token` event, then `done` with the parsed result"""
+    def generate():
+        text = []
+        try:
+            for piece in pieces:
+                text.append(piece)
+                yield sse_event("token", {"text": piece})
+            yield sse_event("done", finalize("".join(text)))
+        except Exception as e:
+            print(f"❌ Error while streaming: {e}")
+            yield sse_event("error", {"error": str(e)})
+
+    return Response(generate(), mimetype='text/event-stream',
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+def is_brief_answer(answer):
+    return len(answer.split()) < MIN_ANSWER_LENGTH
+
+def brief_answer_feedback(question, answer):
+    """Feedback for answers too short to be worth an LLM call"""
     word_count = len(answer.split())
-    if word_count < MIN_ANSWER_LENGTH:
-        return {
-            "feedback": "Your answer is too brief. Please elaborate with technical details and examples.",
-            "proficiency": max(10, min(30, word_count * 5)),  # 10-30% for very short answers
-            "confidence": max(10, min(30, word_count * 5)),
-            "expected_answer": generate_expected_answer_template(question),
-            "follow_up": "",
-            "improvement_suggestions": [
-                "Provide more technical details",
-                "Include specific examples",
-                "Explain your thought process"
-            ]
-        }
-
-    # Generate follow-up question (context-aware)
-    follow_up = question_gen.generate_follow_up(
+    return {
+        "feedback": "Your answer is too brief. Please elaborate with technical details and examples.",
+        "proficiency": max(10, min(30, word_count * 5)),  # 10-30% for very short answers
+        "confidence": max(10, min(30, word_count * 5)),
+        "expected_answer": generate_expected_answer_template(question),
+        "follow_up": "",
+        "improvement_suggestions": [
+            "Provide more technical details",
+            "Include specific examples",
+            "Explain your thought process"
+        ]
+    }
+
+def llm_follow_up_and_feedback(question, answer):
+    """Follow-up question and scored feedback from one batched LLM call (follow-up + constrained evaluation)"""
+    follow_up, evaluation = model_registry.get('question_gen').follow_up_and_evaluation(
         f"Question: {question}\nAnswer: {answer}"
     )
-    
-    # Generate specific feedback analyzing the answer
-    feedback_prompt = f"""
-    Analyze this interview Q&A and provide specific feedback:
-    - Technical accuracy (0-100)
-    - Relevance to question (0-100)
-    - Communication clarity (0-100)
-    - 3 specific improvement suggestions
-    
-    Question: {question}
-    Answer: {answer}
-    
-    Return as JSON with: feedback, proficiency, confidence, expected_answer, improvement_suggestions
-    """
-    
+    return follow_up, generate_llm_feedback(question, answer, evaluation)
+
+def generate_llm_feedback(question, answer, evaluation_json):
+    """Feedback fields from the answer-evaluation JSON, or heuristic feedback if it does not parse"""
     try:
-        feedback_response = question_gen.generate(feedback_prompt)
-        feedback_data = json.loads(feedback_response)
-    except Exception as e:
+        evaluation = AnswerEvaluation.from_json(evaluation_json)
+    except ValueError as e:
         print(f"⚠️ Feedback generation error: {e}")
-        feedback_data = generate_fallback_feedback(question, answer)
-    
-    # Ensure all required fields exist with proper validation
+        return generate_fallback_feedback(question, answer)
+
+    return {
+        "feedback": evaluation.feedback,
+        "proficiency": evaluation.proficiency,
+        "confidence": evaluation.confidence_score,
+        "technical_score": evaluation.technical_score,
+        "relevance_score": evaluation.relevance_score,
+        "expected_answer": evaluation.expected_answer,
+        "improvement_suggestions": evaluation.improvement_suggestions
+    }
+
+def finalize_feedback(feedback_data, question, answer, follow_up, speech=None):
+    """Ensure all required fields exist with proper validation"""
     feedback_data.setdefault('feedback', generate_dynamic_feedback(answer))
     feedback_data.setdefault('proficiency', calculate_proficiency(answer))
     feedback_data.setdefault('confidence', calculate_confidence(answer))
+    if speech is not None and speech.word_count >= MIN_ANSWER_LENGTH:
+        # Blend delivery measured from the audio with the LLM (or text-only) estimate.
+        # Proficiency is left alone; it already weighs the LLM's own confidence_score at 20%.
+        feedback_data['speech_confidence'] = speech_confidence(speech)
+        feedback_data['confidence'] = round(
+            config.SPEECH_CONFIDENCE_WEIGHT * feedback_data['speech_confidence']
+            + (1 - config.SPEECH_CONFIDENCE_WEIGHT) * feedback_data['confidence']
+        )
     feedback_data.setdefault('expected_answer', generate_expected_answer_template(question))
     feedback_data.setdefault('improvement_suggestions', [
         "Provide more technical details",
@@ -338,67 +854,65 @@ def calculate_confidence(answer):
     
     return min(int(base_score), 100)
 
-def generate_audio_responses(transcript, follow_up):
-    """Generate both 'You said' and follow-up question audio"""
-    you_said_text = f"You said: {transcript}"
-    followup_text = f"Follow-up question: {follow_up}"
-
-    you_said_filename = f"you_said_{uuid.uuid4()}.mp3"
-    followup_filename = f"followup_{uuid.uuid4()}.mp3"
-
-    gTTS(you_said_text).save(os.path.join(AUDIO_FOLDER, you_said_filename))
-    gTTS(followup_text).save(os.path.join(AUDIO_FOLDER, followup_filename))
-
-    return {
-        "followup_audio": f"/static/audio/{followup_filename}",
-        "you_said_audio": f"/static/audio/{you_said_filename}"
-    }
+def synthesize_reply_audio(session_id, prefix, text):
+    """Synthesize one spoken reply (gTTS) into the session directory and return its URL"""
+    filename = f"{prefix}_{uuid.uuid4()}.mp3"
+    with metrics.timed("tts_reply"):
+        tts_service.synthesize_gtts_many([text], [artifact_store.path(session_id, filename)])
+    return artifact_store.url(session_id, filename)
 
 def count_technical_terms(text):
-    """Count domain-specific terms in answer"""
-    return sum(text.lower().count(term.lower()) for term in TECHNICAL_TERMS)
+    """Count domain-specific terms in answer (whole words, one pass)"""
+    return TECHNICAL_TERMS.count(text)
 
 def count_filler_words(text):
-    """Count filler words in transcript"""
-    return sum(text.lower().count(filler) for filler in FILLER_WORDS)
+    """Count filler words in transcript (whole words, one pass)"""
+    return FILLER_WORDS.count(text)
 
 # [Rest of your routes remain unchanged...]
 
 # ----------- Proctoring Report Endpoint -----------
 @app.route('/api/proctor-report', methods=['POST'])
 def proctor_report():
-    """Receive proctoring reports from the frontend and save to a log file.
+    """Receive proctoring reports from the frontend and queue them for the buffered log.
 
-    Expects JSON: { session_id, event, timestamp, details }
+    Expects JSON: { session_id, event, timestamp, details }, a list of those,
+    or { events: [...] }
     """
     try:
         data = request.get_json(force=True)
         if not data:
             return jsonify({"error": "No JSON body provided"}), 400
 
-        # Ensure proctor log folder exists
-        proctor_dir = os.path.join(app.config.get('UPLOAD_FOLDER', 'uploads'), 'proctor_logs')
-        os.makedirs(proctor_dir, exist_ok=True)
-
-        # Normalize and enrich report
-        report = {
-            "session_id": data.get('session_id'),
-            "event": data.get('event'),
-            "timestamp": data.get('timestamp') or datetime.now().isoformat(),
-            "details": data.get('details', {})
-        }
-
-        # Use a per-day log file and append JSON lines for easy ingestion
-        logfile = os.path.join(proctor_dir, f"proctor_{datetime.now().date()}.log")
-        with open(logfile, 'a', encoding='utf-8') as f:
-            f.write(json.dumps(report) + "\n")
-
-        print(f"✅ Proctor report saved: {report}")
-        return jsonify({"status": "ok"})
+        items = data.get('events') if isinstance(data, dict) and 'events' in data else data
+        if not isinstance(items, list):
+            items = [items]
+        if len(items) > config.PROCTOR_MAX_BATCH:
+            return jsonify({"error": f"At most {config.PROCTOR_MAX_BATCH} events per request"}), 413
+
+        # Normalize and enrich reports
+        received_at = datetime.now().isoformat()
+        reports = [
+            {
+                "session_id": item.get('session_id'),
+                "event": item.get('event'),
+                "timestamp": item.get('timestamp') or received_at,
+                "details": item.get('details', {})
+            }
+            for item in items if isinstance(item, dict)
+        ]
+        proctor_log.append(reports)
+        return jsonify({"status": "ok", "accepted": len(reports)})
     except Exception as e:
         print(f"❌ Error in proctor_report: {e}")
         return jsonify({"error": str(e)}), 500
 
+@app.route('/api/proctor-events/<session_id>', methods=['GET'])
+def proctor_events(session_id):
+    """One session's proctoring events via the per-session index (optional ?date=YYYY-MM-DD)"""
+    events = proctor_log.session_events(session_id, day=request.args.get('date'))
+    return jsonify({"session_id": session_id, "count": len(events), "events": events})
+
 # ------------------- RUN APP -------------------
 if __name__ == '__main__':
     with app.app_context():
@@ -0,0 +1,138 @@
+import os
+import re
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Iterator
+
+SESSION_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+
+def temp_path_for(path: str) -> str:
+    """Sibling temp name (same directory, same extension) so os.replace stays atomic."""
+    directory, filename = os.path.split(path)
+    stem, ext = os.path.splitext(filename)
+    return os.path.join(directory, f".{stem}.{uuid.uuid4().hex}.tmp{ext}")
+
+
+@contextmanager
+def atomic_output(path: str) -> Iterator[str]:
+    """
+    Yield a temp path to write to; it replaces `path` only if the block succeeds.
+    The directory is (re)created and touched first, so the janitor does not remove it as empty.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+        os.utime(directory)
+    tmp_path = temp_path_for(path)
+    try:
+        yield tmp_path
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+class ArtifactStore:
+    def __init__(self, root: str, url_prefix: str, max_age_seconds: int, max_total_bytes: int):
+        """
+        Per-interview directories for generated and uploaded audio.
+        :param root: Directory that holds one sub-directory per session.
+        :param url_prefix: Public URL that `root` is served under.
+        :param max_age_seconds: Files older than this are removed by the janitor.
+        :param max_total_bytes: Disk budget; oldest files are removed beyond it.
+        """
+        self.root = root
+        self.url_prefix = url_prefix.rstrip('/')
+        self.max_age_seconds = max_age_seconds
+        self.max_total_bytes = max_total_bytes
+        self._janitor = None
+        os.makedirs(root, exist_ok=True)
+
+    def new_session_id(self) -> str:
+        return uuid.uuid4().hex
+
+    def session_dir(self, session_id: str) -> str:
+        if not SESSION_ID_PATTERN.match(session_id or ""):
+            raise ValueError("Invalid session id")
+        path = os.path.join(self.root, session_id)
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    def path(self, session_id: str, filename: str) -> str:
+        return os.path.join(self.session_dir(session_id), os.path.basename(filename))
+
+    def url(self, session_id: str, filename: str) -> str:
+        return f"{self.url_prefix}/{session_id}/{os.path.basename(filename)}"
+
+    def save_upload(self, session_id: str, filename: str, file_storage) -> str:
+        """Save a werkzeug upload into the session directory via temp-file-and-rename."""
+        path = self.path(session_id, filename)
+        with atomic_output(path) as tmp_path:
+            file_storage.save(tmp_path)
+        return path
+
+    # ------------------- JANITOR -------------------
+    def sweep(self) -> int:
+        """Expire files by age, then by total size (oldest first). Returns files removed."""
+        now = time.time()
+        removed = 0
+        files = []
+        for dirpath, _, filenames in os.walk(self.root):
+            for name in filenames:
+                path = os.path.join(dirpath, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                if now - stat.st_mtime > self.max_age_seconds:
+                    removed += self._remove(path)
+                else:
+                    files.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_total_bytes:
+                break
+            removed += self._remove(path)
+            total -= size
+
+        # Drop session (and nested stream) directories left empty for the whole TTL; a newer one
+        # may have just been created by session_dir() for a write that has not started yet
+        for dirpath, _, _ in os.walk(self.root, topdown=False):
+            if dirpath == self.root:
+                continue
+            try:
+                if now - os.stat(dirpath).st_mtime > self.max_age_seconds:
+                    os.rmdir(dirpath)
+            except OSError:
+                pass
+
+        return removed
+
+    def start_janitor(self, interval_seconds: int):
+        if self._janitor is not None:
+            return
+
+        def loop():
+            while True:
+                time.sleep(interval_seconds)
+                try:
+                    removed = self.sweep()
+                    if removed:
+                        print(f"🧹 Artifact janitor removed {removed} files")
+                except Exception as e:
+                    print(f"⚠️ Artifact janitor failed: {e}")
+
+        self._janitor = threading.Thread(target=loop, name="artifact-janitor", daemon=True)
+        self._janitor.start()
+
+    @staticmethod
+    def _remove(path: str) -> int:
+        try:
+            os.remove(path)
+            return 1
+        except OSError:
+            return 0
@@ -0,0 +1,80 @@
+"""
+Compare the single-pass KeywordIndex against the per-term `str.count` scan it replaced,
+on synthetic transcripts/resumes and growing dictionary sizes.
+
+Usage (from the backend directory):
+    python benchmarks/bench_keyword_index.py --text-kb 4 64 --dict-sizes 35 1000 5000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config  # noqa: E402
+from keyword_index import KeywordIndex, load_terms  # noqa: E402
+
+
+def legacy_count(text, terms):
+    return sum(text.lower().count(term.lower()) for term in terms)
+
+
+def synthetic_terms(base_terms, size, rng):
+    terms = list(base_terms)
+    while len(terms) < size:
+        length = rng.randint(4, 12)
+        terms.append("".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(length)))
+    return terms[:max(size, len(base_terms))]
+
+
+def synthetic_text(vocabulary, kilobytes, rng):
+    words, size = [], 0
+    while size < kilobytes * 1024:
+        word = rng.choice(vocabulary)
+        words.append(word)
+        size += len(word) + 1
+    return " ".join(words)
+
+
+def best_of(fn, repeats):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--text-kb", nargs="+", type=int, default=[4, 64, 512], help="Text sizes to scan")
+    parser.add_argument("--dict-sizes", nargs="+", type=int, default=[35, 1000, 5000])
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    base_terms = load_terms(config.TECHNICAL_TERMS_FILE) + load_terms(config.FILLER_WORDS_FILE)
+    prose = ("the candidate said they also worked on a project where we built and shipped "
+             "services to production and measured latency").split()
+
+    print(f"{'dict':>6} {'text KB':>8} {'build ms':>9} {'legacy MB/s':>12} {'index MB/s':>11} {'speedup':>8}")
+    for dict_size in args.dict_sizes:
+        terms = synthetic_terms(base_terms, dict_size, rng)
+        start = time.perf_counter()
+        index = KeywordIndex(terms)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        for kilobytes in args.text_kb:
+            text = synthetic_text(prose + terms[:200], kilobytes, rng)
+            megabytes = len(text) / 1e6
+            legacy = best_of(lambda: legacy_count(text, terms), args.repeats)
+            indexed = best_of(lambda: index.count(text), args.repeats)
+            print(f"{len(index):>6} {kilobytes:>8} {build_ms:>9.1f} {megabytes / legacy:>12.1f} "
+                  f"{megabytes / indexed:>11.1f} {legacy / indexed:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""
+Compare question-model inference backends (torch, int8, onnx, onnx-int8) on a fixed prompt set:
+load time, weight size, RSS growth, prefill and per-token decode latency, and output quality.
+
+Decoding is greedy so runs are repeatable. Quality is reported as the share of generated tokens
+that match the first backend's output position by position, plus whether each output is usable
+(five parsed questions / a follow-up question / valid review JSON).
+
+Usage (from the backend directory):
+    python benchmarks/bench_llm_backends.py --backends torch int8 onnx onnx-int8 --json llm.json
+"""
+import argparse
+import gc
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import torch  # noqa: E402
+from transformers import AutoTokenizer, StoppingCriteriaList  # noqa: E402
+
+import config  # noqa: E402
+from llm_backends import LLM_BACKENDS, load_model  # noqa: E402
+from metrics import resident_memory_bytes  # noqa: E402
+from question_gen import (  # noqa: E402
+    FOLLOW_UP_SYSTEM_PROMPT, QUESTIONS_SYSTEM_PROMPT, REVIEW_SYSTEM_PROMPT, QuestionGenerator, StepTimer
+)
+
+RESUME_SUMMARIES = [
+    "python flask sql docker B.Tech Computer Science Software Engineer Intern",
+    "java spring kubernetes aws Master of Technology Backend Developer",
+    "machine learning pytorch pandas numpy Bachelor of Science Data Science Intern",
+    "react javascript html css node.js University College Frontend Developer",
+]
+ANSWERS = [
+    ("How do you index a large SQL table?",
+     "I look at the query plan first, then add a composite index on the filtered columns in the order they are used."),
+    ("Explain how you deploy a Flask app.",
+     "We build a Docker image, run gunicorn behind nginx and roll it out with a health check."),
+    ("What is overfitting?",
+     "It is when the model memorizes the training data, so I use validation splits, regularization and early stopping."),
+]
+
+
+def prompt_set():
+    """(kind, prefix, prompt, max_new_tokens) for every fixed prompt."""
+    prompts = [("questions", QUESTIONS_SYSTEM_PROMPT, QuestionGenerator._questions_prompt(s), 200)
+               for s in RESUME_SUMMARIES]
+    for question, answer in ANSWERS:
+        context = f"Question: {question}\nAnswer: {answer}"
+        prompts.append(("follow_up", FOLLOW_UP_SYSTEM_PROMPT, QuestionGenerator._follow_up_prompt(context), 60))
+        prompts.append(("review", REVIEW_SYSTEM_PROMPT, QuestionGenerator._review_prompt(context), 200))
+    return prompts
+
+
+def usable(kind, text):
+    if kind == "questions":
+        return len(QuestionGenerator.parse_questions(text)) >= 5
+    if kind == "follow_up":
+        return "?" in QuestionGenerator.parse_follow_up(text)
+    try:
+        json.loads(text.strip())
+        return True
+    except ValueError:
+        return False
+
+
+def run_backend(backend, tokenizer, prompts):
+    gc.collect()
+    rss_before = resident_memory_bytes() or 0
+    start = time.perf_counter()
+    loaded = load_model(backend, config.LLM_MODEL_ID, config.LLM_CACHE_DIR)
+    load_seconds = time.perf_counter() - start
+
+    outputs, prefill, per_token = [], [], []
+    for i, (kind, prefix, prompt, max_new_tokens) in enumerate([prompts[0]] + prompts):
+        inputs = tokenizer(prefix + prompt, return_tensors="pt").to(loaded.device)
+        timer = StepTimer()
+        with torch.inference_mode():
+            output = loaded.model.generate(
+                **inputs,
+                max_new_tokens=max_new_tokens,
+                do_sample=False,
+                pad_token_id=tokenizer.eos_token_id,
+                stopping_criteria=StoppingCriteriaList([timer])
+            )
+        if i == 0:
+            continue  # warm-up
+        generated = output[0][inputs["input_ids"].shape[-1]:].tolist()
+        outputs.append((kind, generated, tokenizer.decode(generated, skip_special_tokens=True)))
+        prefill.append(timer.first_step - timer.start)
+        if len(generated) > 1:
+            per_token.append((timer.last_step - timer.first_step) / (len(generated) - 1))
+
+    result = {
+        "backend": backend,
+        "load_seconds": load_seconds,
+        "weights_gb": loaded.weights_bytes / 1e9,
+        "rss_growth_gb": ((resident_memory_bytes() or 0) - rss_before) / 1e9,
+        "prefill_ms": statistics.median(prefill) * 1000,
+        "decode_ms_per_token": statistics.median(per_token) * 1000 if per_token else float("nan"),
+    }
+    del loaded
+    gc.collect()
+    return result, outputs
+
+
+def token_agreement(reference, candidate):
+    matched = total = 0
+    for (_, ref_ids, _), (_, ids, _) in zip(reference, candidate):
+        total += max(len(ref_ids), len(ids))
+        matched += sum(1 for a, b in zip(ref_ids, ids) if a == b)
+    return matched / total if total else 1.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backends", nargs="+", default=["torch", "int8"], choices=LLM_BACKENDS,
+                        help="The first backend is the quality reference")
+    parser.add_argument("--threads", type=int, help="torch intra-op threads (default: torch's choice)")
+    parser.add_argument("--json", help="Also write results and generated texts to this file")
+    args = parser.parse_args()
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+    tokenizer = AutoTokenizer.from_pretrained(config.LLM_MODEL_ID, cache_dir=config.LLM_CACHE_DIR)
+    prompts = prompt_set()
+    print(f"📝 {len(prompts)} prompts, greedy decoding, reference backend '{args.backends[0]}'")
+
+    rows, texts, reference = [], {}, None
+    for backend in args.backends:
+        print(f"⏳ {backend}...")
+        row, outputs = run_backend(backend, tokenizer, prompts)
+        reference = reference or outputs
+        row["token_agreement"] = token_agreement(reference, outputs)
+        row["usable"] = sum(usable(kind, text) for kind, _, text in outputs) / len(outputs)
+        rows.append(row)
+        texts[backend] = [text for _, _, text in outputs]
+
+    print(f"\n{'backend':<11}{'load s':>8}{'weights':>9}{'RSS +':>8}{'prefill ms':>12}{'ms/token':>10}"
+          f"{'agree':>8}{'usable':>8}")
+    for r in rows:
+        print(f"{r['backend']:<11}{r['load_seconds']:>8.1f}{r['weights_gb']:>7.2f}GB{r['rss_growth_gb']:>6.2f}GB"
+              f"{r['prefill_ms']:>12.0f}{r['decode_ms_per_token']:>10.1f}{r['token_agreement']:>8.0%}{r['usable']:>8.0%}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"results": rows, "texts": texts}, f, indent=2)
+        print(f"\n💾 Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+"""
+Compare plain decoding with prompt-lookup decoding on follow-up and (schema-constrained) review
+prompts: wall time per completion, tokens per second, draft acceptance rate and tokens per forward pass.
+
+Decoding is greedy, so both modes should produce the same tokens (up to floating-point differences
+between one-token and multi-token forward passes); the `same` column checks that.
+
+Usage (from the backend directory):
+    python benchmarks/bench_prompt_lookup.py --backend int8 --num-tokens 5 10 --max-ngram 3
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import torch  # noqa: E402
+from transformers import AutoTokenizer, LogitsProcessorList, StoppingCriteriaList  # noqa: E402
+
+import config  # noqa: E402
+from bench_llm_backends import ANSWERS  # noqa: E402
+from llm_backends import load_model  # noqa: E402
+from prompt_lookup import prompt_lookup_generate  # noqa: E402
+from question_gen import (  # noqa: E402
+    FOLLOW_UP_SYSTEM_PROMPT, REVIEW_SYSTEM_PROMPT, JsonConstraint, JsonStopCriteria, QuestionGenerator,
+    QuestionStopCriteria, TokenTable
+)
+from structured_output import ANSWER_EVALUATION_TEMPLATE  # noqa: E402
+
+
+def prompt_set():
+    """(kind, text, max_new_tokens) for every fixed prompt."""
+    prompts = []
+    for question, answer in ANSWERS:
+        context = f"Question: {question}\nAnswer: {answer}"
+        prompts.append(("follow_up", FOLLOW_UP_SYSTEM_PROMPT + QuestionGenerator._follow_up_prompt(context), 100))
+        prompts.append(("review", REVIEW_SYSTEM_PROMPT + QuestionGenerator._review_prompt(context),
+                        ANSWER_EVALUATION_TEMPLATE.max_tokens()))
+    return prompts
+
+
+def controls(kind, tokenizer, table, prompt_length):
+    """The logits processors and stopping criteria the app uses for this kind of prompt."""
+    if kind == "follow_up":
+        return LogitsProcessorList(), StoppingCriteriaList([QuestionStopCriteria(tokenizer, prompt_length, [True])])
+    constraint = JsonConstraint(table, ANSWER_EVALUATION_TEMPLATE, prompt_length, 1, tokenizer.eos_token_id)
+    return LogitsProcessorList([constraint]), StoppingCriteriaList([JsonStopCriteria(constraint)])
+
+
+def run(model, tokenizer, table, prompts, num_tokens=None, max_ngram=None):
+    """Greedy completions; plain generate() when num_tokens is None."""
+    results = []
+    for i, (kind, text, max_new_tokens) in enumerate([prompts[0]] + prompts):
+        input_ids = tokenizer(text, return_tensors="pt").input_ids.to(model.device)
+        processors, criteria = controls(kind, tokenizer, table, input_ids.shape[-1])
+        start = time.perf_counter()
+        with torch.inference_mode():
+            if num_tokens is None:
+                output = model.generate(
+                    input_ids, max_new_tokens=max_new_tokens, do_sample=False,
+                    pad_token_id=tokenizer.eos_token_id, logits_processor=processors, stopping_criteria=criteria
+                )
+                stats = None
+            else:
+                output, stats = prompt_lookup_generate(
+                    model, input_ids, max_new_tokens, tokenizer.eos_token_id, processors, LogitsProcessorList(),
+                    criteria, do_sample=False, num_draft_tokens=num_tokens, max_ngram=max_ngram
+                )
+        seconds = time.perf_counter() - start
+        if i == 0:
+            continue  # warm-up
+        generated = output[0][input_ids.shape[-1]:].tolist()
+        results.append({"kind": kind, "ids": generated, "seconds": seconds, "stats": stats})
+    return results
+
+
+def summarize(label, results, reference):
+    tokens = sum(len(r["ids"]) for r in results)
+    seconds = sum(r["seconds"] for r in results)
+    row = {
+        "mode": label,
+        "ms_per_completion": statistics.median(r["seconds"] for r in results) * 1000,
+        "tokens_per_second": tokens / seconds,
+        "same": sum(r["ids"] == ref["ids"] for r, ref in zip(results, reference)) / len(results),
+        "acceptance_rate": None,
+        "tokens_per_forward": 1.0,
+    }
+    stats = [r["stats"] for r in results if r["stats"] is not None]
+    if stats:
+        drafted = sum(s.drafted for s in stats)
+        row["acceptance_rate"] = sum(s.accepted for s in stats) / drafted if drafted else 0.0
+        row["tokens_per_forward"] = sum(s.generated for s in stats) / sum(s.forward_passes for s in stats)
+    return row
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backend", default="torch", choices=("torch", "int8"),
+                        help="Prompt lookup needs direct key/value access, so ONNX backends are excluded")
+    parser.add_argument("--num-tokens", type=int, nargs="+", default=[config.PROMPT_LOOKUP_NUM_TOKENS])
+    parser.add_argument("--max-ngram", type=int, default=config.PROMPT_LOOKUP_MAX_NGRAM)
+    parser.add_argument("--threads", type=int, help="torch intra-op threads (default: torch's choice)")
+    parser.add_argument("--json", help="Also write results to this file")
+    args = parser.parse_args()
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+    tokenizer = AutoTokenizer.from_pretrained(config.LLM_MODEL_ID, cache_dir=config.LLM_CACHE_DIR)
+    model = load_model(args.backend, config.LLM_MODEL_ID, config.LLM_CACHE_DIR).model
+    table = TokenTable(tokenizer)
+    prompts = prompt_set()
+    print(f"📝 {len(prompts)} prompts, greedy decoding, '{args.backend}' backend")
+
+    reference = run(model, tokenizer, table, prompts)
+    rows = [summarize("plain", reference, reference)]
+    for num_tokens in args.num_tokens:
+        print(f"⏳ prompt lookup, {num_tokens} draft tokens...")
+        results = run(model, tokenizer, table, prompts, num_tokens, args.max_ngram)
+        rows.append(summarize(f"lookup k={num_tokens}", results, reference))
+
+    print(f"\n{'mode':<14}{'ms/call':>9}{'tok/s':>8}{'same':>7}{'accept':>8}{'tok/fwd':>9}")
+    for r in rows:
+        accept = f"{r['acceptance_rate']:.0%}" if r["acceptance_rate"] is not None else "-"
+        print(f"{r['mode']:<14}{r['ms_per_completion']:>9.0f}{r['tokens_per_second']:>8.1f}{r['same']:>7.0%}"
+              f"{accept:>8}{r['tokens_per_forward']:>9.2f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(rows, f, indent=2)
+        print(f"\n💾 Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+"""
+Question bank cost and coverage at growing sizes: time to add questions, time to select a set of
+five, and how often a resume's skills get a confident (hybrid-mode) set instead of an LLM call.
+
+Banks are filled with synthetic questions over the resume skill dictionary on top of the curated
+seed, in a temporary directory. Queries draw 3-8 skills from the same dictionary.
+
+Usage (from the backend directory):
+    python benchmarks/bench_question_bank.py --sizes 1000 10000 100000 --queries 500
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config  # noqa: E402
+from keyword_index import load_terms  # noqa: E402
+from question_bank import QuestionBank  # noqa: E402
+
+TEMPLATES = [
+    "How have you used {0} in a production project?",
+    "What are the main trade-offs of {0} compared to {1}?",
+    "Describe a bug you tracked down in a {0} codebase.",
+    "How would you test code that depends on {0}?",
+    "What performance problems have you seen with {0}, and how did you fix them?",
+    "How would you explain {0} to a new team member?",
+    "When would you choose {1} over {0}?",
+    "How do you keep a {0} and {1} setup maintainable as it grows?",
+]
+
+
+def synthetic_questions(skills, count, rng):
+    """(question, skill) pairs; the numbered suffix keeps large banks from collapsing into duplicates."""
+    pairs = []
+    for i in range(count):
+        first, second = rng.sample(skills, 2)
+        pairs.append((rng.choice(TEMPLATES).format(first, second) + f" (case {i})", first))
+    return pairs
+
+
+def fill(bank, pairs, batch_size=64):
+    """Add in request-sized batches; returns seconds per added question."""
+    start = time.perf_counter()
+    for i in range(0, len(pairs), batch_size):
+        batch = pairs[i:i + batch_size]
+        bank.add([q for q, _ in batch], [batch[0][1]])
+    return (time.perf_counter() - start) / max(1, len(pairs))
+
+
+def measure(bank, skills, queries, rng):
+    latencies, hits = [], 0
+    for _ in range(queries):
+        resume_skills = rng.sample(skills, rng.randint(3, 8))
+        start = time.perf_counter()
+        picked = bank.select(resume_skills, "Software engineer building web services", count=5,
+                             min_score=config.QUESTION_BANK_MIN_SCORE, rng=rng)
+        latencies.append(time.perf_counter() - start)
+        hits += len(picked) == 5 and min(score for _, score in picked) >= config.QUESTION_BANK_MIN_SCORE
+    latencies.sort()
+    return {
+        "select_p50_ms": statistics.median(latencies) * 1000,
+        "select_p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        "hit_rate": hits / queries,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000],
+                        help="Bank sizes to measure (questions, including the curated seed)")
+    parser.add_argument("--queries", type=int, default=500, help="Selections timed per size")
+    parser.add_argument("--dim", type=int, default=config.QUESTION_BANK_DIM)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="Also write results to this file")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    skills = load_terms(config.RESUME_SKILLS_FILE)
+    directory = tempfile.mkdtemp(prefix="vocahire_bank_")
+    rows = []
+    try:
+        bank = QuestionBank(directory, dim=args.dim, seed_file=config.QUESTION_BANK_SEED_FILE,
+                            dedupe_score=config.QUESTION_BANK_DEDUPE_SCORE)
+        row = {"size": len(bank), "add_ms_per_question": None, **measure(bank, skills, args.queries, rng)}
+        rows.append(row)
+        for size in sorted(args.sizes):
+            if size <= len(bank):
+                continue
+            print(f"⏳ Growing the bank to {size} questions...")
+            add_seconds = fill(bank, synthetic_questions(skills, size - len(bank), rng))
+            rows.append({"size": len(bank), "add_ms_per_question": add_seconds * 1000,
+                         **measure(bank, skills, args.queries, rng)})
+
+        # Reopening maps the existing files instead of re-embedding them
+        start = time.perf_counter()
+        QuestionBank(directory, dim=args.dim)
+        reopen_ms = (time.perf_counter() - start) * 1000
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    print(f"\n{'size':>8}{'add ms/q':>10}{'p50 ms':>9}{'p95 ms':>9}{'hits':>7}")
+    for r in rows:
+        add = f"{r['add_ms_per_question']:.2f}" if r["add_ms_per_question"] is not None else "-"
+        print(f"{r['size']:>8}{add:>10}{r['select_p50_ms']:>9.2f}{r['select_p95_ms']:>9.2f}{r['hit_rate']:>7.0%}")
+    print(f"\n📂 Reopened the {rows[-1]['size']}-question bank in {reopen_ms:.0f} ms")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"rows": rows, "reopen_ms": reopen_ms}, f, indent=2)
+        print(f"\n💾 Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+"""
+Compare the line-oriented ResumeParser against the previous per-pattern, full-text
+implementation on synthetic resumes, checking that both produce the same analysis.
+
+Usage (from the backend directory):
+    python benchmarks/bench_resume_parser.py --resumes 500 --pages 2
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+from typing import Dict, Iterable, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from resume_parser import NAME_NOT_FOUND, ResumeAnalysis, ResumeParser  # noqa: E402
+
+
+class LegacyResumeParser(ResumeParser):
+    """The extractors as they were before the line-oriented pipeline (reference output)."""
+
+    def _analyze_pages(self, pages: Iterable[str]) -> ResumeAnalysis:
+        name = NAME_NOT_FOUND
+        skills, education, experience = {}, {}, {}
+        contact = {"email": "N/A", "phone": "N/A"}
+
+        for page_number, text in enumerate(pages):
+            if page_number == 0:
+                name = self._legacy_name(text)
+            skills.update(dict.fromkeys(self.skills_index.found(text)))
+            education.update(dict.fromkeys(self._legacy_education(text)))
+            experience.update(dict.fromkeys(self._legacy_experience(text)))
+            for key, value in self._legacy_contact(text).items():
+                if contact[key] == "N/A":
+                    contact[key] = value
+
+            has_contact = any(value != "N/A" for value in contact.values())
+            if name != NAME_NOT_FOUND and has_contact and skills and education and experience:
+                break
+
+        return ResumeAnalysis(name=name, skills=list(skills), education=list(education),
+                              experience=list(experience), contact=contact)
+
+    def _legacy_name(self, text: str) -> str:
+        for line in text.strip().split('\n')[:5]:
+            line = line.strip()
+            if re.match(r"^[A-Z][a-z]+(?:\s[A-Z][a-z]+)*$", line):
+                return line
+        return NAME_NOT_FOUND
+
+    def _legacy_education(self, text: str) -> List[str]:
+        patterns = [
+            r"(B\.?Tech|M\.?Tech|Bachelor|Master).*?(Computer|Technology|Engineering)",
+            r"(University|College)\s+\w+.*?",
+            r"(BCA|MCA|B\.?Sc|M\.?Sc)"
+        ]
+        matches = []
+        for pattern in patterns:
+            for match in re.findall(pattern, text, re.IGNORECASE):
+                matches.append(" ".join(match) if isinstance(match, tuple) else match)
+        return list(set(matches))
+
+    def _legacy_experience(self, text: str) -> List[str]:
+        lines = text.split('\n')
+        return list(set(line.strip() for line in lines
+                        if re.search(r"(intern|experience|developer|engineer)", line, re.IGNORECASE)))
+
+    def _legacy_contact(self, text: str) -> Dict[str, str]:
+        email = re.search(r'[\w\.-]+@[\w\.-]+', text)
+        phone = re.search(r'(\+91[\-\s]?)?[6-9]\d{9}', text)
+        return {"email": email.group(0) if email else "N/A", "phone": phone.group(0) if phone else "N/A"}
+
+
+FIRST_NAMES = ["Aarav", "Priya", "Rohan", "Meera", "Kabir", "Ananya", "Jane", "Omar"]
+LAST_NAMES = ["Sharma", "Iyer", "Khan", "Patel", "Doe", "Reddy", "Singh"]
+SKILLS = ["Python", "Java", "C++", "SQL", "TensorFlow", "PyTorch", "Flask", "React", "Django",
+          "HTML", "CSS", "JavaScript", "ML", "AI"]
+DEGREES = ["B.Tech in Computer Science", "M.Tech Information Technology", "Bachelor of Engineering",
+           "BCA", "MCA", "B.Sc Mathematics", "Master of Computer Applications"]
+ROLES = ["Software Engineer", "Data Science Intern", "Backend Developer", "ML Engineer",
+         "Frontend developer", "Research intern"]
+FILLER = ("Designed and shipped features used by thousands of customers while collaborating "
+          "with product and design to improve reliability and reduce cost").split()
+
+
+def synthetic_resume(rng: random.Random, pages: int) -> List[str]:
+    first = [
+        f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+        f"{rng.choice(FIRST_NAMES).lower()}.{rng.randint(1, 999)}@example.com",
+        f"+91 {rng.randint(6, 9)}{rng.randint(0, 999999999):09d}",
+        "",
+        "SKILLS",
+        ", ".join(rng.sample(SKILLS, 5)),
+    ]
+    result = ["\n".join(first)]
+    for _ in range(pages):
+        lines = ["EXPERIENCE"]
+        for _ in range(rng.randint(2, 4)):
+            lines.append(f"{rng.choice(ROLES)} at Company {rng.randint(1, 50)}")
+            lines.extend(" ".join(rng.sample(FILLER, 12)) for _ in range(rng.randint(3, 8)))
+        lines += ["EDUCATION", rng.choice(DEGREES), f"University of {rng.choice(LAST_NAMES)}",
+                  f"{rng.choice(['College', 'Institute'])} {rng.choice(LAST_NAMES)} 2019-2023"]
+        result.append("\n".join(lines))
+    return result
+
+
+def normalized(analysis: ResumeAnalysis):
+    # The legacy extractors returned education/experience in set order, so compare those as sets
+    return (analysis.name, analysis.skills, sorted(analysis.education),
+            sorted(analysis.experience), analysis.contact)
+
+
+def timed(parser: ResumeParser, corpus: List[List[str]], repeats: int):
+    best, results = float("inf"), None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        results = [parser._analyze_pages(pages) for pages in corpus]
+        best = min(best, time.perf_counter() - start)
+    return best, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--resumes", type=int, default=500)
+    parser.add_argument("--pages", type=int, default=2, help="Experience/education pages per resume")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    corpus = [synthetic_resume(rng, args.pages) for _ in range(args.resumes)]
+    kilobytes = sum(len(page) for pages in corpus for page in pages) / 1024
+    print(f"📄 {len(corpus)} synthetic resumes, {kilobytes:.0f} KB of text")
+
+    legacy_seconds, legacy_results = timed(LegacyResumeParser(), corpus, args.repeats)
+    new_seconds, new_results = timed(ResumeParser(), corpus, args.repeats)
+
+    mismatches = [i for i, (a, b) in enumerate(zip(legacy_results, new_results)) if normalized(a) != normalized(b)]
+    for name, seconds in (("legacy", legacy_seconds), ("line-oriented", new_seconds)):
+        print(f"   {name:<14} {seconds * 1000:8.1f} ms  {len(corpus) / seconds:10.0f} resumes/s")
+    print(f"⚡ Speed-up: {legacy_seconds / new_seconds:.2f}x")
+    if mismatches:
+        print(f"❌ {len(mismatches)} resumes differ, e.g. #{mismatches[0]}:")
+        print(f"   legacy: {legacy_results[mismatches[0]]}\n   new:    {new_results[mismatches[0]]}")
+        sys.exit(1)
+    print("✅ Output identical to the legacy implementation")
+
+
+if __name__ == "__main__":
+    main()
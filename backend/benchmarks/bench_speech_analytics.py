@@ -0,0 +1,108 @@
+"""
+Time the vectorized speech analytics against an equivalent per-word Python loop
+on synthetic Whisper word timestamps (answers from one minute up to an hour).
+
+Usage (from the backend directory):
+    python benchmarks/bench_speech_analytics.py --minutes 1 10 60
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config  # noqa: E402
+from keyword_index import load_terms  # noqa: E402
+from speech_analytics import MIN_PAUSE_SECONDS, TOKEN_STRIP, analyze_words  # noqa: E402
+
+VOCABULARY = ("the", "service", "uses", "a", "queue", "and", "we", "cache", "results", "in", "redis",
+              "python", "api", "latency", "um", "uh", "like", "you", "know", "so", "basically")
+
+
+def synthetic_words(minutes, rng):
+    words, t = [], 0.0
+    while t < minutes * 60:
+        length = rng.uniform(0.15, 0.45)
+        words.append({"word": " " + rng.choice(VOCABULARY), "start": t, "end": t + length,
+                      "probability": rng.betavariate(8, 1.5)})
+        gap = rng.expovariate(1 / 0.12)
+        if rng.random() < 0.01:
+            gap += rng.uniform(2, 6)  # an occasional long silence
+        t += length + gap
+    return words
+
+
+def loop_analyze(words, filler_terms, window_seconds, long_silence_seconds):
+    """The same metrics computed word by word in plain Python."""
+    tokens = [w["word"].lower().strip(TOKEN_STRIP) for w in words]
+    fillers = 0
+    for term in filler_terms:
+        parts = term.lower().split()
+        for i in range(len(tokens) - len(parts) + 1):
+            if tokens[i:i + len(parts)] == parts:
+                fillers += 1
+
+    gaps = [max(0.0, words[i + 1]["start"] - words[i]["end"]) for i in range(len(words) - 1)]
+    pauses = sorted(g for g in gaps if g >= MIN_PAUSE_SECONDS)
+    long_silences = [(words[i]["end"], words[i + 1]["start"]) for i, g in enumerate(gaps) if g >= long_silence_seconds]
+
+    start, end = words[0]["start"], max(w["end"] for w in words)
+    windows = []
+    t = start
+    while t + window_seconds <= end:
+        windows.append(sum(1 for w in words if t <= w["start"] < t + window_seconds) / window_seconds * 60)
+        t += window_seconds / 2
+
+    probs = sorted(w["probability"] for w in words)
+    return {
+        "filler_count": fillers,
+        "pause_count": len(pauses),
+        "long_silences": len(long_silences),
+        "wpm_windows": len(windows),
+        "probability_min": probs[0],
+    }
+
+
+def best_of(fn, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--minutes", type=float, nargs="+", default=[1, 10, 60])
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    filler_terms = load_terms(config.FILLER_WORDS_FILE)
+    window, silence = config.SPEECH_WPM_WINDOW_SECONDS, config.SPEECH_LONG_SILENCE_SECONDS
+
+    print(f"{'audio':>8}{'words':>8}{'loop ms':>11}{'numpy ms':>11}{'speed-up':>10}  check")
+    for minutes in args.minutes:
+        words = synthetic_words(minutes, rng)
+        loop_s, expected = best_of(lambda: loop_analyze(words, filler_terms, window, silence), args.repeats)
+        numpy_s, speech = best_of(lambda: analyze_words(words, filler_terms, window, silence, len(words)), args.repeats)
+
+        agrees = (speech.filler_count == expected["filler_count"]
+                  and speech.pause_count == expected["pause_count"]
+                  and len(speech.long_silences) == expected["long_silences"]
+                  and abs(speech.probability_min - expected["probability_min"]) < 1e-3)
+        print(f"{minutes:>6g}m {len(words):>8}{loop_s * 1000:>11.1f}{numpy_s * 1000:>11.1f}"
+              f"{loop_s / numpy_s:>9.1f}x  {'ok' if agrees else 'MISMATCH'}")
+        print(f"{'':>8}wpm {speech.words_per_minute} (windows {speech.wpm_min}-{speech.wpm_max}), "
+              f"pauses p50/p90 {speech.pause_p50}/{speech.pause_p90}s, "
+              f"{len(speech.long_silences)} long silences, filler density {speech.filler_density}%, "
+              f"p10 probability {statistics.quantiles([w['probability'] for w in words], n=10)[0]:.3f}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
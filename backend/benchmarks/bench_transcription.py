@@ -0,0 +1,65 @@
+"""
+Report Whisper real-time factor (processing time / audio duration) per decoding mode.
+
+Usage (from the backend directory):
+    python benchmarks/bench_transcription.py --samples path/to/wavs --modes fast balanced accurate
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+import wave
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from transcription_service import DECODING_MODES  # noqa: E402
+from voice_processor import AudioTranscriber  # noqa: E402
+
+
+def wav_duration(path):
+    with wave.open(path, "rb") as wav:
+        return wav.getnframes() / float(wav.getframerate())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--samples", required=True, help="Directory of sample .wav files")
+    parser.add_argument("--model-size", default="base")
+    parser.add_argument("--modes", nargs="+", default=list(DECODING_MODES), choices=list(DECODING_MODES))
+    parser.add_argument("--repeats", type=int, default=3, help="Timed runs per file (after one warm-up)")
+    args = parser.parse_args()
+
+    samples = sorted(glob.glob(os.path.join(args.samples, "*.wav")))
+    if not samples:
+        sys.exit(f"No .wav files found in {args.samples}")
+    audio_seconds = sum(wav_duration(p) for p in samples)
+    print(f"📂 {len(samples)} samples, {audio_seconds:.1f}s of audio")
+
+    transcribers = {}
+    rows = []
+    for name in args.modes:
+        mode = DECODING_MODES[name]
+        if mode.int8 not in transcribers:
+            transcribers[mode.int8] = AudioTranscriber(args.model_size, int8=mode.int8)
+        transcriber = transcribers[mode.int8]
+
+        transcriber.transcribe(samples[0], beam_size=mode.beam_size, word_timestamps=mode.word_timestamps)
+
+        elapsed = 0.0
+        for _ in range(args.repeats):
+            for path in samples:
+                start = time.perf_counter()
+                transcriber.transcribe(path, beam_size=mode.beam_size, word_timestamps=mode.word_timestamps)
+                elapsed += time.perf_counter() - start
+
+        per_run = elapsed / args.repeats
+        rows.append((name, per_run, per_run / audio_seconds))
+
+    print(f"\n{'mode':<10} {'seconds':>10} {'RTF':>8}")
+    for name, seconds, rtf in rows:
+        print(f"{name:<10} {seconds:>10.2f} {rtf:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
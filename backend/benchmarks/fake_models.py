@@ -0,0 +1,240 @@
+"""
+Deterministic stand-ins for TinyLlama, Whisper and the TTS service with configurable latency,
+so request handling, batching, caching and the DB can be load-tested without model weights.
+
+They mirror the methods the app calls, including the SSE streaming endpoints. The LLM stand-in
+goes through the real InferenceScheduler, so micro-batching behaves as it does in production:
+one sleep per batch.
+"""
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+import wave
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict
+from typing import Any, Dict, Iterator, List, Tuple, Union
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config  # noqa: E402
+from inference_scheduler import GenerationRequest, InferenceScheduler  # noqa: E402
+from structured_output import AnswerEvaluation  # noqa: E402
+from transcription_service import TranscriptionBusy  # noqa: E402
+
+QUESTION_TEMPLATES = [
+    "Can you walk me through a project where you used {topic}?",
+    "What trade-offs did you consider when choosing {topic}?",
+    "How would you debug a production issue involving {topic}?",
+    "How do you keep code that relies on {topic} maintainable?",
+    "What would you change about how you used {topic} if you started again?",
+]
+
+ANSWER_SENTENCES = [
+    "I built a REST API in Python with Flask and deployed it using Docker.",
+    "We used SQL indexes and caching to keep the response time under a hundred milliseconds.",
+    "I wrote unit tests and used git with code review for every change.",
+    "The hardest part was debugging a race condition between two background workers.",
+]
+
+
+def _digest(text: str) -> int:
+    return int(hashlib.sha256(text.encode("utf-8")).hexdigest()[:8], 16)
+
+
+def write_silent_wav(path: str, seconds: float = 0.5, sample_rate: int = 22050):
+    with wave.open(path, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(b"\x00\x00" * int(seconds * sample_rate))
+
+
+class FakeQuestionGenerator:
+    def __init__(self, batch_delay_ms: float = 200.0):
+        """
+        :param batch_delay_ms: Time one generate() batch takes, whatever its size.
+        """
+        self.batch_delay = batch_delay_ms / 1000.0
+        self.scheduler = InferenceScheduler(
+            self._generate_batch,
+            max_batch_size=config.INFERENCE_MAX_BATCH_SIZE,
+            max_wait_ms=config.INFERENCE_MAX_WAIT_MS
+        )
+
+    def _generate_batch(self, requests: List[GenerationRequest]) -> List[str]:
+        time.sleep(self.batch_delay)
+        return [str(r.prompt) for r in requests]
+
+    def _complete(self, prompt: str) -> str:
+        return self.scheduler.submit(prompt, 256, 0.7, 0.9).result()
+
+    def memory_bytes(self) -> int:
+        return 0
+
+    def generate(self, resume_summary: str) -> List[str]:
+        return self.generate_many([resume_summary])[0]
+
+    def generate_variants(self, resume_summary: str, count: int) -> List[List[str]]:
+        return self.generate_many([f"{resume_summary} {i}" if i else resume_summary for i in range(max(1, count))])
+
+    def generate_many(self, resume_summaries: List[str]) -> List[List[str]]:
+        # Queued at once so they share batches, as in production
+        futures = [self.scheduler.submit(summary, 300, 0.7, 0.9) for summary in resume_summaries]
+        for future in futures:
+            future.result()
+        return [self._questions(summary) for summary in resume_summaries]
+
+    @staticmethod
+    def _questions(resume_summary: str) -> List[str]:
+        words = resume_summary.split() or ["your experience"]
+        seed = _digest(resume_summary)
+        return [
+            template.format(topic=words[(seed + i) % len(words)])
+            for i, template in enumerate(QUESTION_TEMPLATES)
+        ]
+
+    def generate_follow_up(self, context: str) -> str:
+        self._complete(context)
+        return self._follow_up(context)
+
+    def follow_up_and_evaluation(self, qa_context: str) -> Tuple[str, str]:
+        # Both rows are queued before either is awaited, so they share a batch as in production
+        futures = [self.scheduler.submit(qa_context, 100, 0.7, 0.9),
+                   self.scheduler.submit(qa_context, 409, 0.3, 0.9, schema="answer_evaluation")]
+        for future in futures:
+            future.result()
+        return self._follow_up(qa_context), json.dumps(asdict(self._evaluation(qa_context)))
+
+    def stream_follow_up(self, context: str) -> Iterator[str]:
+        self.scheduler.submit(context, 100, 0.7, 0.9).result()
+        yield from self._pieces(self._follow_up(context))
+
+    @staticmethod
+    def parse_follow_up(response: str) -> str:
+        return response.strip()
+
+    @staticmethod
+    def _pieces(text: str) -> Iterator[str]:
+        """Word-sized pieces, like the real streamer's decoded tokens."""
+        words = text.split(" ")
+        for i, word in enumerate(words):
+            yield word if i == 0 else " " + word
+
+    @staticmethod
+    def _follow_up(context: str) -> str:
+        return QUESTION_TEMPLATES[_digest(context) % len(QUESTION_TEMPLATES)].format(topic="that approach")
+
+    def evaluate_answer(self, qa_context: str) -> AnswerEvaluation:
+        self._complete(qa_context)
+        return self._evaluation(qa_context)
+
+    @staticmethod
+    def _evaluation(qa_context: str) -> AnswerEvaluation:
+        score = 40 + _digest(qa_context) % 50
+        return AnswerEvaluation(
+            feedback="Stand-in review of the answer.",
+            technical_score=score,
+            relevance_score=score,
+            confidence_score=score,
+            improvement_suggestions=["Add a concrete example", "Quantify the outcome", "Explain the trade-offs"],
+            expected_answer="A stand-in summary of the ideal answer."
+        )
+
+    def review_answer(self, qa_context: str) -> Dict[str, Any]:
+        return self.evaluate_answer(qa_context).to_review()
+
+    def stream_review(self, qa_context: str) -> Iterator[str]:
+        self.scheduler.submit(qa_context, 409, 0.3, 0.9, schema="answer_evaluation").result()
+        yield from self._pieces(json.dumps(asdict(self._evaluation(qa_context))))
+
+    @staticmethod
+    def parse_review(response: str) -> Dict[str, Union[int, str]]:
+        return AnswerEvaluation.from_json(response).to_review()
+
+
+class FakeTranscriber:
+    def __init__(self, delay_ms: float = 500.0, replicas: int = None, max_queue: int = None):
+        """
+        Mirrors TranscriptionService: `replicas` decodes run at once and at most `max_queue`
+        more may wait before TranscriptionBusy is raised.
+        """
+        self.delay = delay_ms / 1000.0
+        replicas = replicas or config.WHISPER_REPLICAS
+        max_queue = config.WHISPER_MAX_QUEUE if max_queue is None else max_queue
+        self._executor = ThreadPoolExecutor(max_workers=max(1, replicas), thread_name_prefix="fake-whisper")
+        self._slots = threading.BoundedSemaphore(max(1, replicas) + max(0, max_queue))
+
+    def warm_up(self):
+        pass
+
+    def _decode(self, audio_path: str) -> Dict[str, Any]:
+        time.sleep(self.delay)
+        text = " ".join(ANSWER_SENTENCES[:1 + os.path.getsize(audio_path) % len(ANSWER_SENTENCES)])
+        words, start = [], 0.0
+        for word in text.split():
+            words.append({"word": " " + word, "start": start, "end": start + 0.3, "probability": 0.9})
+            start += 0.35
+        return {"text": text, "language": "en", "words": words}
+
+    def submit(self, audio_path: str, mode: str = None) -> Future:
+        if not self._slots.acquire(blocking=False):
+            raise TranscriptionBusy("Transcription queue is full")
+        future = self._executor.submit(self._decode, audio_path)
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def transcribe(self, audio_path: str, mode: str = None) -> Dict[str, Any]:
+        return self.submit(audio_path, mode).result()
+
+    def pending(self) -> int:
+        return 0
+
+
+class FakeTTS:
+    def __init__(self, clip_delay_ms: float = 300.0, workers: int = None):
+        """
+        :param clip_delay_ms: Synthesis time per utterance; `workers` clips are synthesized at once.
+        """
+        self.clip_delay = clip_delay_ms / 1000.0
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers or config.TTS_WORKERS),
+                                            thread_name_prefix="fake-tts")
+
+    def warm_up(self):
+        pass
+
+    def _synthesize(self, output_path: str, wav: bool) -> str:
+        time.sleep(self.clip_delay)
+        if wav:
+            write_silent_wav(output_path)
+        else:
+            with open(output_path, "wb") as f:
+                f.write(b"ID3")  # placeholder MP3; nothing in the request path decodes it
+        return output_path
+
+    def synthesize_iter(self, texts: List[str], output_paths: List[str]) -> Iterator[Tuple[int, str]]:
+        futures = [self._executor.submit(self._synthesize, path, True) for path in output_paths[:len(texts)]]
+        for i, future in enumerate(futures):
+            yield i, future.result()
+
+    def synthesize_many(self, texts: List[str], output_paths: List[str]) -> List[str]:
+        return [path for _, path in self.synthesize_iter(texts, output_paths)]
+
+    def synthesize_gtts_many(self, texts: List[str], output_paths: List[str]) -> List[str]:
+        futures = [self._executor.submit(self._synthesize, path, False) for path in output_paths[:len(texts)]]
+        return [f.result() for f in futures]
+
+
+def install(app_module, llm_delay_ms: float, whisper_delay_ms: float, tts_delay_ms: float):
+    """Swap the stand-ins into an imported `app` module in place of the real models."""
+    import tts_generator
+
+    fake_tts = FakeTTS(tts_delay_ms)
+    app_module.model_registry.override("question_gen", FakeQuestionGenerator(llm_delay_ms))
+    app_module.model_registry.override("whisper", FakeTranscriber(whisper_delay_ms))
+    app_module.model_registry.override("tts", fake_tts)
+    # Both modules call the shared TTS service directly rather than through the registry
+    app_module.tts_service = fake_tts
+    tts_generator.tts_service = fake_tts
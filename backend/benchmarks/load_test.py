@@ -0,0 +1,323 @@
+"""
+End-to-end load test for /api/analyze-resume and /api/process-audio through the Flask test client.
+
+Each endpoint is driven by `--concurrency` client threads until `--requests` requests have
+completed. Reports throughput, p50/p95/p99 latency and peak RSS (this process plus worker
+processes) per endpoint. For resumes, "accept" is the 202 response and "pipeline" is the time
+until the job has parsed, generated questions and synthesized all audio.
+
+By default the models are deterministic stand-ins (benchmarks/fake_models.py) with configurable
+latency, so concurrency, batching and caching changes can be compared without weights.
+`--models real` loads TinyLlama/Whisper/TTS instead (pass a spoken `--audio` sample).
+
+The run uses a throw-away SQLite database and removes the uploads and audio it created.
+
+Usage (from the backend directory):
+    python benchmarks/load_test.py --requests 50 --concurrency 8
+    python benchmarks/load_test.py --endpoints process-audio --whisper-delay-ms 800 --json out.json
+    python benchmarks/load_test.py --models real --audio answer.wav --resume resume.pdf --requests 10
+"""
+import argparse
+import contextlib
+import io
+import json
+import math
+import multiprocessing
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import wave
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+ENDPOINTS = ("analyze-resume", "process-audio")
+PIPELINE_TIMEOUT = 600
+
+
+# ------------------- INPUTS -------------------
+def synthetic_resume(index: int, skills: List[str], unique: bool) -> bytes:
+    """A one-page PDF the parser understands; unique resumes vary their skills to miss the caches."""
+    import fitz
+
+    rng = random.Random(index if unique else 0)
+    lines = [
+        "Jordan Avery",
+        "jordan.avery@example.com  9876543210",
+        "",
+        "Skills: " + ", ".join(rng.sample(skills, min(6, len(skills)))),
+        "",
+        "Education",
+        "Bachelor of Technology in Computer Science, State University College",
+        "",
+        "Experience",
+        "Software Engineer, Example Corp (2021 - present)",
+        "Backend Developer Intern, Sample Labs (2020)",
+    ]
+    with fitz.open() as doc:
+        page = doc.new_page()
+        page.insert_text((72, 72), "\n".join(lines), fontsize=11)
+        return doc.tobytes()
+
+
+def synthetic_wav(seconds: float = 3.0, sample_rate: int = 16000) -> bytes:
+    import numpy as np
+
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    samples = (0.2 * np.sin(2 * np.pi * 220 * t) * 32767).astype("<i2")
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(samples.tobytes())
+    return buffer.getvalue()
+
+
+# ------------------- MEASUREMENT -------------------
+def process_tree_rss() -> float:
+    """RSS of this process plus its worker processes (Whisper/TTS pools), in bytes."""
+    from metrics import resident_memory_bytes
+
+    total = resident_memory_bytes() or 0
+    page_size = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+    for child in multiprocessing.active_children():
+        try:
+            with open(f"/proc/{child.pid}/statm") as f:
+                total += int(f.read().split()[1]) * page_size
+        except (OSError, ValueError, IndexError):
+            pass
+    return total
+
+
+class PeakRssSampler:
+    def __init__(self, interval: float = 0.02):
+        self.interval = interval
+        self.peak = 0.0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, name="rss-sampler", daemon=True)
+
+    def _loop(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, process_tree_rss())
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, process_tree_rss())
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return float("nan")
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(name: str, latencies: List[float], errors: int, wall_seconds: float, peak_rss: float) -> Dict:
+    ordered = sorted(latencies)
+    return {
+        "endpoint": name,
+        "ok": len(ordered),
+        "errors": errors,
+        "throughput_rps": len(ordered) / wall_seconds if wall_seconds else 0.0,
+        "p50_ms": percentile(ordered, 50) * 1000,
+        "p95_ms": percentile(ordered, 95) * 1000,
+        "p99_ms": percentile(ordered, 99) * 1000,
+        "peak_rss_mb": peak_rss / (1024 * 1024),
+    }
+
+
+def run_load(app, name: str, request_fn: Callable, total: int, concurrency: int) -> List[Dict]:
+    """
+    Call `request_fn(client, index)` `total` times from `concurrency` threads. It returns a
+    dict of phase -> seconds (e.g. {"accept": .., "pipeline": ..}) or raises on failure.
+    """
+    results: Dict[str, List[float]] = {}
+    errors: List[str] = []
+    lock = threading.Lock()
+    counter = iter(range(total))
+
+    def client_loop():
+        client = app.test_client()
+        while True:
+            with lock:
+                index = next(counter, None)
+            if index is None:
+                return
+            try:
+                phases = request_fn(client, index)
+            except Exception as e:
+                with lock:
+                    errors.append(str(e))
+                continue
+            with lock:
+                for phase, seconds in phases.items():
+                    results.setdefault(phase, []).append(seconds)
+
+    with PeakRssSampler() as sampler:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            for future in [pool.submit(client_loop) for _ in range(concurrency)]:
+                future.result()
+        wall = time.perf_counter() - start
+
+    if errors:
+        print(f"⚠️ {name}: {len(errors)} failed, e.g. {errors[0]}", file=sys.__stdout__)
+    phases = results or {"": []}
+    return [
+        summarize(f"{name} {phase}".strip(), latencies, len(errors), wall, sampler.peak)
+        for phase, latencies in phases.items()
+    ]
+
+
+# ------------------- REQUESTS -------------------
+def analyze_resume_request(app_module, skills: List[str], resume: Optional[bytes], unique: bool):
+    job_manager = app_module.job_manager
+
+    def request_fn(client, index):
+        data = resume or synthetic_resume(index, skills, unique)
+        start = time.perf_counter()
+        response = client.post("/api/analyze-resume", data={
+            "resume": (io.BytesIO(data), f"resume_{index}.pdf")
+        }, content_type="multipart/form-data")
+        accepted = time.perf_counter()
+        if response.status_code != 202:
+            raise RuntimeError(f"HTTP {response.status_code}: {response.get_json()}")
+
+        job = job_manager.get(response.get_json()["job_id"])
+        job.wait_for(lambda j: False, timeout=PIPELINE_TIMEOUT)  # returns once the job ends
+        if job.status != "done":
+            raise RuntimeError(f"job {job.status}: {job.error}")
+        return {"accept": accepted - start, "pipeline": time.perf_counter() - start}
+
+    return request_fn
+
+
+def process_audio_request(audio: bytes):
+    def request_fn(client, index):
+        start = time.perf_counter()
+        response = client.post("/api/process-audio", data={
+            "audio": (io.BytesIO(audio), "answer.wav"),
+            "question": "Can you walk me through a project where you used Python?"
+        }, content_type="multipart/form-data")
+        if response.status_code != 200:
+            raise RuntimeError(f"HTTP {response.status_code}: {response.get_json()}")
+        return {"": time.perf_counter() - start}
+
+    return request_fn
+
+
+# ------------------- MAIN -------------------
+def print_table(rows: List[Dict]):
+    header = f"{'endpoint':<28}{'ok':>6}{'err':>5}{'req/s':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'peak RSS':>11}"
+    print(header)
+    print("-" * len(header))
+    for r in rows:
+        print(f"{r['endpoint']:<28}{r['ok']:>6}{r['errors']:>5}{r['throughput_rps']:>9.2f}"
+              f"{r['p50_ms']:>10.1f}{r['p95_ms']:>10.1f}{r['p99_ms']:>10.1f}{r['peak_rss_mb']:>9.0f}MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--endpoints", nargs="+", default=list(ENDPOINTS), choices=ENDPOINTS)
+    parser.add_argument("--requests", type=int, default=40, help="Timed requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent client threads")
+    parser.add_argument("--warmup", type=int, default=2, help="Untimed requests per endpoint first")
+    parser.add_argument("--models", choices=("fake", "real"), default="fake")
+    parser.add_argument("--llm-delay-ms", type=float, default=200, help="Stand-in time per LLM batch")
+    parser.add_argument("--whisper-delay-ms", type=float, default=500, help="Stand-in time per transcription")
+    parser.add_argument("--tts-delay-ms", type=float, default=300, help="Stand-in time per synthesized clip")
+    parser.add_argument("--resume", help="PDF to upload (default: generated resumes)")
+    parser.add_argument("--repeat-resume", action="store_true",
+                        help="Upload the same generated resume every time (measures the cached path)")
+    parser.add_argument("--audio", help="WAV answer to upload (default: 3s generated tone)")
+    parser.add_argument("--json", help="Also write the results to this file")
+    parser.add_argument("--keep-artifacts", action="store_true", help="Keep uploads and audio written by the run")
+    parser.add_argument("--verbose", action="store_true", help="Show the app's own logging")
+    parser.add_argument("--question-bank", choices=("off", "hybrid", "bank"),
+                        help="QUESTION_BANK_MODE for the run (default: the configured mode)")
+    args = parser.parse_args()
+
+    # The app binds its database at import time, so point it at a scratch file first
+    scratch_dir = tempfile.mkdtemp(prefix="vocahire_load_")
+    os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(scratch_dir, "load_test.db")
+    # Likewise the question bank, which starts from the curated seed so runs are repeatable
+    os.environ["QUESTION_BANK_DIR"] = os.path.join(scratch_dir, "question_bank")
+    if args.question_bank:
+        os.environ["QUESTION_BANK_MODE"] = args.question_bank
+    os.environ.setdefault("METRICS_REQUEST_LOG", "0")
+
+    import app as app_module
+    from keyword_index import load_terms
+    from models import db
+    import config
+
+    with app_module.app.app_context():
+        db.create_all()
+
+    if args.models == "fake":
+        import fake_models
+        fake_models.install(app_module, args.llm_delay_ms, args.whisper_delay_ms, args.tts_delay_ms)
+    else:
+        print("⏳ Loading models...")
+        app_module.model_registry.warm_up(["question_gen", "whisper", "tts"], background=False)
+
+    resume = open(args.resume, "rb").read() if args.resume else None
+    audio = open(args.audio, "rb").read() if args.audio else synthetic_wav()
+    skills = load_terms(config.RESUME_SKILLS_FILE)
+    unique = not args.repeat_resume
+
+    uploads_before = set(os.listdir(app_module.UPLOAD_FOLDER))
+    audio_before = set(os.listdir(app_module.AUDIO_FOLDER))
+
+    rows = []
+    quiet = open(os.devnull, "w") if not args.verbose else None
+    try:
+        for endpoint in args.endpoints:
+            if endpoint == "analyze-resume":
+                request_fn = analyze_resume_request(app_module, skills, resume, unique)
+            else:
+                request_fn = process_audio_request(audio)
+
+            print(f"🚀 {endpoint}: {args.requests} requests, concurrency {args.concurrency}, {args.models} models")
+            with contextlib.redirect_stdout(quiet) if quiet else contextlib.nullcontext():
+                if args.warmup:
+                    # Warm-up inputs use indexes past the timed run so they don't pre-fill its caches
+                    run_load(app_module.app, endpoint, lambda c, i: request_fn(c, i + args.requests),
+                             args.warmup, min(args.warmup, args.concurrency))
+                rows.extend(run_load(app_module.app, endpoint, request_fn, args.requests, args.concurrency))
+    finally:
+        if quiet:
+            quiet.close()
+        if not args.keep_artifacts:
+            for name in set(os.listdir(app_module.UPLOAD_FOLDER)) - uploads_before:
+                path = os.path.join(app_module.UPLOAD_FOLDER, name)
+                if os.path.isfile(path):
+                    os.remove(path)
+            for name in set(os.listdir(app_module.AUDIO_FOLDER)) - audio_before:
+                shutil.rmtree(os.path.join(app_module.AUDIO_FOLDER, name), ignore_errors=True)
+        app_module.proctor_log.close()
+        shutil.rmtree(scratch_dir, ignore_errors=True)
+
+    print()
+    print_table(rows)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"args": vars(args), "results": rows}, f, indent=2)
+        print(f"\n💾 Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
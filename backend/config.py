@@ -0,0 +1,124 @@
+import os
+
+# ------------------- .ENV -------------------
+# A .env file at the repository root (see .env.example) fills in variables that are not already
+# set in the environment; python-dotenv is in requirements.txt
+ENV_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".env")
+if os.path.exists(ENV_FILE):
+    try:
+        from dotenv import load_dotenv
+        load_dotenv(ENV_FILE, override=False)
+    except ImportError:
+        print(f"⚠️ {ENV_FILE} ignored: python-dotenv is not installed")
+
+# ------------------- LLM INFERENCE -------------------
+LLM_MODEL_ID = os.getenv("LLM_MODEL_ID", "TinyLlama/TinyLlama-1.1B-Chat-v1.0")
+LLM_CACHE_DIR = os.getenv("LLM_CACHE_DIR", "D:/huggingface_cache")
+# torch (fp16 on GPU, fp32 on CPU) | int8 (dynamic int8 Linear layers) | onnx | onnx-int8 (ONNX Runtime).
+# The last three run on CPU and use weights converted once by `python convert_llm.py`.
+LLM_BACKEND = os.getenv("LLM_BACKEND", "torch")
+LLM_CONVERTED_DIR = os.getenv("LLM_CONVERTED_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "llm"))
+# Prompts from concurrent requests are grouped into one generate() call per tick
+INFERENCE_MAX_BATCH_SIZE = int(os.getenv("INFERENCE_MAX_BATCH_SIZE", "8"))
+# How long (ms) the oldest queued prompt waits for others before its batch runs
+INFERENCE_MAX_WAIT_MS = float(os.getenv("INFERENCE_MAX_WAIT_MS", "25"))
+# Reuse precomputed key/values for the fixed system-prompt prefixes so only the variable part is prefilled
+PROMPT_PREFIX_CACHE = os.getenv("PROMPT_PREFIX_CACHE", "1").lower() not in ("0", "false", "no")
+# Follow-ups and reviews draft tokens from n-gram matches in their prompt and verify each draft in one
+# forward pass (single sequence per call; torch/int8 backends only)
+PROMPT_LOOKUP_DECODING = os.getenv("PROMPT_LOOKUP_DECODING", "0").lower() not in ("0", "false", "no")
+# Longest draft proposed per forward pass, and the longest trailing n-gram searched for
+PROMPT_LOOKUP_NUM_TOKENS = int(os.getenv("PROMPT_LOOKUP_NUM_TOKENS", "10"))
+PROMPT_LOOKUP_MAX_NGRAM = int(os.getenv("PROMPT_LOOKUP_MAX_NGRAM", "3"))
+
+# ------------------- BACKGROUND JOBS -------------------
+# Resume pipelines (parse -> questions -> audio) run on this many worker threads
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+# Finished jobs stay pollable for this long
+JOB_TTL_SECONDS = int(os.getenv("JOB_TTL_SECONDS", "3600"))
+
+# ------------------- TEXT TO SPEECH -------------------
+TTS_MODEL_NAME = os.getenv("TTS_MODEL_NAME", "tts_models/en/ljspeech/tacotron2-DDC")
+# Synthesis processes, each holding its own model (capped at the core count)
+TTS_WORKERS = int(os.getenv("TTS_WORKERS", "2"))
+# Content-addressed cache of synthesized clips, evicted LRU beyond the size budget
+TTS_CACHE_DIR = os.getenv("TTS_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "tts"))
+TTS_CACHE_MAX_MB = int(os.getenv("TTS_CACHE_MAX_MB", "512"))
+
+# ------------------- AUDIO ARTIFACTS -------------------
+# Per-session audio under frontend/static/audio/<session_id>/ is expired by a background janitor
+ARTIFACT_MAX_AGE_HOURS = float(os.getenv("ARTIFACT_MAX_AGE_HOURS", "24"))
+ARTIFACT_MAX_DISK_MB = int(os.getenv("ARTIFACT_MAX_DISK_MB", "2048"))
+ARTIFACT_SWEEP_INTERVAL_SECONDS = int(os.getenv("ARTIFACT_SWEEP_INTERVAL_SECONDS", "600"))
+
+# ------------------- SPEECH TO TEXT -------------------
+WHISPER_MODEL_SIZE = os.getenv("WHISPER_MODEL_SIZE", "base")
+# Whisper replicas, one per worker process
+WHISPER_REPLICAS = int(os.getenv("WHISPER_REPLICAS", "2"))
+# Answers allowed to wait for a replica before /api/process-audio returns 503
+WHISPER_MAX_QUEUE = int(os.getenv("WHISPER_MAX_QUEUE", "8"))
+# accurate (beam 5, word timestamps) | balanced (greedy, word timestamps) | fast (greedy, int8, no timestamps)
+WHISPER_DECODING_MODE = os.getenv("WHISPER_DECODING_MODE", "balanced")
+# Speech analytics over word timestamps (modes without timestamps fall back to text-only scoring)
+SPEECH_WPM_WINDOW_SECONDS = float(os.getenv("SPEECH_WPM_WINDOW_SECONDS", "30"))
+SPEECH_LONG_SILENCE_SECONDS = float(os.getenv("SPEECH_LONG_SILENCE_SECONDS", "2.0"))
+# Share of the reported confidence taken from delivery (speech analytics); the rest is the LLM's confidence_score
+SPEECH_CONFIDENCE_WEIGHT = float(os.getenv("SPEECH_CONFIDENCE_WEIGHT", "0.5"))
+
+# ------------------- MODEL LOADING -------------------
+# Models load lazily on first use; these are loaded in the background at startup instead.
+# Choices: question_gen, whisper, tts (comma-separated). /api/ready reports 503 until they are loaded.
+WARMUP_MODELS = [m.strip() for m in os.getenv("WARMUP_MODELS", "").split(",") if m.strip()]
+
+# ------------------- DATABASE -------------------
+# Relative sqlite paths resolve against backend/instance/
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///interviews.db")
+
+# ------------------- ANALYSIS CACHE -------------------
+# Resume analyses (by PDF SHA-256) and question sets (by normalized summary hash) live in SQLite
+ANALYSIS_CACHE_TTL_HOURS = float(os.getenv("ANALYSIS_CACHE_TTL_HOURS", "168"))
+# Question sets generated per resume on a cache miss; each session picks one at random
+QUESTION_VARIANTS = int(os.getenv("QUESTION_VARIANTS", "1"))
+
+# ------------------- RESUME PARSING -------------------
+# Uploads are parsed from memory page by page; extraction stops at these caps
+RESUME_MAX_UPLOAD_MB = float(os.getenv("RESUME_MAX_UPLOAD_MB", "10"))
+RESUME_MAX_PAGES = int(os.getenv("RESUME_MAX_PAGES", "8"))
+RESUME_MAX_TEXT_KB = int(os.getenv("RESUME_MAX_TEXT_KB", "256"))
+
+# ------------------- PROCTORING -------------------
+# Events are buffered and written by a background flusher once either limit is reached
+PROCTOR_FLUSH_MAX_EVENTS = int(os.getenv("PROCTOR_FLUSH_MAX_EVENTS", "256"))
+PROCTOR_FLUSH_INTERVAL_MS = float(os.getenv("PROCTOR_FLUSH_INTERVAL_MS", "1000"))
+# flush (fsync after every flush) | none (leave it to the OS)
+PROCTOR_FSYNC = os.getenv("PROCTOR_FSYNC", "flush")
+# Largest event array accepted by one /api/proctor-report request
+PROCTOR_MAX_BATCH = int(os.getenv("PROCTOR_MAX_BATCH", "500"))
+# Days of proctor index kept in memory; older days are re-read from their .idx file when queried
+PROCTOR_INDEX_CACHED_DAYS = int(os.getenv("PROCTOR_INDEX_CACHED_DAYS", "7"))
+
+# ------------------- METRICS -------------------
+# Print one JSON line per request with its total time and per-stage breakdown
+METRICS_REQUEST_LOG = os.getenv("METRICS_REQUEST_LOG", "1").lower() not in ("0", "false", "no")
+
+# ------------------- KEYWORD DICTIONARIES -------------------
+# One term per line; used for answer scoring and resume skill extraction
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+TECHNICAL_TERMS_FILE = os.getenv("TECHNICAL_TERMS_FILE", os.path.join(DATA_DIR, "technical_terms.txt"))
+FILLER_WORDS_FILE = os.getenv("FILLER_WORDS_FILE", os.path.join(DATA_DIR, "filler_words.txt"))
+RESUME_SKILLS_FILE = os.getenv("RESUME_SKILLS_FILE", os.path.join(DATA_DIR, "resume_skills.txt"))
+
+# ------------------- QUESTION BANK -------------------
+# off | hybrid | bank: whether interview questions come from the embedding-indexed bank or the LLM
+QUESTION_BANK_MODE = os.getenv("QUESTION_BANK_MODE", "off").lower()
+QUESTION_BANK_DIR = os.getenv(
+    "QUESTION_BANK_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "question_bank"))
+# Curated "skill | question" lines loaded into an empty bank
+QUESTION_BANK_SEED_FILE = os.getenv("QUESTION_BANK_SEED_FILE", os.path.join(DATA_DIR, "question_bank.txt"))
+QUESTION_BANK_DIM = int(os.getenv("QUESTION_BANK_DIM", "1024"))
+# Hybrid mode serves banked questions only if every one scores at least this against a resume skill
+QUESTION_BANK_MIN_SCORE = float(os.getenv("QUESTION_BANK_MIN_SCORE", "0.35"))
+# A generated question is banked once an answer to it is rated at least this relevant (0-100)
+QUESTION_BANK_MIN_RELEVANCE = int(os.getenv("QUESTION_BANK_MIN_RELEVANCE", "60"))
+# Questions at or above this cosine similarity to a banked (or already picked) one are duplicates
+QUESTION_BANK_DEDUPE_SCORE = float(os.getenv("QUESTION_BANK_DEDUPE_SCORE", "0.9"))
@@ -0,0 +1,32 @@
+"""
+Convert the question model once for a CPU inference backend and cache it under LLM_CONVERTED_DIR.
+The app then loads the converted weights directly when LLM_BACKEND is set to the same backend.
+
+    int8       torch, Linear layers dynamically quantized to int8
+    onnx       ONNX Runtime graph with KV-cache (needs optimum[onnxruntime])
+    onnx-int8  the ONNX graph with int8 dynamically quantized MatMuls
+
+Usage (from the backend directory):
+    python convert_llm.py --backend int8
+    python convert_llm.py --backend onnx onnx-int8 --force
+"""
+import argparse
+import sys
+
+import config
+from llm_backends import CONVERTED_BACKENDS, convert
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backend", nargs="+", required=True, choices=CONVERTED_BACKENDS)
+    parser.add_argument("--model-id", default=config.LLM_MODEL_ID)
+    parser.add_argument("--force", action="store_true", help="Convert again even if a cached conversion exists")
+    args = parser.parse_args()
+
+    for backend in args.backend:
+        convert(backend, args.model_id, config.LLM_CACHE_DIR, force=args.force)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,191 @@
+import os
+import threading
+import time
+import uuid
+import wave
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from artifact_store import atomic_output
+from transcription_service import DECODING_MODES, TranscriptionBusy
+
+SAMPLE_RATE = 16000  # whisper.audio.SAMPLE_RATE; whisper itself is only imported when decoding
+
+
+def write_wav(path: str, audio: np.ndarray):
+    """Write float32 [-1, 1] mono audio at Whisper's sample rate as 16-bit PCM."""
+    pcm = (np.clip(audio, -1.0, 1.0) * 32767).astype("<i2")
+    with atomic_output(path) as tmp_path:
+        with wave.open(tmp_path, "wb") as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(SAMPLE_RATE)
+            wav.writeframes(pcm.tobytes())
+
+
+class IncrementalTranscription:
+    def __init__(self, stream_dir: str, service: Callable[[], Any], default_mode: str,
+                 session_id: Optional[str] = None, overlap_seconds: float = 2.0, min_new_seconds: float = 4.0,
+                 executor: Optional[ThreadPoolExecutor] = None):
+        """
+        Transcribe an answer while it is still being recorded.
+        Chunks from MediaRecorder are appended to one growing file; each pass
+        re-transcribes only the audio after the last committed word (plus an
+        overlap) and stitches the new words on by timestamp.
+        :param stream_dir: Directory for the growing recording and pass windows.
+        :param service: Returns the TranscriptionService for each pass (through the model registry,
+            so a first pass loads Whisper the same way /api/process-audio does).
+        :param default_mode: The deployment's Whisper decoding mode.
+        :param session_id: Interview session the answer belongs to.
+        :param overlap_seconds: Audio re-decoded before the commit point so cut words are recovered.
+        :param min_new_seconds: Uncommitted audio needed before another pass is started.
+        """
+        self.stream_dir = stream_dir
+        self.service = service
+        self.session_id = session_id
+        self.overlap_seconds = overlap_seconds
+        self.min_new_seconds = min_new_seconds
+        self.executor = executor
+        self.recording_path = os.path.join(stream_dir, "recording.webm")
+        self.updated_at = time.time()
+
+        default = DECODING_MODES[default_mode]
+        # Stitching needs word timestamps, whatever the deployment default is
+        self.mode = default.name if default.word_timestamps else "balanced"
+
+        self.words: List[Dict[str, Any]] = []
+        self.language = "unknown"
+        self.committed_until = 0.0  # seconds of audio whose words are final
+        self._received_bytes = 0
+        self._bytes_at_last_pass = 0
+        self._lock = threading.Lock()
+        self._pass_lock = threading.Lock()
+        self._pending_pass = None
+
+    def append(self, chunk: bytes):
+        with self._lock:
+            with open(self.recording_path, "ab") as f:
+                f.write(chunk)
+            self._received_bytes += len(chunk)
+            self.updated_at = time.time()
+
+        # At most one background pass at a time; new chunks simply wait for the next one
+        if self.executor and (self._pending_pass is None or self._pending_pass.done()):
+            self._pending_pass = self.executor.submit(self._run_pass, False)
+
+    @property
+    def partial_text(self) -> str:
+        with self._lock:
+            return "".join(w["word"] for w in self.words).strip()
+
+    def finish(self) -> Dict[str, Any]:
+        """Transcribe whatever is left after the last commit and return the full transcript."""
+        if self._pending_pass is not None:
+            self._pending_pass.result()
+        self._run_pass(final=True)
+        with self._lock:
+            return {
+                "text": "".join(w["word"] for w in self.words).strip(),
+                "language": self.language,
+                "words": list(self.words)
+            }
+
+    def _run_pass(self, final: bool):
+        with self._pass_lock:
+            with self._lock:
+                if self._received_bytes == self._bytes_at_last_pass and not final:
+                    return
+                self._bytes_at_last_pass = self._received_bytes
+
+            try:
+                from whisper.audio import load_audio
+                audio = load_audio(self.recording_path)
+            except Exception as e:
+                # The container may be cut mid-cluster; the next chunk usually fixes it
+                if final:
+                    raise
+                print(f"⚠️ Incremental decode skipped: {e}")
+                return
+
+            total_seconds = len(audio) / SAMPLE_RATE
+            if not final and total_seconds - self.committed_until < self.min_new_seconds:
+                return
+
+            window_start = max(0.0, self.committed_until - self.overlap_seconds)
+            window_path = os.path.join(self.stream_dir, f"window_{uuid.uuid4().hex}.wav")
+            write_wav(window_path, audio[int(window_start * SAMPLE_RATE):])
+
+            try:
+                result = self.service().transcribe(window_path, mode=self.mode)
+            except TranscriptionBusy:
+                if final:
+                    raise
+                return
+            finally:
+                os.remove(window_path)
+
+            if result.get("language") == "error":
+                # A failed decode, not silence: keep the commit point so the window is decoded again
+                if final:
+                    raise RuntimeError("Transcription of the final window failed")
+                return
+
+            self._stitch(result, window_start, total_seconds, final)
+
+    def _stitch(self, result: Dict[str, Any], window_start: float, window_end: float, final: bool):
+        # Words near the end of a non-final window may be cut off; leave them for the next pass
+        commit_limit = window_end if final else window_end - self.overlap_seconds
+
+        new_words = []
+        for word in result.get("words", []):
+            start = word["start"] + window_start
+            end = word["end"] + window_start
+            # Words in the overlap were already committed by the previous pass
+            if (start + end) / 2 < self.committed_until:
+                continue
+            if end > commit_limit:
+                break
+            new_words.append({**word, "start": start, "end": end})
+
+        with self._lock:
+            self.words.extend(new_words)
+            if result.get("language") not in (None, "error"):
+                self.language = result["language"]
+            if new_words:
+                self.committed_until = new_words[-1]["end"]
+            elif not result.get("words"):
+                # Silence: nothing to re-decode next time
+                self.committed_until = max(self.committed_until, commit_limit)
+
+
+class IncrementalTranscriptionRegistry:
+    def __init__(self, service: Callable[[], Any], default_mode: str, idle_timeout_seconds: int = 600,
+                 max_workers: int = 4):
+        """Track in-progress answer streams and drop the ones a client abandoned."""
+        self.service = service
+        self.default_mode = default_mode
+        self.idle_timeout_seconds = idle_timeout_seconds
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="stt-stream")
+        self._streams: Dict[str, IncrementalTranscription] = {}
+        self._lock = threading.Lock()
+
+    def create(self, stream_dir: str, **kwargs) -> str:
+        stream_id = uuid.uuid4().hex
+        os.makedirs(stream_dir, exist_ok=True)
+        stream = IncrementalTranscription(stream_dir, self.service, self.default_mode, executor=self.executor, **kwargs)
+        with self._lock:
+            cutoff = time.time() - self.idle_timeout_seconds
+            for idle_id in [k for k, s in self._streams.items() if s.updated_at < cutoff]:
+                del self._streams[idle_id]
+            self._streams[stream_id] = stream
+        return stream_id
+
+    def get(self, stream_id: str) -> Optional[IncrementalTranscription]:
+        with self._lock:
+            return self._streams.get(stream_id)
+
+    def pop(self, stream_id: str) -> Optional[IncrementalTranscription]:
+        with self._lock:
+            return self._streams.pop(stream_id, None)
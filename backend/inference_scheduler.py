@@ -0,0 +1,132 @@
+import threading
+import queue
+import time
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Callable, List, Optional, Tuple
+
+
+@dataclass
+class GenerationRequest:
+    prompt: str  # variable part, appended to `prefix`
+    max_new_tokens: int
+    temperature: float
+    top_p: float
+    stop_at_question: bool = False  # end this row once a complete question has been emitted
+    streamer: Optional[Any] = None  # transformers streamer; streamed requests run alone
+    prefix: str = ""  # fixed prompt head whose key/values the generator caches
+    schema: str = ""  # structured_output.SCHEMAS key that constrains decoding, if any
+    prompt_lookup: bool = False  # draft tokens from prompt n-grams; such requests run alone
+    future: Future = field(default_factory=Future)
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def sampling_key(self) -> Tuple:
+        # Prefix, temperature and schema are applied per row, so only top-p (a generate()-wide
+        # warper) splits batches; streamers and prompt-lookup decoding only support batch
+        # size 1, so those requests get their own key
+        if self.streamer is not None or self.prompt_lookup:
+            return (self.top_p, id(self))
+        return (self.top_p,)
+
+
+class InferenceScheduler:
+    def __init__(self,
+                 run_batch: Callable[[List[GenerationRequest]], List[str]],
+                 max_batch_size: int = 8,
+                 max_wait_ms: float = 25.0):
+        """
+        Collect prompts from all request threads into micro-batches and run one
+        batched generate per tick.
+        :param run_batch: Callable that generates completions for a list of requests (same order).
+        :param max_batch_size: Upper bound on prompts per generate call.
+        :param max_wait_ms: How long the oldest pending prompt may wait for others to join its batch.
+        """
+        self.run_batch = run_batch
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+
+        self._queue: "queue.Queue[GenerationRequest]" = queue.Queue()
+        self._deferred: deque = deque()  # requests pulled but left out of the last batch
+        self._stopped = threading.Event()
+        self._worker = threading.Thread(target=self._loop, name="inference-scheduler", daemon=True)
+        self._worker.start()
+
+    def submit(self, prompt: str, max_new_tokens: int, temperature: float, top_p: float,
+               stop_at_question: bool = False, streamer: Optional[Any] = None, prefix: str = "",
+               schema: str = "", prompt_lookup: bool = False) -> Future:
+        if self._stopped.is_set():
+            raise RuntimeError("Inference scheduler has been shut down")
+        request = GenerationRequest(
+            prompt=prompt,
+            max_new_tokens=max_new_tokens,
+            temperature=temperature,
+            top_p=top_p,
+            stop_at_question=stop_at_question,
+            streamer=streamer,
+            prefix=prefix,
+            schema=schema,
+            prompt_lookup=prompt_lookup
+        )
+        self._queue.put(request)
+        return request.future
+
+    def pending(self) -> int:
+        return self._queue.qsize() + len(self._deferred)
+
+    def shutdown(self):
+        self._stopped.set()
+        self._queue.put(None)  # wake the worker
+        self._worker.join(timeout=5)
+
+    # ------------------- WORKER -------------------
+    def _next_request(self, timeout=None):
+        if self._deferred:
+            return self._deferred.popleft()
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def _collect_batch(self) -> List[GenerationRequest]:
+        first = self._next_request()
+        if first is None:
+            return []
+
+        batch = [first]
+        skipped = []
+        deadline = first.enqueued_at + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 and not self._deferred and self._queue.empty():
+                break
+            request = self._next_request(timeout=max(0.0, remaining))
+            if request is None:
+                break
+            if request.sampling_key == first.sampling_key:
+                batch.append(request)
+            else:
+                skipped.append(request)
+
+        # Keep arrival order for requests that must wait for a compatible tick
+        self._deferred.extendleft(reversed(skipped))
+        return batch
+
+    def _loop(self):
+        while not self._stopped.is_set():
+            batch = [r for r in self._collect_batch() if r.future.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+
+            try:
+                results = self.run_batch(batch)
+            except Exception as e:
+                print(f"❌ Batched generation failed: {e}")
+                for request in batch:
+                    request.future.set_exception(e)
+                continue
+
+            for request, result in zip(batch, results):
+                request.future.set_result(result)
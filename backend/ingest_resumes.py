@@ -0,0 +1,213 @@
+"""
+Bulk-analyze a directory of resumes: parse PDFs across a process pool, generate questions
+in micro-batches and write the results as JSONL or into the interview/question tables.
+
+Re-running with the same output skips resumes that were already written, so an
+interrupted run picks up where it stopped. Resumes that fail to parse are recorded too
+(a JSONL line with "error", or an ingest_failure row) and skipped on later runs unless
+--retry-failed is given.
+
+Usage (from the backend directory):
+    python ingest_resumes.py path/to/resumes --jsonl results.jsonl
+    python ingest_resumes.py path/to/resumes --db --workers 4 --batch-size 16
+    python ingest_resumes.py path/to/resumes --jsonl results.jsonl --retry-failed
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Set, Tuple
+
+from analysis_cache import sha256_file
+
+# ------------------- PARSE WORKERS -------------------
+_worker_parser = None
+
+
+def _parse_in_worker(path: str) -> Dict[str, Any]:
+    global _worker_parser
+    from resume_parser import ResumeParser
+
+    if _worker_parser is None:
+        _worker_parser = ResumeParser()
+
+    start = time.perf_counter()
+    try:
+        analysis = _worker_parser.analyze(path)
+        if not analysis.skills:
+            raise ValueError("no skills found")
+        result = {"path": path, "sha256": sha256_file(path), "analysis": analysis.__dict__}
+    except Exception as e:
+        result = {"path": path, "error": str(e)}
+    result["parse_seconds"] = time.perf_counter() - start
+    return result
+
+
+# ------------------- INPUT / OUTPUT -------------------
+def find_resumes(input_dir: str) -> List[str]:
+    paths = []
+    for dirpath, _, filenames in os.walk(input_dir):
+        paths.extend(os.path.abspath(os.path.join(dirpath, name)) for name in filenames if name.lower().endswith(".pdf"))
+    return sorted(paths)
+
+
+def completed_from_jsonl(path: str) -> Tuple[Set[str], Set[str]]:
+    """(written, failed) resume paths; a path written on a retry counts as written."""
+    written, failed = set(), set()
+    if not os.path.exists(path):
+        return written, failed
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+                (failed if "error" in record else written).add(record["path"])
+            except (ValueError, KeyError):
+                continue  # a line cut short by an interrupted run
+    return written, failed - written
+
+
+def completed_from_db(app) -> Tuple[Set[str], Set[str]]:
+    """(written, failed) resume paths; a path written on a retry counts as written."""
+    from models import db, IngestFailure, Interview
+
+    with app.app_context():
+        written = {path for (path,) in db.session.query(Interview.resume_path)}
+        failed = {path for (path,) in db.session.query(IngestFailure.resume_path)}
+    return written, failed - written
+
+
+def write_jsonl(path: str, records: List[Dict[str, Any]]):
+    with open(path, "a", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def failure_record(result: Dict[str, Any]) -> Dict[str, Any]:
+    return {"path": result["path"], "error": result["error"], "failed_at": datetime.utcnow().isoformat(timespec="seconds")}
+
+
+def write_db_failures(interview_store, failures: List[Dict[str, Any]]):
+    interview_store.record_ingest_failures({"resume_path": f["path"], "error": f["error"]} for f in failures)
+
+
+def write_db(interview_store, records: List[Dict[str, Any]]):
+    # One transaction per batch: interviews and questions are each a single executemany
+    interview_store.record_interviews(
+        {"resume_path": r["path"], "candidate_name": r["analysis"]["name"], "questions": r["questions"]}
+        for r in records
+    )
+
+
+def batched(iterable, size: int) -> Iterator[List[Any]]:
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+# ------------------- MAIN -------------------
+def main():
+    import config
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input_dir", help="Directory searched recursively for .pdf files")
+    output = parser.add_mutually_exclusive_group(required=True)
+    output.add_argument("--jsonl", help="Append one JSON record (analysis + questions) per resume to this file")
+    output.add_argument("--db", action="store_true", help="Insert interviews and questions into the app database")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="PDF parsing processes")
+    parser.add_argument("--batch-size", type=int, default=config.INFERENCE_MAX_BATCH_SIZE * 2,
+                        help="Resumes per question-generation round and per write")
+    parser.add_argument("--retry-failed", action="store_true",
+                        help="Parse resumes that failed on an earlier run again instead of skipping them")
+    args = parser.parse_args()
+
+    # Importing the app gives us the same model registry, question cleanup and DB binding as the server
+    from app import app, banked_questions, clean_questions, interview_store, model_registry
+    from resume_parser import ResumeAnalysis
+
+    paths = find_resumes(args.input_dir)
+    written_before, failed_before = completed_from_jsonl(args.jsonl) if args.jsonl else completed_from_db(app)
+    skip = written_before if args.retry_failed else written_before | failed_before
+    todo = [p for p in paths if p not in skip]
+    failed_skipped = 0 if args.retry_failed else sum(p in failed_before for p in paths)
+    print(f"📂 {len(paths)} resumes found, {sum(p in written_before for p in paths)} already written, "
+          f"{failed_skipped} failed earlier (skipped; --retry-failed to retry), {len(todo)} to process")
+    if not todo:
+        return
+
+    timings = {"parse (cpu)": 0.0, "questions": 0.0, "write": 0.0}
+    written = failed = 0
+    start = time.perf_counter()
+
+    # spawn keeps the workers free of the parent's torch state once the LLM is loaded
+    with ProcessPoolExecutor(max_workers=max(1, args.workers),
+                             mp_context=multiprocessing.get_context("spawn")) as pool:
+        # map() queues every file up front, so parsing keeps running while a batch is in the LLM
+        parsed = pool.map(_parse_in_worker, todo, chunksize=4)
+        question_gen = model_registry.get('question_gen')
+
+        for batch in batched(parsed, args.batch_size):
+            for result in batch:
+                timings["parse (cpu)"] += result.pop("parse_seconds")
+                if "error" in result:
+                    failed += 1
+                    print(f"⚠️ Skipping {result['path']}: {result['error']}")
+            failures = [failure_record(r) for r in batch if "error" in r]
+            if failures:
+                # Recorded so later runs can tell "failed" from "not yet attempted"
+                stage_start = time.perf_counter()
+                if args.jsonl:
+                    write_jsonl(args.jsonl, failures)
+                else:
+                    write_db_failures(interview_store, failures)
+                timings["write"] += time.perf_counter() - stage_start
+            records = [r for r in batch if "error" not in r]
+            if not records:
+                continue
+
+            stage_start = time.perf_counter()
+            # Resumes the question bank covers skip the LLM; the rest are generated as one batch.
+            # Nothing is banked here: questions are banked only once an interview answers them.
+            to_generate = []
+            for record in records:
+                record["questions"] = banked_questions(ResumeAnalysis(**record["analysis"]))
+                if record["questions"] is None:
+                    to_generate.append(record)
+            summaries = [
+                " ".join(r["analysis"]["skills"] + r["analysis"]["education"] + r["analysis"]["experience"])
+                for r in to_generate
+            ]
+            for record, raw_questions in zip(to_generate, question_gen.generate_many(summaries) if summaries else []):
+                record["questions"] = clean_questions(raw_questions)[:5]
+            timings["questions"] += time.perf_counter() - stage_start
+
+            stage_start = time.perf_counter()
+            if args.jsonl:
+                write_jsonl(args.jsonl, records)
+            else:
+                write_db(interview_store, records)
+            timings["write"] += time.perf_counter() - stage_start
+
+            written += len(records)
+            elapsed = time.perf_counter() - start
+            print(f"✅ {written}/{len(todo)} written ({written / elapsed * 60:.1f} resumes/min)")
+
+    elapsed = time.perf_counter() - start
+    print(f"\n🏁 {written} written, {failed} failed in {elapsed:.1f}s "
+          f"→ {written / elapsed * 60:.1f} resumes/min")
+    for stage, seconds in timings.items():
+        print(f"   {stage:<12} {seconds:8.1f}s")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,185 @@
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import delete, func, insert
+from sqlalchemy.exc import IntegrityError
+
+from models import db, Interview, Question, Answer, FeedbackScore, IngestFailure, ProctorEvent
+
+
+class InterviewStore:
+    def __init__(self, app):
+        """
+        Reads and writes for the normalized interview tables; every method opens its own
+        app context so it can be called from job and stage threads.
+        :param app: Flask app the `db` extension is bound to.
+        """
+        self.app = app
+
+    # ------------------- WRITES -------------------
+    def record_interview(self, session_id: str, resume_path: str, candidate_name: str,
+                         questions: List[str]) -> int:
+        """
+        Create (or update) the session's interview and replace its resume questions in one transaction.
+        Answers to replaced questions keep their transcript and scores; their question link is cleared.
+        """
+        with self.app.app_context():
+            interview = self._interview_for(session_id)
+            interview.resume_path = resume_path
+            interview.candidate_name = candidate_name
+            db.session.flush()
+
+            # A re-upload or retry for the same session must not leave two sets at positions 0-4
+            db.session.execute(delete(Question).where(
+                Question.interview_id == interview.id, Question.kind == "resume"
+            ))
+            if questions:
+                db.session.execute(insert(Question), [
+                    {"interview_id": interview.id, "position": i, "kind": "resume", "text": text}
+                    for i, text in enumerate(questions)
+                ])
+            db.session.commit()
+            return interview.id
+
+    def record_interviews(self, records: Iterable[Dict[str, Any]]) -> int:
+        """
+        Bulk insert for batch ingestion: each record holds resume_path, candidate_name and
+        questions. Interviews and questions go in as two executemany statements.
+        """
+        records = list(records)
+        if not records:
+            return 0
+        with self.app.app_context():
+            interview_ids = db.session.execute(
+                insert(Interview).returning(Interview.id, sort_by_parameter_order=True),
+                [{"resume_path": r["resume_path"], "candidate_name": r.get("candidate_name")} for r in records]
+            ).scalars().all()
+
+            question_rows = [
+                {"interview_id": interview_id, "position": i, "kind": "resume", "text": text}
+                for interview_id, record in zip(interview_ids, records)
+                for i, text in enumerate(record.get("questions", []))
+            ]
+            if question_rows:
+                db.session.execute(insert(Question), question_rows)
+            db.session.commit()
+        return len(records)
+
+    def record_ingest_failures(self, failures: Iterable[Dict[str, str]]) -> int:
+        """Mark resumes (resume_path, error) that batch ingestion could not parse, replacing older marks."""
+        failures = list(failures)
+        if not failures:
+            return 0
+        with self.app.app_context():
+            db.session.execute(delete(IngestFailure).where(
+                IngestFailure.resume_path.in_([f["resume_path"] for f in failures])
+            ))
+            db.session.execute(insert(IngestFailure), failures)
+            db.session.commit()
+        return len(failures)
+
+    def record_answer(self, session_id: str, question_text: str, transcript: str,
+                      feedback: Dict[str, Any]) -> int:
+        """Store an answer with its scores; the generated follow-up is stored as the next question."""
+        with self.app.app_context():
+            interview = self._interview_for(session_id)
+            db.session.flush()
+
+            question = (
+                Question.query
+                .filter_by(interview_id=interview.id, text=question_text)
+                .order_by(Question.id.desc())
+                .first()
+            )
+            if question is None and question_text:
+                # Follow-ups are only known to the client until they are answered
+                question = Question(interview_id=interview.id, kind="follow_up", text=question_text)
+                db.session.add(question)
+                db.session.flush()
+
+            answer = Answer(
+                interview_id=interview.id,
+                question_id=question.id if question else None,
+                transcript=transcript,
+                word_count=len(transcript.split())
+            )
+            db.session.add(answer)
+            db.session.flush()
+
+            db.session.add(FeedbackScore(
+                answer_id=answer.id,
+                proficiency=int(feedback["proficiency"]),
+                confidence=int(feedback["confidence"]),
+                technical_score=feedback.get("technical_score"),
+                relevance_score=feedback.get("relevance_score"),
+                feedback=str(feedback.get("feedback", ""))
+            ))
+            if feedback.get("follow_up"):
+                db.session.add(Question(interview_id=interview.id, kind="follow_up", text=feedback["follow_up"]))
+            db.session.commit()
+            return answer.id
+
+    def record_proctor_events(self, events: List[Dict[str, Any]]) -> int:
+        """Insert proctoring events in one executemany statement."""
+        if not events:
+            return 0
+        with self.app.app_context():
+            db.session.execute(insert(ProctorEvent), [
+                {
+                    "session_id": e["session_id"],
+                    "event": e["event"],
+                    "occurred_at": e.get("timestamp"),
+                    "details": e.get("details") or {}
+                }
+                for e in events
+            ])
+            db.session.commit()
+        return len(events)
+
+    def _interview_for(self, session_id: Optional[str]) -> Interview:
+        """The session's interview, created if missing. Call it first in a transaction: a lost race rolls back."""
+        interview = Interview.query.filter_by(session_id=session_id).first() if session_id else None
+        if interview is None:
+            interview = Interview(session_id=session_id)
+            db.session.add(interview)
+            if session_id:
+                try:
+                    db.session.flush()
+                except IntegrityError:
+                    # Another request inserted this session between the select and the insert
+                    db.session.rollback()
+                    interview = Interview.query.filter_by(session_id=session_id).one()
+        return interview
+
+    # ------------------- REPORTS -------------------
+    def proficiency_report(self, days: float = 7) -> List[Dict[str, Any]]:
+        """Average scores per candidate over answers given in the last `days` days."""
+        since = datetime.utcnow() - timedelta(days=days)
+        with self.app.app_context():
+            rows = (
+                db.session.query(
+                    Interview.candidate_name,
+                    func.count(func.distinct(Interview.id)),
+                    func.count(Answer.id),
+                    func.avg(FeedbackScore.proficiency),
+                    func.avg(FeedbackScore.confidence),
+                    func.max(Answer.created_at)
+                )
+                .join(Answer, Answer.interview_id == Interview.id)
+                .join(FeedbackScore, FeedbackScore.answer_id == Answer.id)
+                .filter(Answer.created_at >= since)  # served by the created_at index
+                .group_by(Interview.candidate_name)
+                .order_by(func.avg(FeedbackScore.proficiency).desc())
+                .all()
+            )
+        return [
+            {
+                "candidate_name": name,
+                "interviews": interviews,
+                "answers": answers,
+                "avg_proficiency": round(avg_proficiency, 1),
+                "avg_confidence": round(avg_confidence, 1),
+                "last_answer_at": last_answer_at.isoformat() if last_answer_at else None
+            }
+            for name, interviews, answers, avg_proficiency, avg_confidence, last_answer_at in rows
+        ]
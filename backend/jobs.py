@@ -0,0 +1,130 @@
+import json
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+import metrics
+
+
+@dataclass
+class Job:
+    id: str
+    status: str = "queued"  # queued -> running -> done | failed
+    stage: str = "queued"
+    stages_completed: List[str] = field(default_factory=list)
+    result: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    updated_at: float = field(default_factory=time.time)
+
+    def __post_init__(self):
+        self._lock = threading.Condition()
+
+    def advance(self, stage: str, **partial_result):
+        """Mark a pipeline stage finished and publish whatever it produced."""
+        with self._lock:
+            self.stage = stage
+            self.stages_completed.append(stage)
+            self.result.update(partial_result)
+            self.updated_at = time.time()
+            self._lock.notify_all()
+
+    def update(self, **partial_result):
+        """Publish intermediate output without finishing the current stage."""
+        with self._lock:
+            self.result.update(partial_result)
+            self.updated_at = time.time()
+            self._lock.notify_all()
+
+    def set_status(self, status: str, error: Optional[str] = None):
+        with self._lock:
+            self.status = status
+            self.error = error
+            self.updated_at = time.time()
+            self._lock.notify_all()
+
+    def wait_for(self, predicate: Callable[["Job"], bool], timeout: Optional[float] = None) -> bool:
+        """Block until `predicate(job)` holds or the job ends; returns the predicate's final value."""
+        with self._lock:
+            return self._lock.wait_for(
+                lambda: predicate(self) or self.status in ("done", "failed"),
+                timeout=timeout
+            ) and predicate(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "job_id": self.id,
+                "status": self.status,
+                "stage": self.stage,
+                "stages_completed": list(self.stages_completed),
+                "result": dict(self.result),
+                "error": self.error
+            }
+
+
+class JobManager:
+    def __init__(self, max_workers: int = 2, ttl_seconds: int = 3600):
+        """
+        Run long pipelines on a local thread pool and keep their progress for polling.
+        :param max_workers: Number of pipelines allowed to run at once.
+        :param ttl_seconds: How long finished jobs stay queryable.
+        """
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self.ttl_seconds = ttl_seconds
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, fn: Callable[..., None], *args, **kwargs) -> Job:
+        """Queue `fn(job, *args, **kwargs)`; the function reports progress via `job.advance`."""
+        job = Job(id=uuid.uuid4().hex)
+        with self._lock:
+            self._prune()
+            self._jobs[job.id] = job
+        self.executor.submit(self._run, job, fn, *args, **kwargs)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def active(self) -> int:
+        """Jobs queued or running."""
+        with self._lock:
+            return sum(1 for job in self._jobs.values() if job.status in ("queued", "running"))
+
+    def _run(self, job: Job, fn: Callable[..., None], *args, **kwargs):
+        # Worker threads are reused, so every job gets a fresh timing breakdown
+        token = metrics.start_timings()
+        start = time.perf_counter()
+        job.set_status("running")
+        try:
+            fn(job, *args, **kwargs)
+            job.set_status("done")
+        except Exception as e:
+            print(f"❌ Job {job.id} failed at stage '{job.stage}': {e}")
+            job.set_status("failed", error=str(e))
+        finally:
+            timings = metrics.current_timings()
+            job.update(timings_ms=timings)
+            metrics.record("job_" + fn.__name__, time.perf_counter() - start)
+            print("⏱️ " + json.dumps({
+                "job_id": job.id,
+                "job": fn.__name__,
+                "status": job.status,
+                "total_ms": round((time.perf_counter() - start) * 1000, 1),
+                "stages": timings
+            }))
+            metrics.reset_timings(token)
+
+    def _prune(self):
+        cutoff = time.time() - self.ttl_seconds
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.status in ("done", "failed") and job.updated_at < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
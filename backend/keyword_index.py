@@ -0,0 +1,114 @@
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List
+
+
+@dataclass(frozen=True)
+class KeywordMatch:
+    term: str  # canonical spelling from the dictionary
+    start: int
+    end: int
+
+
+def normalize_term(term: str) -> str:
+    return " ".join(term.lower().split())
+
+
+def load_terms(path: str) -> List[str]:
+    """One term per line; blank lines and lines starting with '#' are ignored."""
+    with open(path, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip() and not line.lstrip().startswith("#")]
+
+
+def _trie_pattern(terms: Iterable[str]) -> str:
+    """
+    Alternation with shared prefixes factored out, so the regex engine branches on one
+    character at a time instead of retrying every term at each position.
+    """
+    trie: Dict[str, dict] = {}
+    for term in terms:
+        node = trie
+        for ch in term:
+            node = node.setdefault(ch, {})
+        node[""] = {}  # end of term
+
+    def build(node: dict) -> str:
+        branches = [
+            (r"\s+" if ch == " " else re.escape(ch)) + build(child)
+            for ch, child in sorted(node.items()) if ch
+        ]
+        if not branches:
+            return ""
+        if "" in node:
+            # Greedy '?' prefers the longer term; shorter ones are retried if the boundary fails
+            return "(?:" + "|".join(branches) + ")?"
+        if len(branches) == 1:
+            return branches[0]
+        return "(?:" + "|".join(branches) + ")"
+
+    return build(trie)
+
+
+class KeywordIndex:
+    def __init__(self, terms: Iterable[str]):
+        """
+        Case-insensitive whole-word matcher for a fixed dictionary, scanning text once.
+        Boundaries are "not preceded/followed by a word character", so terms such as
+        'C++', 'Node.js' and 'CI/CD' match while 'AI' does not match inside 'said'.
+        Inner whitespace of multi-word terms matches any run of whitespace.
+        :param terms: Dictionary terms; the first spelling of each is reported back.
+        """
+        self.terms: Dict[str, str] = {}  # normalized -> canonical spelling
+        for term in terms:
+            key = normalize_term(term)
+            if key:
+                self.terms.setdefault(key, term.strip())
+
+        self._pattern = None
+        if self.terms:
+            self._pattern = re.compile(
+                r"(?<!\w)" + _trie_pattern(self.terms) + r"(?!\w)",
+                re.IGNORECASE
+            )
+
+    @classmethod
+    def from_file(cls, path: str) -> "KeywordIndex":
+        return cls(load_terms(path))
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def iter_matches(self, text: str) -> Iterator[KeywordMatch]:
+        if self._pattern is None or not text:
+            return
+        for match in self._pattern.finditer(text):
+            yield KeywordMatch(self.terms[normalize_term(match.group())], match.start(), match.end())
+
+    def matches(self, text: str) -> List[KeywordMatch]:
+        return list(self.iter_matches(text))
+
+    def counts(self, text: str) -> Dict[str, int]:
+        """Occurrences per canonical term (terms that do not occur are omitted)."""
+        counts: Dict[str, int] = {}
+        if self._pattern is None or not text:
+            return counts
+        for match in self._pattern.finditer(text):
+            term = self.terms[normalize_term(match.group())]
+            counts[term] = counts.get(term, 0) + 1
+        return counts
+
+    def count(self, text: str) -> int:
+        if self._pattern is None or not text:
+            return 0
+        return sum(1 for _ in self._pattern.finditer(text))
+
+    def found(self, text: str) -> List[str]:
+        """Distinct canonical terms in order of first occurrence."""
+        return list(dict.fromkeys(match.term for match in self.iter_matches(text)))
+
+
+@lru_cache(maxsize=None)
+def load_keyword_index(path: str) -> KeywordIndex:
+    """Shared, compiled index per dictionary file."""
+    return KeywordIndex.from_file(path)
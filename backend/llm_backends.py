@@ -0,0 +1,173 @@
+import json
+import os
+import shutil
+import time
+from dataclasses import dataclass
+from typing import Any, Dict
+
+import torch
+import config
+
+# torch     - Hugging Face weights as published (fp16 on GPU, fp32 on CPU)
+# int8      - torch with Linear layers dynamically quantized to int8 (CPU)
+# onnx      - ONNX Runtime graph with KV-cache inputs, exported by optimum (CPU)
+# onnx-int8 - the ONNX graph with int8 dynamically quantized MatMuls (CPU)
+LLM_BACKENDS = ("torch", "int8", "onnx", "onnx-int8")
+CONVERTED_BACKENDS = ("int8", "onnx", "onnx-int8")
+META_FILE = "meta.json"
+
+
+@dataclass
+class LoadedModel:
+    model: Any
+    device: torch.device
+    backend: str
+    # Whether generate() accepts a precomputed DynamicCache (needed for the prompt-prefix cache)
+    accepts_past_key_values: bool
+    weights_bytes: int
+
+
+def _library_versions() -> Dict[str, str]:
+    import transformers
+
+    versions = {"torch": torch.__version__, "transformers": transformers.__version__}
+    try:
+        import optimum.version
+        import onnxruntime
+        versions["optimum"] = optimum.version.__version__
+        versions["onnxruntime"] = onnxruntime.__version__
+    except ImportError:
+        pass
+    return versions
+
+
+def converted_dir(backend: str, model_id: str) -> str:
+    return os.path.join(config.LLM_CONVERTED_DIR, backend, model_id.replace("/", "--"))
+
+
+def is_converted(backend: str, model_id: str) -> bool:
+    """
+    True if a usable conversion is on disk. The int8 checkpoint is a pickled module, so it is
+    only reused with the torch/transformers versions that wrote it; ONNX files are portable.
+    """
+    meta_path = os.path.join(converted_dir(backend, model_id), META_FILE)
+    if not os.path.exists(meta_path):
+        return False
+    if backend != "int8":
+        return True
+    with open(meta_path, encoding="utf-8") as f:
+        written_with = json.load(f).get("versions", {})
+    current = _library_versions()
+    return all(written_with.get(lib) == current[lib] for lib in ("torch", "transformers"))
+
+
+def _directory_bytes(path: str, suffixes=(".onnx", ".onnx_data", ".pt")) -> int:
+    return sum(
+        os.path.getsize(os.path.join(path, name))
+        for name in os.listdir(path) if name.endswith(suffixes)
+    )
+
+
+def _avx512_vnni() -> bool:
+    try:
+        with open("/proc/cpuinfo") as f:
+            return "avx512_vnni" in f.read()
+    except OSError:
+        return False
+
+
+def _load_float_model(model_id: str, cache_dir: str, dtype: torch.dtype, device_map=None):
+    from transformers import AutoModelForCausalLM
+
+    return AutoModelForCausalLM.from_pretrained(
+        model_id,
+        cache_dir=cache_dir,
+        torch_dtype=dtype,
+        device_map=device_map,
+        low_cpu_mem_usage=True
+    )
+
+
+# ------------------- CONVERSION -------------------
+def convert(backend: str, model_id: str, cache_dir: str, force: bool = False) -> str:
+    """
+    Convert the published weights for `backend` once and cache them under LLM_CONVERTED_DIR.
+    Returns the directory holding the converted model.
+    """
+    if backend not in CONVERTED_BACKENDS:
+        raise ValueError(f"Backend '{backend}' needs no conversion (choices: {', '.join(CONVERTED_BACKENDS)})")
+    out_dir = converted_dir(backend, model_id)
+    if is_converted(backend, model_id) and not force:
+        return out_dir
+
+    start = time.perf_counter()
+    print(f"⏳ Converting {model_id} for the '{backend}' backend (one time)...")
+    tmp_dir = out_dir + ".tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+
+    if backend == "int8":
+        model = _load_float_model(model_id, cache_dir, torch.float32).eval()
+        model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        # Quantized Linear weights are packed params, so the whole module is saved and loaded back
+        # without ever materializing the fp32 weights again
+        torch.save(model, os.path.join(tmp_dir, "model.pt"))
+    elif backend == "onnx":
+        from optimum.onnxruntime import ORTModelForCausalLM
+
+        ORTModelForCausalLM.from_pretrained(
+            model_id, export=True, use_cache=True, cache_dir=cache_dir
+        ).save_pretrained(tmp_dir)
+    else:  # onnx-int8
+        from optimum.onnxruntime import ORTQuantizer
+        from optimum.onnxruntime.configuration import AutoQuantizationConfig
+
+        onnx_dir = convert("onnx", model_id, cache_dir)
+        arch = AutoQuantizationConfig.avx512_vnni if _avx512_vnni() else AutoQuantizationConfig.avx2
+        quantizer = ORTQuantizer.from_pretrained(onnx_dir, file_name="model.onnx")
+        quantizer.quantize(save_dir=tmp_dir, quantization_config=arch(is_static=False, per_channel=True))
+        for name in os.listdir(onnx_dir):  # config/generation config next to the quantized graph
+            if not name.endswith((".onnx", ".onnx_data")) and name != META_FILE:
+                shutil.copy(os.path.join(onnx_dir, name), tmp_dir)
+
+    with open(os.path.join(tmp_dir, META_FILE), "w", encoding="utf-8") as f:
+        json.dump({
+            "model_id": model_id,
+            "backend": backend,
+            "versions": _library_versions(),
+            "converted_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "seconds": round(time.perf_counter() - start, 1)
+        }, f, indent=2)
+
+    shutil.rmtree(out_dir, ignore_errors=True)
+    os.replace(tmp_dir, out_dir)
+    print(f"✅ Converted weights cached in {out_dir} ({_directory_bytes(out_dir) / 1e9:.2f} GB)")
+    return out_dir
+
+
+# ------------------- LOADING -------------------
+def load_model(backend: str, model_id: str, cache_dir: str) -> LoadedModel:
+    """Load the model for `backend`, converting (and caching) it first if needed."""
+    if backend not in LLM_BACKENDS:
+        raise ValueError(f"Unknown LLM backend '{backend}' (choices: {', '.join(LLM_BACKENDS)})")
+
+    if backend == "torch":
+        device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+        dtype = torch.float16 if torch.cuda.is_available() else torch.float32
+        model = _load_float_model(model_id, cache_dir, dtype, device_map="auto").to(device)
+        return LoadedModel(model, device, backend, True, model.get_memory_footprint())
+
+    model_dir = convert(backend, model_id, cache_dir)
+    cpu = torch.device("cpu")
+    if backend == "int8":
+        model = torch.load(os.path.join(model_dir, "model.pt"), weights_only=False).eval()
+        return LoadedModel(model, cpu, backend, True, _directory_bytes(model_dir))
+
+    from optimum.onnxruntime import ORTModelForCausalLM
+
+    file_name = "model_quantized.onnx" if backend == "onnx-int8" else "model.onnx"
+    model = ORTModelForCausalLM.from_pretrained(
+        model_dir, file_name=file_name, use_cache=True, provider="CPUExecutionProvider"
+    )
+    # optimum feeds ONNX Runtime its own past-key-value tuples; a torch DynamicCache can't be injected
+    return LoadedModel(model, cpu, backend, False, _directory_bytes(model_dir))
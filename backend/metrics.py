@@ -0,0 +1,258 @@
+import bisect
+import contextvars
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, TypeVar
+
+T = TypeVar("T")
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"] + self._samples()
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            return [f"{self.name}{_format_labels(self.labelnames, key)} {value}" for key, value in self._values.items()]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._callbacks: Dict[Tuple[str, ...], Callable[[], Optional[float]]] = {}
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def set_function(self, fn: Callable[[], Optional[float]], **labels):
+        """Evaluate `fn` at scrape time; a None result omits the sample."""
+        with self._lock:
+            self._callbacks[self._key(labels)] = fn
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            values = dict(self._values)
+            callbacks = dict(self._callbacks)
+        for key, fn in callbacks.items():
+            try:
+                value = fn()
+            except Exception:
+                value = None
+            if value is not None:
+                values[key] = value
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {value}" for key, value in values.items()]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Tuple[str, ...], List] = {}  # key -> [bucket counts, sum, count]
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * len(self.buckets), 0.0, 0]
+            if index < len(self.buckets):
+                series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def _samples(self) -> List[str]:
+        lines = []
+        with self._lock:
+            series = {key: (list(counts), total, count) for key, (counts, total, count) in self._series.items()}
+        for key, (counts, total, count) in series.items():
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                le = 'le="%s"' % bound
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            le = 'le="+Inf"'
+            lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {count}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {total}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help_text, labelnames))
+
+    def gauge(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, help_text, labelnames))
+
+    def histogram(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help_text, labelnames, buckets))
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "\n".join(line for metric in metrics for line in metric.render()) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+STAGE_SECONDS = REGISTRY.histogram(
+    "vocahire_stage_seconds", "Latency of pipeline stages (parse, llm, whisper, tts, db, ...)", ["stage"])
+HTTP_REQUEST_SECONDS = REGISTRY.histogram(
+    "vocahire_http_request_seconds", "Time to produce a response (streamed bodies excluded)",
+    ["endpoint", "method", "status"])
+LLM_TOKENS = REGISTRY.counter(
+    "vocahire_llm_tokens_total", "Tokens processed by the LLM (prompt, cached_prefix, generated)", ["kind"])
+LLM_BATCH_SIZE = REGISTRY.histogram(
+    "vocahire_llm_batch_size", "Prompts per generate() call", buckets=(1, 2, 4, 8, 16, 32, 64))
+PROMPT_LOOKUP_TOKENS = REGISTRY.counter(
+    "vocahire_llm_prompt_lookup_tokens_total",
+    "Prompt-lookup decoding tokens (drafted, accepted, generated)", ["kind"])
+PROMPT_LOOKUP_FORWARDS = REGISTRY.counter(
+    "vocahire_llm_prompt_lookup_forwards_total", "Draft-verifying forward passes in prompt-lookup decoding")
+CACHE_LOOKUPS = REGISTRY.counter(
+    "vocahire_cache_lookups_total", "Cache lookups by cache and result", ["cache", "result"])
+QUEUE_DEPTH = REGISTRY.gauge(
+    "vocahire_queue_depth", "Work waiting or in flight per queue", ["queue"])
+MEMORY_BYTES = REGISTRY.gauge(
+    "vocahire_memory_bytes", "Process memory and loaded model weights", ["kind"])
+
+
+# ------------------- PER-REQUEST TIMINGS -------------------
+# Stage durations (ms) for the current request or job; None outside of one
+_timings: contextvars.ContextVar = contextvars.ContextVar("vocahire_timings", default=None)
+_timings_lock = threading.Lock()
+
+
+def start_timings() -> contextvars.Token:
+    return _timings.set({})
+
+
+def current_timings() -> Dict[str, float]:
+    timings = _timings.get()
+    with _timings_lock:
+        return dict(timings) if timings else {}
+
+
+def reset_timings(token: contextvars.Token):
+    _timings.reset(token)
+
+
+def record(stage: str, seconds: float):
+    """Observe a stage duration and add it to the current request's breakdown."""
+    STAGE_SECONDS.observe(seconds, stage=stage)
+    timings = _timings.get()
+    if timings is not None:
+        with _timings_lock:
+            timings[stage] = round(timings.get(stage, 0.0) + seconds * 1000, 1)
+
+
+@contextmanager
+def timed(stage: str) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(stage, time.perf_counter() - start)
+
+
+def timed_iter(stage: str, iterable: Iterable[T]) -> Iterator[T]:
+    """Yield from `iterable`, recording only the time spent producing items (not the consumer's)."""
+    iterator = iter(iterable)
+    elapsed = 0.0
+    try:
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                elapsed += time.perf_counter() - start
+            yield item
+    finally:
+        record(stage, elapsed)
+
+
+# ------------------- PROCESS MEMORY -------------------
+def resident_memory_bytes() -> Optional[float]:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        try:
+            import resource
+            return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024  # peak, not current
+        except ImportError:
+            return None
+
+
+def cuda_allocated_bytes() -> Optional[float]:
+    torch = sys.modules.get("torch")  # never import torch just to report on it
+    if torch is None or not torch.cuda.is_available():
+        return None
+    return torch.cuda.memory_allocated()
+
+
+MEMORY_BYTES.set_function(resident_memory_bytes, kind="rss")
+MEMORY_BYTES.set_function(cuda_allocated_bytes, kind="cuda_allocated")
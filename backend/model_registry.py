@@ -0,0 +1,105 @@
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Optional
+
+
+@dataclass
+class ModelEntry:
+    name: str
+    loader: Callable[[], Any]
+    status: str = "not_loaded"  # not_loaded -> loading -> ready | failed
+    instance: Any = None
+    error: Optional[str] = None
+    load_seconds: Optional[float] = None
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+class ModelRegistry:
+    def __init__(self):
+        """Load heavyweight models on first use instead of at import time."""
+        self._entries: Dict[str, ModelEntry] = {}
+
+    def register(self, name: str, loader: Callable[[], Any]):
+        """
+        Register a model without loading it.
+        :param name: Key used by `get`.
+        :param loader: Zero-argument callable that imports and builds the model.
+        """
+        self._entries[name] = ModelEntry(name=name, loader=loader)
+
+    def override(self, name: str, instance: Any):
+        """Install a ready-made instance (e.g. a stand-in) in place of the loader."""
+        entry = self._entries.setdefault(name, ModelEntry(name=name, loader=lambda: instance))
+        with entry.lock:
+            entry.instance = instance
+            entry.status = "ready"
+            entry.error = None
+            entry.load_seconds = 0.0
+
+    def get(self, name: str) -> Any:
+        entry = self._entries[name]
+        if entry.status == "ready":
+            return entry.instance
+
+        # Concurrent callers wait for the first one's load instead of loading twice
+        with entry.lock:
+            if entry.status == "ready":
+                return entry.instance
+
+            entry.status = "loading"
+            start = time.perf_counter()
+            print(f"⏳ Loading model '{name}'...")
+            try:
+                entry.instance = entry.loader()
+            except Exception as e:
+                entry.status = "failed"
+                entry.error = str(e)
+                print(f"❌ Failed to load model '{name}': {e}")
+                raise
+            entry.load_seconds = round(time.perf_counter() - start, 2)
+            entry.error = None
+            entry.status = "ready"
+            print(f"✅ Model '{name}' ready in {entry.load_seconds}s")
+            return entry.instance
+
+    def warm_up(self, names: Iterable[str], background: bool = True):
+        """
+        Load the given models now, optionally on a daemon thread so startup isn't blocked.
+        Raises ValueError for names that were never registered (e.g. a typo in WARMUP_MODELS).
+        """
+        names = [n for n in names if n]
+        unknown = [n for n in names if n not in self._entries]
+        if unknown:
+            raise ValueError(f"Unknown models {unknown}; registered models are {sorted(self._entries)}")
+
+        def load_all():
+            for name in names:
+                try:
+                    self.get(name)
+                except Exception:
+                    pass  # already logged; status shows the failure
+
+        if background:
+            threading.Thread(target=load_all, name="model-warmup", daemon=True).start()
+        else:
+            load_all()
+
+    def peek(self, name: str) -> Any:
+        """The loaded instance, or None if it isn't loaded (never triggers a load)."""
+        entry = self._entries.get(name)
+        return entry.instance if entry is not None and entry.status == "ready" else None
+
+    def is_ready(self, names: Iterable[str]) -> bool:
+        """True once every named model is loaded; unknown names are never ready."""
+        return all(n in self._entries and self._entries[n].status == "ready" for n in names if n)
+
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            name: {
+                "status": entry.status,
+                "load_seconds": entry.load_seconds,
+                "error": entry.error
+            }
+            for name, entry in self._entries.items()
+        }
@@ -1,9 +1,168 @@
+import json
+import re
+
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import inspect, insert
 
 db = SQLAlchemy()
 
+# Applied to every new SQLite connection: WAL lets the job threads write while requests read,
+# and busy_timeout makes concurrent writers wait for the lock instead of failing
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",  # durable at checkpoints; safe with WAL
+    "busy_timeout": 5000,
+    "foreign_keys": "ON",
+    "temp_store": "MEMORY",
+    "cache_size": -16000  # ~16 MB page cache
+}
+
+def apply_sqlite_pragmas(dbapi_connection, connection_record=None):
+    cursor = dbapi_connection.cursor()
+    for name, value in SQLITE_PRAGMAS.items():
+        cursor.execute(f"PRAGMA {name}={value}")
+    cursor.close()
+
 class Interview(db.Model):
     id = db.Column(db.Integer, primary_key=True)
+    session_id = db.Column(db.String(64), unique=True, index=True)
+    candidate_name = db.Column(db.String(128), index=True)
     resume_path = db.Column(db.String(256))
-    questions = db.Column(db.JSON)
-    created_at = db.Column(db.DateTime, default=db.func.now())
\ No newline at end of file
+    created_at = db.Column(db.DateTime, default=db.func.now(), index=True)
+
+    questions = db.relationship("Question", backref="interview", lazy=True, order_by="Question.id")
+    answers = db.relationship("Answer", backref="interview", lazy=True, order_by="Answer.id")
+
+class Question(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    interview_id = db.Column(db.Integer, db.ForeignKey("interview.id", ondelete="CASCADE"), nullable=False, index=True)
+    position = db.Column(db.Integer)  # order among the resume questions; NULL for follow-ups
+    kind = db.Column(db.String(16), nullable=False, default="resume")  # resume | follow_up
+    text = db.Column(db.Text, nullable=False)
+    created_at = db.Column(db.DateTime, default=db.func.now())
+
+class Answer(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    interview_id = db.Column(db.Integer, db.ForeignKey("interview.id", ondelete="CASCADE"), nullable=False, index=True)
+    question_id = db.Column(db.Integer, db.ForeignKey("question.id", ondelete="SET NULL"), index=True)
+    transcript = db.Column(db.Text, nullable=False)
+    word_count = db.Column(db.Integer)
+    created_at = db.Column(db.DateTime, default=db.func.now(), index=True)
+
+    score = db.relationship("FeedbackScore", backref="answer", uselist=False, lazy=True)
+
+class FeedbackScore(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    answer_id = db.Column(db.Integer, db.ForeignKey("answer.id", ondelete="CASCADE"), nullable=False, unique=True)
+    proficiency = db.Column(db.Integer, nullable=False)
+    confidence = db.Column(db.Integer, nullable=False)
+    technical_score = db.Column(db.Integer)
+    relevance_score = db.Column(db.Integer)
+    feedback = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=db.func.now(), index=True)
+
+class ProctorEvent(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    session_id = db.Column(db.String(64), nullable=False)
+    event = db.Column(db.String(64), nullable=False)
+    occurred_at = db.Column(db.String(40))  # client-supplied ISO timestamp, kept verbatim
+    details = db.Column(db.JSON)
+    created_at = db.Column(db.DateTime, default=db.func.now(), index=True)
+
+    __table_args__ = (db.Index("ix_proctor_event_session_created", "session_id", "created_at"),)
+
+class IngestFailure(db.Model):
+    """Resumes batch ingestion could not parse; re-runs skip them unless asked to retry."""
+    resume_path = db.Column(db.String(256), primary_key=True)
+    error = db.Column(db.Text, nullable=False)
+    created_at = db.Column(db.DateTime, default=db.func.now())
+
+class CacheEntry(db.Model):
+    """Content-addressed cache for resume analyses and generated question sets."""
+    namespace = db.Column(db.String(32), primary_key=True)
+    key = db.Column(db.String(64), primary_key=True)  # SHA-256 hex digest
+    payload = db.Column(db.JSON, nullable=False)
+    created_at = db.Column(db.DateTime, default=db.func.now())
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+    hit_count = db.Column(db.Integer, default=0, nullable=False)
+
+# ------------------- SCHEMA CHECK -------------------
+# The pre-normalization interview table stored its questions as one ", "-joined string
+LEGACY_QUESTION_SEPARATOR = re.compile(r"(?<=\?),\s+")
+
+def prepare_schema():
+    """
+    Bring the database in line with the models at startup (call inside an app context).
+    A pre-normalization `interview` table is migrated, missing tables are created, and any
+    other column mismatch stops startup with the tables involved instead of failing requests.
+    """
+    inspector = inspect(db.engine)
+    if "interview" in inspector.get_table_names() and \
+            "questions" in {c["name"] for c in inspector.get_columns("interview")}:
+        migrate_legacy_interviews()
+    db.create_all()
+
+    inspector = inspect(db.engine)
+    problems = []
+    for table in db.metadata.sorted_tables:
+        existing = {c["name"] for c in inspector.get_columns(table.name)}
+        missing = [c.name for c in table.columns if c.name not in existing]
+        if missing:
+            problems.append(f"{table.name} lacks {', '.join(missing)}")
+    if problems:
+        raise RuntimeError(
+            f"Database schema does not match the models ({'; '.join(problems)}). "
+            f"Back up {db.engine.url} and recreate it with create_db.py."
+        )
+
+def migrate_legacy_interviews():
+    """
+    Rename the old `interview` table to `interview_legacy` and copy its rows into the new
+    interview and question tables (ids and created_at kept), all in one transaction.
+    Only SQLite is migrated; other databases stop startup so the move can be done by hand.
+    """
+    if db.engine.dialect.name != "sqlite":
+        raise RuntimeError("The interview table has the pre-normalization layout; migrate it to interview/question by hand.")
+    if "interview_legacy" in inspect(db.engine).get_table_names():
+        raise RuntimeError("Both an old-layout interview table and interview_legacy exist; resolve this by hand.")
+
+    print("⏳ Migrating the pre-normalization interview table...")
+    with db.engine.connect() as conn:
+        sqlite_conn = conn.connection.driver_connection
+        isolation_level = sqlite_conn.isolation_level
+        # pysqlite only opens transactions before DML, so BEGIN explicitly to cover the DDL too.
+        # Both pragmas keep the rename from repointing other tables' foreign keys at interview_legacy.
+        sqlite_conn.isolation_level = None
+        conn.exec_driver_sql("PRAGMA foreign_keys=OFF")
+        conn.exec_driver_sql("PRAGMA legacy_alter_table=ON")
+        conn.exec_driver_sql("BEGIN")
+        try:
+            conn.exec_driver_sql("ALTER TABLE interview RENAME TO interview_legacy")
+            db.metadata.create_all(bind=conn)
+            conn.exec_driver_sql(
+                "INSERT INTO interview (id, resume_path, created_at) "
+                "SELECT id, resume_path, created_at FROM interview_legacy"
+            )
+            question_rows = []
+            for interview_id, questions in conn.exec_driver_sql("SELECT id, questions FROM interview_legacy"):
+                try:
+                    questions = json.loads(questions) if isinstance(questions, str) else questions
+                except ValueError:
+                    pass  # a bare string written outside SQLAlchemy's JSON type
+                texts = questions if isinstance(questions, list) else LEGACY_QUESTION_SEPARATOR.split(str(questions or ""))
+                question_rows.extend(
+                    {"interview_id": interview_id, "position": i, "kind": "resume", "text": q.strip()}
+                    for i, q in enumerate(texts) if q and q.strip()
+                )
+            if question_rows:
+                conn.execute(insert(Question), question_rows)
+            conn.exec_driver_sql("COMMIT")
+        except Exception:
+            conn.exec_driver_sql("ROLLBACK")
+            raise
+        finally:
+            conn.exec_driver_sql("PRAGMA legacy_alter_table=OFF")
+            conn.exec_driver_sql("PRAGMA foreign_keys=ON")
+            sqlite_conn.isolation_level = isolation_level
+            conn.commit()  # ends SQLAlchemy's own bookkeeping transaction; the work is already committed
+    print(f"✅ Migrated interviews with {len(question_rows)} questions; the old rows stay in interview_legacy")
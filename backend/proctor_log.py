@@ -0,0 +1,204 @@
+import atexit
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+FSYNC_POLICIES = ("flush", "none")
+
+
+def index_key(session_id: Any) -> str:
+    """Session ids come from the client; keep them from breaking the tab/newline index format."""
+    return " ".join(str(session_id or "").split())
+
+
+class ProctorLog:
+    def __init__(self, root: str, flush_max_events: int = 256, flush_interval_ms: float = 1000,
+                 fsync: str = "flush", on_flush: Optional[Callable[[List[Dict[str, Any]]], Any]] = None,
+                 cached_days: int = 7):
+        """
+        Buffered, append-only store for proctoring events.
+        Events are kept in memory and written by a background thread once `flush_max_events`
+        are pending or `flush_interval_ms` has passed. Each day has a compact JSONL segment
+        (`proctor_<date>.log`) and a sidecar index (`proctor_<date>.idx`) of
+        "session_id offset length" lines, so one session's events are read with seeks.
+        :param root: Directory holding the segments and indexes.
+        :param fsync: "flush" fsyncs both files after every flush; "none" leaves it to the OS.
+        :param on_flush: Called with every flushed batch (e.g. a bulk DB insert).
+        :param cached_days: Day indexes kept in memory (least recently used are dropped and re-read on demand).
+        """
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy '{fsync}'")
+        self.root = root
+        self.flush_max_events = max(1, flush_max_events)
+        self.flush_interval = max(0.0, flush_interval_ms) / 1000.0
+        self.fsync = fsync
+        self.on_flush = on_flush
+        self.cached_days = max(1, cached_days)
+        os.makedirs(root, exist_ok=True)
+
+        self._buffer: List[Dict[str, Any]] = []
+        self._buffer_lock = threading.Condition()
+        self._write_lock = threading.Lock()  # serializes flushes (flusher thread vs. close)
+        # day -> session_id -> [(offset, length)], read from that day's .idx file on first use
+        self._days: "OrderedDict[str, Dict[str, List[Tuple[int, int]]]]" = OrderedDict()
+        self._stopped = False
+
+        self._flusher = threading.Thread(target=self._loop, name="proctor-flusher", daemon=True)
+        self._flusher.start()
+        atexit.register(self.close)
+
+    def append(self, events: List[Dict[str, Any]]):
+        with self._buffer_lock:
+            self._buffer.extend(events)
+            if len(self._buffer) >= self.flush_max_events:
+                self._buffer_lock.notify()
+
+    def session_events(self, session_id: str, day: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Flushed events for one session (optionally one day) plus any still buffered."""
+        key = index_key(session_id)
+        with self._write_lock:
+            if day is not None:
+                locations = [(day, offset, length) for offset, length in self._day_index(day).get(key, [])]
+            else:
+                # Uncached days are scanned rather than loaded, so one query does not evict every cached day
+                locations = []
+                for log_day in self._log_days():
+                    if log_day in self._days:
+                        entries = self._days[log_day].get(key, [])
+                    else:
+                        entries = [(offset, length) for k, offset, length in self._read_index(log_day) if k == key]
+                    locations.extend((log_day, offset, length) for offset, length in entries)
+
+        events = []
+        handles = {}
+        try:
+            for log_day, offset, length in locations:
+                f = handles.get(log_day)
+                if f is None:
+                    f = handles[log_day] = open(self._segment_path(log_day, "log"), "rb")
+                f.seek(offset)
+                events.append(json.loads(f.read(length)))
+        finally:
+            for f in handles.values():
+                f.close()
+
+        with self._buffer_lock:
+            events.extend(e for e in self._buffer if e.get("session_id") == session_id)
+        return events
+
+    def pending(self) -> int:
+        with self._buffer_lock:
+            return len(self._buffer)
+
+    def close(self):
+        if self._stopped:
+            return
+        self._stopped = True
+        with self._buffer_lock:
+            self._buffer_lock.notify()
+        self._flusher.join(timeout=5)
+        self.flush()
+
+    # ------------------- FLUSHING -------------------
+    def _loop(self):
+        while not self._stopped:
+            with self._buffer_lock:
+                if len(self._buffer) < self.flush_max_events:
+                    self._buffer_lock.wait(timeout=self.flush_interval)
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"⚠️ Proctor log flush failed: {e}")
+                time.sleep(self.flush_interval)
+
+    def flush(self) -> int:
+        with self._buffer_lock:
+            events, self._buffer = self._buffer, []
+        if not events:
+            return 0
+
+        with self._write_lock:
+            day = date.today().isoformat()
+            # Only a cached day index is updated; otherwise these lines are read with the rest on first use
+            day_index = self._days.get(day)
+            with open(self._segment_path(day, "log"), "ab") as log, \
+                    open(self._segment_path(day, "idx"), "ab") as idx:
+                offset = log.tell()
+                index_lines = []
+                for event in events:
+                    record = json.dumps(event, separators=(",", ":")).encode("utf-8")
+                    log.write(record + b"\n")
+                    session_id = index_key(event.get("session_id"))
+                    index_lines.append(f"{session_id}\t{offset}\t{len(record)}\n")
+                    if day_index is not None:
+                        day_index.setdefault(session_id, []).append((offset, len(record)))
+                    offset += len(record) + 1
+                # The log is written first, so an index entry never points past its record
+                log.flush()
+                idx.write("".join(index_lines).encode("utf-8"))
+                idx.flush()
+                if self.fsync == "flush":
+                    os.fsync(log.fileno())
+                    os.fsync(idx.fileno())
+
+        if self.on_flush is not None:
+            try:
+                self.on_flush(events)
+            except Exception as e:
+                print(f"⚠️ Proctor flush callback failed: {e}")
+        return len(events)
+
+    # ------------------- INDEX -------------------
+    def _segment_path(self, day: str, ext: str) -> str:
+        return os.path.join(self.root, f"proctor_{day}.{ext}")
+
+    def _log_days(self) -> List[str]:
+        return sorted(
+            name[len("proctor_"):-len(".log")] for name in os.listdir(self.root)
+            if name.startswith("proctor_") and name.endswith(".log")
+        )
+
+    def _day_index(self, day: str) -> Dict[str, List[Tuple[int, int]]]:
+        """One day's index, kept in an LRU of `cached_days` days. Call with the write lock held."""
+        if day in self._days:
+            self._days.move_to_end(day)
+            return self._days[day]
+        day_index: Dict[str, List[Tuple[int, int]]] = {}
+        for session_id, offset, length in self._read_index(day):
+            day_index.setdefault(session_id, []).append((offset, length))
+        self._days[day] = day_index
+        while len(self._days) > self.cached_days:
+            self._days.popitem(last=False)
+        return day_index
+
+    def _read_index(self, day: str) -> Iterator[Tuple[str, int, int]]:
+        """(session_id, offset, length) lines of a day's index; segments written before indexing existed are indexed now."""
+        if not os.path.exists(self._segment_path(day, "log")):
+            return
+        idx_path = self._segment_path(day, "idx")
+        if not os.path.exists(idx_path):
+            self._rebuild_index(day)
+        with open(idx_path, encoding="utf-8") as f:
+            for line in f:
+                parts = line.rstrip("\n").split("\t")
+                if len(parts) == 3:  # skip a line cut short by a crash
+                    yield parts[0], int(parts[1]), int(parts[2])
+
+    def _rebuild_index(self, day: str):
+        lines = []
+        offset = 0
+        with open(self._segment_path(day, "log"), "rb") as log:
+            for raw in log:
+                record = raw.rstrip(b"\n")
+                try:
+                    session_id = index_key(json.loads(record).get("session_id"))
+                    lines.append(f"{session_id}\t{offset}\t{len(record)}\n")
+                except (ValueError, AttributeError):
+                    pass
+                offset += len(raw)
+        with open(self._segment_path(day, "idx"), "w", encoding="utf-8") as idx:
+            idx.writelines(lines)
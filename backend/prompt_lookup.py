@@ -0,0 +1,139 @@
+from dataclasses import dataclass
+from typing import Any, List, Optional, Tuple
+
+import torch
+from transformers import LogitsProcessorList, StoppingCriteriaList
+
+import metrics
+
+
+@dataclass
+class PromptLookupStats:
+    drafted: int = 0  # draft tokens proposed from prompt n-gram matches
+    accepted: int = 0  # draft tokens the model agreed with
+    generated: int = 0  # tokens appended to the output
+    forward_passes: int = 0  # model calls after the prefill
+
+    @property
+    def acceptance_rate(self) -> float:
+        return self.accepted / self.drafted if self.drafted else 0.0
+
+    @property
+    def tokens_per_forward(self) -> float:
+        return self.generated / self.forward_passes if self.forward_passes else 0.0
+
+    def observe(self):
+        metrics.PROMPT_LOOKUP_TOKENS.inc(self.drafted, kind="drafted")
+        metrics.PROMPT_LOOKUP_TOKENS.inc(self.accepted, kind="accepted")
+        metrics.PROMPT_LOOKUP_TOKENS.inc(self.generated, kind="generated")
+        metrics.PROMPT_LOOKUP_FORWARDS.inc(self.forward_passes)
+
+
+def find_draft(ids: List[int], max_ngram: int, num_tokens: int) -> List[int]:
+    """
+    Tokens that followed the most recent earlier occurrence of the sequence's last n-gram
+    (longest n first), e.g. the rest of a phrase the model has started copying from the prompt.
+    """
+    length = len(ids)
+    for n in range(min(max_ngram, length - 1), 0, -1):
+        tail = ids[length - n:]
+        for start in range(length - n - 1, -1, -1):
+            if ids[start:start + n] == tail:
+                return ids[start + n:start + n + num_tokens]
+    return []
+
+
+def _crop(past: Tuple, length: int) -> Tuple:
+    """Drop cached key/values beyond `length` positions (legacy tuple cache)."""
+    return tuple((key[:, :, :length, :], value[:, :, :length, :]) for key, value in past)
+
+
+def _forward(model, input_ids: torch.LongTensor, past: Optional[Tuple]) -> Tuple[torch.FloatTensor, Tuple]:
+    output = model(input_ids=input_ids, past_key_values=past, use_cache=True)
+    past = output.past_key_values
+    if hasattr(past, "to_legacy_cache"):
+        past = past.to_legacy_cache()
+    return output.logits, past
+
+
+def prompt_lookup_generate(model,
+                           input_ids: torch.LongTensor,
+                           max_new_tokens: int,
+                           eos_token_id: int,
+                           logits_processor: LogitsProcessorList,
+                           logits_warper: LogitsProcessorList,
+                           stopping_criteria: StoppingCriteriaList,
+                           do_sample: bool = True,
+                           past_key_values: Optional[Tuple] = None,
+                           streamer: Optional[Any] = None,
+                           num_draft_tokens: int = 10,
+                           max_ngram: int = 3) -> Tuple[torch.LongTensor, PromptLookupStats]:
+    """
+    Single-sequence decoding that drafts tokens by n-gram lookup in the prompt and generated text
+    and verifies the whole draft in one forward pass. Greedy output is identical to plain decoding;
+    sampled output follows the same distribution (a draft token is kept with its probability,
+    otherwise the replacement is sampled with that token excluded).
+    :param input_ids: (1, prompt length) prompt, including any cached prefix.
+    :param past_key_values: Key/values (legacy tuple or a fresh cache) for a leading part of `input_ids`, or None.
+    :param logits_processor: Applied per position before `logits_warper`, with only accepted tokens
+        in its input, so stateful processors (schema constraints) never see rejected drafts.
+    """
+    stats = PromptLookupStats()
+    prompt_length = input_ids.shape[-1]
+    cached = past_key_values[0][0].shape[2] if past_key_values else 0
+    if streamer is not None:
+        streamer.put(input_ids.cpu())
+
+    # The cache always covers every token except the last one, which is fed with the next draft
+    past = past_key_values
+    if prompt_length - 1 > cached:
+        _, past = _forward(model, input_ids[:, cached:-1], past)
+    sequence = input_ids
+    finished = False
+
+    while not finished and sequence.shape[-1] - prompt_length < max_new_tokens:
+        remaining = max_new_tokens - (sequence.shape[-1] - prompt_length)
+        draft = find_draft(sequence[0].tolist(), max_ngram, num_draft_tokens)[:remaining - 1]
+        step_ids = torch.cat([sequence[:, -1:], sequence.new_tensor([draft])], dim=-1) if draft else sequence[:, -1:]
+        logits, past = _forward(model, step_ids, past)
+        stats.forward_passes += 1
+        stats.drafted += len(draft)
+
+        new_tokens = []
+        for i in range(len(draft) + 1):
+            context = torch.cat([sequence, sequence.new_tensor([new_tokens])], dim=-1) if new_tokens else sequence
+            scores = logits_processor(context, logits[:, i, :].float())
+            scores = logits_warper(context, scores) if do_sample else scores
+            probs = torch.softmax(scores, dim=-1)[0]
+
+            if i < len(draft):
+                token = draft[i]
+                keep = float(torch.rand(())) < float(probs[token]) if do_sample else int(probs.argmax()) == token
+                if not keep:
+                    residual = probs.clone()
+                    residual[token] = 0
+                    if residual.sum() <= 0:
+                        residual = probs  # the draft was the only allowed token
+                    token = int(torch.multinomial(residual, 1)) if do_sample else int(residual.argmax())
+                else:
+                    stats.accepted += 1
+            else:
+                keep = False
+                token = int(torch.multinomial(probs, 1)) if do_sample else int(probs.argmax())
+
+            new_tokens.append(token)
+            candidate = torch.cat([sequence, sequence.new_tensor([new_tokens])], dim=-1)
+            if token == eos_token_id or bool(stopping_criteria(candidate, None).any()):
+                finished = True
+            if finished or not keep:
+                break
+
+        sequence = torch.cat([sequence, sequence.new_tensor([new_tokens])], dim=-1)
+        stats.generated += len(new_tokens)
+        past = _crop(past, sequence.shape[-1] - 1)
+        if streamer is not None:
+            streamer.put(sequence.new_tensor(new_tokens).cpu())
+
+    if streamer is not None:
+        streamer.end()
+    return sequence, stats
@@ -0,0 +1,344 @@
+import json
+import os
+import re
+import threading
+import zlib
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from keyword_index import load_terms, normalize_term
+
+# off    - always generate questions with the LLM
+# hybrid - serve banked questions when retrieval is confident, otherwise generate (and bank what gets answered)
+# bank   - generate only when the bank cannot supply a full set at all
+QUESTION_BANK_MODES = ("off", "hybrid", "bank")
+
+EMBEDDING_VERSION = 1  # bump when `embed` changes; stored vectors are rebuilt on the next start
+VECTORS_FILE = "vectors.f32"
+ENTRIES_FILE = "questions.jsonl"
+META_FILE = "meta.json"
+LOCK_FILE = "bank.lock"
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#.]*")  # keeps c++, c#, node.js in one token
+STOPWORDS = frozenset(
+    "a an and are as at be between by can describe do does explain for from give have how in is it of on one "
+    "or over the their this to use used using walk what when where which why with would you your".split()
+)
+
+
+# ------------------- EMBEDDINGS -------------------
+def _tokens(text: str) -> List[str]:
+    tokens = [t.rstrip(".") for t in TOKEN_PATTERN.findall(text.lower())]
+    return [t for t in tokens if t and t not in STOPWORDS]
+
+
+def _features(text: str) -> Iterator[Tuple[str, float]]:
+    """Weighted word, word-bigram and character-trigram features (trigrams catch 'postgres' ~ 'postgresql')."""
+    tokens = _tokens(text)
+    for token in tokens:
+        yield "w:" + token, 1.0
+        padded = f"<{token}>"
+        for i in range(len(padded) - 2):
+            yield "c:" + padded[i:i + 3], 0.25
+    for first, second in zip(tokens, tokens[1:]):
+        yield f"b:{first} {second}", 0.5
+
+
+def embed(texts: Sequence[str], dim: int) -> np.ndarray:
+    """
+    L2-normalized hashed n-gram vectors (feature hashing with a sign bit), so there is no
+    vocabulary to fit or store and any text maps to the same space.
+    """
+    vectors = np.zeros((len(texts), dim), dtype=np.float32)
+    for row, text in enumerate(texts):
+        for feature, weight in _features(text):
+            h = zlib.crc32(feature.encode("utf-8"))
+            vectors[row, h % dim] += weight if h & 0x80000000 else -weight
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def load_seed(path: str) -> Dict[str, List[str]]:
+    """Curated "skill | question" lines grouped by skill."""
+    seed: Dict[str, List[str]] = {}
+    for line in load_terms(path):
+        skill, _, question = line.partition("|")
+        if question.strip():
+            seed.setdefault(skill.strip(), []).append(question.strip())
+    return seed
+
+
+def resume_terms(name: str, lines: Sequence[str], skills: Sequence[str]) -> Set[str]:
+    """
+    Words that point at one candidate rather than a topic: the name, plus capitalized words
+    inside education and experience lines (employers, schools, products, places), minus the
+    skills. Line-initial words are skipped since they are capitalized anyway.
+    """
+    terms = set(_tokens(name))
+    for line in lines:
+        terms.update(t for word in line.split()[1:] if word[:1].isupper() for t in _tokens(word))
+    return terms - {t for skill in skills for t in _tokens(skill)}
+
+
+def mentions_any(text: str, terms: Set[str]) -> bool:
+    return any(token in terms for token in _tokens(text))
+
+
+# ------------------- LOCKING -------------------
+@contextmanager
+def locked_file(path: str):
+    """Hold an exclusive lock on `path` (created if missing) across processes: flock, or msvcrt on Windows."""
+    with open(path, "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)  # gives up after ~10 s of retries
+                    break
+                except OSError:
+                    continue
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+# ------------------- INDEX -------------------
+@dataclass
+class BankedQuestion:
+    text: str
+    tags: List[str] = field(default_factory=list)  # skills the question was written or generated for
+    source: str = "generated"  # curated | generated
+    added_at: str = ""
+
+    def document(self) -> str:
+        """Text that is embedded: the question plus its tags, so a skill query finds it."""
+        return " ".join([self.text] + self.tags)
+
+
+class QuestionBank:
+    def __init__(self, directory: str, dim: int = 1024, seed_file: Optional[str] = None,
+                 dedupe_score: float = 0.9):
+        """
+        Persistent question store: one float32 row per question in an append-only file that is
+        memory-mapped for search, with the question texts in a JSON-lines file next to it.
+        Both files are only appended to, so a crash between the two writes loses at most the
+        last batch, which is trimmed on the next start. Writers in every process take a lock
+        file and first read what other processes appended, so workers can share one directory.
+        :param directory: Where the vectors, questions and metadata live (created if missing).
+        :param dim: Embedding width; changing it rebuilds the vectors from the stored texts.
+        :param seed_file: Curated "skill | question" lines loaded into an empty bank.
+        :param dedupe_score: Cosine similarity at or above which two questions count as duplicates.
+        """
+        self.directory = directory
+        self.dim = dim
+        self.dedupe_score = dedupe_score
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+        with self._file_lock():
+            self.entries: List[BankedQuestion] = []
+            self._entries_bytes = 0  # how much of the questions file self.entries covers
+            self._read_new_entries()
+            self._vectors = self._open_vectors()
+        # Exact repeats are caught even when their tags (and so their vectors) differ
+        self._texts = {normalize_term(e.text) for e in self.entries}
+
+        if not self.entries and seed_file and os.path.exists(seed_file):
+            added = sum(self.add(questions, [skill], source="curated") for skill, questions in load_seed(seed_file).items())
+            print(f"🌱 Question bank seeded with {added} curated questions")
+
+    def __len__(self) -> int:
+        return self._vectors.shape[0]
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    @contextmanager
+    def _file_lock(self):
+        """Exclusive across threads (the lock) and processes (the lock file)."""
+        with self._lock, locked_file(self._path(LOCK_FILE)):
+            yield
+
+    def _read_new_entries(self) -> List[BankedQuestion]:
+        """Append questions written after `_entries_bytes` (by any process) to self.entries. Hold the file lock."""
+        if not os.path.exists(self._path(ENTRIES_FILE)):
+            return []
+        entries, valid_bytes = [], self._entries_bytes
+        with open(self._path(ENTRIES_FILE), "r+b") as f:
+            f.seek(valid_bytes)
+            for line in f:
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("unterminated line")
+                    entries.append(BankedQuestion(**json.loads(line)))
+                except (ValueError, TypeError):
+                    # A torn last write; cut it off so the next append starts on a clean line
+                    f.truncate(valid_bytes)
+                    break
+                valid_bytes += len(line)
+        self.entries.extend(entries)
+        self._entries_bytes = valid_bytes
+        return entries
+
+    def _refresh(self):
+        """Catch up with questions other processes banked. Hold the file lock."""
+        new_entries = self._read_new_entries()
+        if new_entries:
+            self._texts.update(normalize_term(e.text) for e in new_entries)
+            self._vectors = self._map(len(self.entries))  # their vectors were written before the texts
+
+    def _refresh_if_changed(self):
+        path = self._path(ENTRIES_FILE)
+        if os.path.exists(path) and os.path.getsize(path) != self._entries_bytes:
+            with self._file_lock():
+                self._refresh()
+
+    def _map(self, count: int) -> np.ndarray:
+        if count == 0:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        return np.memmap(self._path(VECTORS_FILE), dtype=np.float32, mode="r", shape=(count, self.dim))
+
+    def _open_vectors(self) -> np.ndarray:
+        meta = {}
+        if os.path.exists(self._path(META_FILE)):
+            with open(self._path(META_FILE), encoding="utf-8") as f:
+                meta = json.load(f)
+        row_bytes = self.dim * 4
+        rows = os.path.getsize(self._path(VECTORS_FILE)) // row_bytes if os.path.exists(self._path(VECTORS_FILE)) else 0
+
+        if meta.get("dim") != self.dim or meta.get("embedding") != EMBEDDING_VERSION or rows < len(self.entries):
+            self._rebuild()
+        elif rows > len(self.entries):
+            with open(self._path(VECTORS_FILE), "r+b") as f:
+                f.truncate(len(self.entries) * row_bytes)
+        return self._map(len(self.entries))
+
+    def _rebuild(self):
+        """Re-embed every stored question (new dim or embedding version, or a lost vectors file)."""
+        if self.entries:
+            print(f"⏳ Rebuilding question bank vectors for {len(self.entries)} questions...")
+        tmp_path = self._path(VECTORS_FILE + ".tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(embed([e.document() for e in self.entries], self.dim).tobytes())
+        os.replace(tmp_path, self._path(VECTORS_FILE))
+        with open(self._path(META_FILE), "w", encoding="utf-8") as f:
+            json.dump({"dim": self.dim, "embedding": EMBEDDING_VERSION}, f)
+
+    def add(self, questions: Sequence[str], tags: Sequence[str] = (), source: str = "generated") -> int:
+        """
+        Append questions that are not near-duplicates of banked ones (or of each other).
+        Returns how many were added.
+        """
+        tags = [normalize_term(tag) for tag in tags if tag.strip()]
+        candidates = list(dict.fromkeys(q.strip() for q in questions if q and q.strip()))
+        if not candidates:
+            return 0
+
+        now = datetime.utcnow().isoformat(timespec="seconds")
+        new_entries = [BankedQuestion(text, list(tags), source, now) for text in candidates]
+        vectors = embed([e.document() for e in new_entries], self.dim)
+
+        with self._file_lock():
+            # Dedupe against the files as they are now, not as this process last saw them
+            self._refresh()
+            existing = self._vectors
+            keep: List[int] = []
+            for i, vector in enumerate(vectors):
+                if normalize_term(new_entries[i].text) in self._texts:
+                    continue
+                if len(existing) and float(np.max(existing @ vector)) >= self.dedupe_score:
+                    continue
+                if keep and float(np.max(vectors[keep] @ vector)) >= self.dedupe_score:
+                    continue
+                keep.append(i)
+            if not keep:
+                return 0
+
+            # Vectors first: rows beyond the question count are trimmed on start, missing rows are not
+            with open(self._path(VECTORS_FILE), "ab") as f:
+                f.write(vectors[keep].tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+            data = "".join(json.dumps(asdict(new_entries[i])) + "\n" for i in keep).encode("utf-8")
+            with open(self._path(ENTRIES_FILE), "ab") as f:
+                f.write(data)
+
+            self._entries_bytes += len(data)
+            self.entries.extend(new_entries[i] for i in keep)
+            self._texts.update(normalize_term(new_entries[i].text) for i in keep)
+            self._vectors = self._map(len(self.entries))
+        return len(keep)
+
+    def select(self, skills: Sequence[str], context: str = "", count: int = 5, candidates: int = 20,
+               min_score: float = 0.0, context_weight: float = 0.25, rng=None) -> List[Tuple[str, float]]:
+        """
+        Pick up to `count` distinct questions, taking turns over the resume's skills so each skill
+        gets its best unused match. Returns (question, cosine score) pairs in pick order.
+        :param skills: One query per skill, in priority order; `context` alone is used if empty.
+        :param context: Text (e.g. experience lines) blended into every query with `context_weight`.
+        :param candidates: Top-k per skill considered before moving on.
+        :param min_score: With `rng`, candidates at or above it are shuffled so repeat sessions vary.
+        """
+        self._refresh_if_changed()
+        vectors = self._vectors  # snapshot; add() only ever swaps in a longer map
+        if len(vectors) == 0:
+            return []
+        queries = [s for s in skills if s.strip()] or ([context] if context.strip() else [])
+        if not queries:
+            return []
+
+        query_vectors = embed(queries, self.dim)
+        if context.strip() and skills:
+            query_vectors += context_weight * embed([context], self.dim)
+            query_vectors /= np.maximum(np.linalg.norm(query_vectors, axis=1, keepdims=True), 1e-12)
+        scores = np.asarray(vectors @ query_vectors.T)  # (questions, skills) cosine similarities
+
+        k = min(candidates, len(vectors))
+        top = np.argpartition(-scores, k - 1, axis=0)[:k]
+        ranked = []
+        for j in range(len(queries)):
+            column = top[:, j][np.argsort(-scores[top[:, j], j], kind="stable")].tolist()
+            if rng is not None:
+                strong = [i for i in column if scores[i, j] >= min_score]
+                rng.shuffle(strong)
+                column = strong + [i for i in column if scores[i, j] < min_score]
+            ranked.append(column)
+
+        picked: List[Tuple[int, float]] = []
+        cursors = [0] * len(queries)
+        while len(picked) < count and any(c < len(col) for c, col in zip(cursors, ranked)):
+            for j, column in enumerate(ranked):
+                while cursors[j] < len(column):
+                    i = column[cursors[j]]
+                    cursors[j] += 1
+                    if any(i == p or float(vectors[i] @ vectors[p]) >= self.dedupe_score for p, _ in picked):
+                        continue
+                    picked.append((i, float(scores[i, j])))
+                    break
+                if len(picked) == count:
+                    break
+        return [(self.entries[i].text, score) for i, score in picked]
+
+    def stats(self) -> Dict[str, int]:
+        self._refresh_if_changed()
+        sources: Dict[str, int] = {}
+        for entry in self.entries[:len(self._vectors)]:
+            sources[entry.source] = sources.get(entry.source, 0) + 1
+        return {"questions": len(self._vectors), "dim": self.dim, **sources}
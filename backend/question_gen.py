@@ -1,17 +1,253 @@
-from transformers import AutoTokenizer, AutoModelForCausalLM
+from transformers import (
+    AutoTokenizer, DynamicCache, LogitsProcessor, LogitsProcessorList, StoppingCriteria, StoppingCriteriaList,
+    TemperatureLogitsWarper, TextIteratorStreamer, TopPLogitsWarper
+)
 import torch
-import json
-from typing import List, Dict, Union
+import torch.nn.functional as F
+import time
+from concurrent.futures import Future
+from typing import Any, Iterator, List, Dict, Optional, Tuple, Union
+from inference_scheduler import InferenceScheduler, GenerationRequest
+from llm_backends import load_model
+from prompt_lookup import prompt_lookup_generate
+from structured_output import (
+    ANSWER_EVALUATION_TEMPLATE, SCHEMAS, STRING_FORBIDDEN, AnswerEvaluation, Int, JsonFSM, JsonTemplate, Lit
+)
+import config
+import metrics
 
-class QuestionGenerator:
+STREAM_TOKEN_TIMEOUT = 120  # Seconds a stream consumer waits for the next token
+MAX_PROMPT_TOKENS = 1024
+
+# Fixed system blocks come first so their key/values can be computed once and reused;
+# everything request-specific goes after them in the user turn.
+QUESTIONS_SYSTEM_PROMPT = (
+    "<|system|>\n"
+    "You are a senior technical interviewer.\n"
+    "Generate **5 high-quality technical interview questions** based ONLY on the candidate's resume summary provided by the user.\n\n"
+    "IMPORTANT RULES:\n"
+    "- Ask ONLY proper interview questions.\n"
+    "- Do NOT repeat resume sentences.\n"
+    "- Do NOT convert statements into questions.\n"
+    "- Ask domain-relevant questions (AI/ML/Data/Python/SQL/Web etc.).\n"
+    "- Each question MUST be direct, meaningful, and interview-ready.\n"
+    "- Return ONLY a numbered list (1-5).\n"
+    "- No explanations.\n</s>\n"
+)
+
+FOLLOW_UP_SYSTEM_PROMPT = (
+    "<|system|>\n"
+    "You are conducting a technical interview. Generate one insightful follow-up question "
+    "based on the conversation context provided by the user.\n\n"
+    "Return ONLY the question with no additional text or numbering.</s>\n"
+)
+
+REVIEW_SYSTEM_PROMPT = (
+    "<|system|>\n"
+    "Analyze the interview Q&A provided by the user and provide:\n"
+    "- Short feedback on the answer\n"
+    "- Technical accuracy score (0-100)\n"
+    "- Relevance score (0-100)\n"
+    "- Confidence score (0-100)\n"
+    "- 3 specific improvement suggestions\n"
+    "- Expected ideal answer summary\n\n"
+    "Return one JSON object with, in this order: feedback, technical_score, relevance_score, "
+    "confidence_score, improvement_suggestions, expected_answer</s>\n"
+)
+
+def question_complete(text: str) -> bool:
+    """True once `text` holds the line QuestionGenerator.parse_follow_up would return."""
+    lines = text.split('\n')
+    for i, line in enumerate(lines):
+        line = line.strip().strip('"\'')
+        if not line:
+            continue
+        if line.endswith('?'):
+            return True
+        if i == len(lines) - 1:
+            return False  # still being generated
+        if '?' in line or line.endswith('.'):
+            return True
+    return False
+
+class QuestionStopCriteria(StoppingCriteria):
+    def __init__(self, tokenizer, prompt_length: int, enabled: List[bool]):
+        """Per-row early stop as soon as a complete question has been generated."""
+        self.tokenizer = tokenizer
+        self.prompt_length = prompt_length
+        self.enabled = enabled
+
+    def __call__(self, input_ids: torch.LongTensor, scores: torch.FloatTensor, **kwargs) -> torch.BoolTensor:
+        done = [
+            enabled and question_complete(
+                self.tokenizer.decode(row[self.prompt_length:], skip_special_tokens=True)
+            )
+            for row, enabled in zip(input_ids, self.enabled)
+        ]
+        return torch.tensor(done, dtype=torch.bool, device=input_ids.device)
+
+class TokenTable:
+    def __init__(self, tokenizer):
+        """
+        The literal text every vocabulary token adds to the output, for constrained decoding.
+        Assumes a SentencePiece vocabulary (Llama family): "▁" is a space and <0xNN> are raw bytes.
+        Special tokens and non-ASCII byte pieces (partial UTF-8 characters) map to None.
+        """
+        special = set(tokenizer.all_special_ids)
+        self.texts: List[Optional[str]] = []
+        byte_ids = set()
+        for token_id, piece in enumerate(tokenizer.convert_ids_to_tokens(list(range(len(tokenizer))))):
+            text = None
+            if token_id in special or not piece:
+                pass
+            elif len(piece) == 6 and piece.startswith("<0x") and piece.endswith(">"):
+                value = int(piece[3:5], 16)
+                text = chr(value) if value < 0x80 else None
+                byte_ids.add(token_id)
+            else:
+                text = piece.replace("▁", " ")
+            self.texts.append(text or None)
+
+        # Prefer regular pieces over byte tokens with the same text
+        self.by_text: Dict[str, int] = {}
+        for token_id, text in enumerate(self.texts):
+            if text is not None and token_id not in byte_ids:
+                self.by_text.setdefault(text, token_id)
+        for token_id in sorted(byte_ids):
+            if self.texts[token_id] is not None:
+                self.by_text.setdefault(self.texts[token_id], token_id)
+        self.max_text_length = max(len(text) for text in self.by_text)
+
+        self.string_mask = torch.tensor([
+            text is not None and not any(ch in STRING_FORBIDDEN for ch in text)
+            for text in self.texts
+        ], dtype=torch.bool)
+        self.digit_tokens = [
+            (token_id, text) for token_id, text in enumerate(self.texts)
+            if text is not None and text.isascii() and text.isdigit()
+        ]
+        self._prefix_tokens: Dict[str, int] = {}
+
+    def longest_prefix_token(self, text: str) -> int:
+        """The token covering the most leading characters of `text` (every ASCII character has one)."""
+        token_id = self._prefix_tokens.get(text)
+        if token_id is None:
+            for length in range(min(len(text), self.max_text_length), 0, -1):
+                token_id = self.by_text.get(text[:length])
+                if token_id is not None:
+                    break
+            else:
+                raise ValueError(f"No token starts {text!r}")
+            self._prefix_tokens[text] = token_id
+        return token_id
+
+class JsonConstraint(LogitsProcessor):
+    def __init__(self, table: TokenTable, template: JsonTemplate, prompt_length: int, batch_size: int, eos_token_id: int,
+                 rows: Optional[List[bool]] = None):
+        """
+        Mask each row's logits so the completion can only spell out `template`: literals are
+        forced, integers stay in range and strings are closed once they reach their token cap.
+        Pair with JsonStopCriteria to end each row as soon as its object closes.
+        :param rows: Which rows are constrained (default: all); the others pass through untouched.
+        """
+        self.table = table
+        self.prompt_length = prompt_length
+        self.eos_token_id = eos_token_id
+        self.fsms = [JsonFSM(template) if rows is None or rows[i] else None for i in range(batch_size)]
+        self._consumed = [0] * batch_size
+
+    def sync(self, input_ids: torch.LongTensor):
+        """Feed tokens generated since the last call to each row's state machine (safe to call twice per step)."""
+        for row, fsm in enumerate(self.fsms):
+            if fsm is None:
+                continue
+            new_tokens = input_ids[row, self.prompt_length + self._consumed[row]:].tolist()
+            self._consumed[row] += len(new_tokens)
+            for token_id in new_tokens:
+                if fsm.done or fsm.failed:
+                    break
+                text = self.table.texts[token_id] if token_id < len(self.table.texts) else None
+                if text is None or not fsm.advance(text):
+                    fsm.failed = True
+                    print(f"⚠️ Constrained decoding left the schema after {fsm.text!r}")
+
+    def _allow(self, mask: torch.BoolTensor, fsm: JsonFSM):
+        segment = fsm.segment
+        if fsm.done or fsm.failed:
+            mask[self.eos_token_id] = True
+            return
+        if isinstance(segment, Lit):
+            mask[self.table.longest_prefix_token(fsm.next_literal())] = True
+            return
+        if isinstance(segment, Int):
+            for token_id, digits in self.table.digit_tokens:
+                if segment.accepts(fsm.buffer + digits):
+                    mask[token_id] = True
+        elif fsm.value_tokens < segment.max_tokens or not fsm.can_close_value():
+            size = min(len(mask), len(self.table.string_mask))
+            mask[:size] = self.table.string_mask[:size]
+        if fsm.can_close_value():
+            mask[self.table.longest_prefix_token(fsm.next_literal())] = True
+
+    def __call__(self, input_ids: torch.LongTensor, scores: torch.FloatTensor) -> torch.FloatTensor:
+        self.sync(input_ids)
+        allowed = torch.zeros(scores.shape, dtype=torch.bool)
+        for row, fsm in enumerate(self.fsms):
+            if fsm is None:
+                allowed[row] = True
+            else:
+                self._allow(allowed[row], fsm)
+        return scores.masked_fill(~allowed.to(scores.device), float("-inf"))
+
+    def finished(self, input_ids: torch.LongTensor) -> torch.BoolTensor:
+        self.sync(input_ids)
+        return torch.tensor(
+            [fsm is not None and (fsm.done or fsm.failed) for fsm in self.fsms], dtype=torch.bool, device=input_ids.device
+        )
+
+class JsonStopCriteria(StoppingCriteria):
+    def __init__(self, constraint: JsonConstraint):
+        """Per-row early stop as soon as the constrained JSON object is closed."""
+        self.constraint = constraint
+
+    def __call__(self, input_ids: torch.LongTensor, scores: torch.FloatTensor, **kwargs) -> torch.BoolTensor:
+        return self.constraint.finished(input_ids)
+
+class RowTemperature(LogitsProcessor):
+    def __init__(self, temperatures: List[float]):
+        """Per-row sampling temperature, so requests with different temperatures can share a batch."""
+        self.temperatures = torch.tensor(temperatures, dtype=torch.float32).unsqueeze(-1)
+
+    def __call__(self, input_ids: torch.LongTensor, scores: torch.FloatTensor) -> torch.FloatTensor:
+        return scores / self.temperatures.to(device=scores.device, dtype=scores.dtype)
+
+class StepTimer(StoppingCriteria):
     def __init__(self):
-        model_id = "TinyLlama/TinyLlama-1.1B-Chat-v1.0"
-        cache_dir = "D:/huggingface_cache"
+        """Never stops generation; notes when the first token is out (end of prefill) and the last."""
+        self.start = time.perf_counter()
+        self.first_step = None
+        self.last_step = None
 
-        self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-        dtype = torch.float16 if torch.cuda.is_available() else torch.float32
+    def __call__(self, input_ids: torch.LongTensor, scores: torch.FloatTensor, **kwargs) -> torch.BoolTensor:
+        self.last_step = time.perf_counter()
+        if self.first_step is None:
+            self.first_step = self.last_step
+        return torch.zeros(input_ids.shape[0], dtype=torch.bool, device=input_ids.device)
 
-        print(f"⚡ Model is running on: {self.device} ({dtype})")
+    def observe(self):
+        if self.first_step is None:
+            return
+        metrics.STAGE_SECONDS.observe(self.first_step - self.start, stage="llm_prefill")
+        if self.last_step > self.first_step:
+            metrics.STAGE_SECONDS.observe(self.last_step - self.first_step, stage="llm_decode")
+
+class QuestionGenerator:
+    def __init__(self, backend: Optional[str] = None):
+        """
+        :param backend: One of llm_backends.LLM_BACKENDS; defaults to config.LLM_BACKEND.
+        """
+        model_id = config.LLM_MODEL_ID
+        cache_dir = config.LLM_CACHE_DIR
 
         self.tokenizer = AutoTokenizer.from_pretrained(
             model_id, 
@@ -19,84 +255,274 @@ class QuestionGenerator:
             padding_side="left",
             truncation=True
         )
-<<<<<<< HEAD
 
-=======
-        
->>>>>>> d5149f326e8f0ab22c2dfa1ba991c11400a0bf57
-        self.model = AutoModelForCausalLM.from_pretrained(
-            model_id,
-            cache_dir=cache_dir,
-            torch_dtype=dtype,
-            device_map="auto",
-            low_cpu_mem_usage=True
-        ).to(self.device)
-<<<<<<< HEAD
+        loaded = load_model(backend or config.LLM_BACKEND, model_id, cache_dir)
+        self.model = loaded.model
+        self.device = loaded.device
+        self.backend = loaded.backend
+        self.weights_bytes = loaded.weights_bytes
+        print(f"⚡ Model is running on: {self.device} ({self.backend}, {self.weights_bytes / 1e9:.2f} GB weights)")
 
         if self.tokenizer.pad_token is None:
             self.tokenizer.pad_token = self.tokenizer.eos_token
 
-    # --------------------------------------------------------------------------
-    # UPDATED PART — Better Question Generation (rest of class unchanged)
-    # --------------------------------------------------------------------------
-    def generate(self, resume_summary: str) -> List[str]:
-        prompt = (
-            f"<|system|>\n"
-            f"You are a senior technical interviewer.\n"
-            f"Generate **5 high-quality technical interview questions** based ONLY on the candidate's resume below.\n\n"
-            f"Resume Summary:\n{resume_summary}\n\n"
-            f"IMPORTANT RULES:\n"
-            f"- Ask ONLY proper interview questions.\n"
-            f"- Do NOT repeat resume sentences.\n"
-            f"- Do NOT convert statements into questions.\n"
-            f"- Ask domain-relevant questions (AI/ML/Data/Python/SQL/Web etc.).\n"
-            f"- Each question MUST be direct, meaningful, and interview-ready.\n"
-            f"- Return ONLY a numbered list (1-5).\n"
-            f"- No explanations.\n</s>\n"
-            f"<|user|>\nGenerate the questions.\n</s>\n"
-=======
-        
-        if self.tokenizer.pad_token is None:
-            self.tokenizer.pad_token = self.tokenizer.eos_token
+        # prefix text -> (token ids, legacy past_key_values); filled before the scheduler starts
+        # and afterwards only touched from its single worker thread
+        self._prefix_states: Dict[str, Tuple[torch.Tensor, Tuple]] = {}
+        self.prefix_cache = config.PROMPT_PREFIX_CACHE and loaded.accepts_past_key_values
+        if self.prefix_cache:
+            for prefix in (QUESTIONS_SYSTEM_PROMPT, FOLLOW_UP_SYSTEM_PROMPT, REVIEW_SYSTEM_PROMPT):
+                self._prefix_state(prefix)
 
-    def generate(self, resume_summary: str) -> List[str]:
-        prompt = (
-            f"<|system|>\n"
-            f"You are a technical interviewer analyzing a resume. Generate 5 technical interview questions "
-            f"based on these skills and experiences:\n\n"
-            f"{resume_summary}\n\n"
-            f"Return ONLY a numbered list of questions (1-5) with no additional text or explanations.</s>\n"
-            f"<|user|>\n"
-            f"Please generate the questions now.</s>\n"
->>>>>>> d5149f326e8f0ab22c2dfa1ba991c11400a0bf57
-            f"<|assistant|>\n"
+        self._token_table: Optional[TokenTable] = None  # built on first constrained request
+        self.prompt_lookup = config.PROMPT_LOOKUP_DECODING and loaded.accepts_past_key_values
+        if config.PROMPT_LOOKUP_DECODING and not self.prompt_lookup:
+            print(f"⚠️ Prompt-lookup decoding is not available with the '{self.backend}' backend")
+
+        # All request threads share one model; prompts are micro-batched per tick
+        self.scheduler = InferenceScheduler(
+            self._generate_batch,
+            max_batch_size=config.INFERENCE_MAX_BATCH_SIZE,
+            max_wait_ms=config.INFERENCE_MAX_WAIT_MS
         )
 
-        inputs = self.tokenizer(
-            str(prompt),
+    def memory_bytes(self) -> int:
+        """Size of the loaded weights and buffers."""
+        return self.weights_bytes
+
+    def _prefix_state(self, prefix: str) -> Tuple[torch.Tensor, Tuple]:
+        """Token ids and key/values for a fixed prompt prefix, prefilled once and then only read."""
+        state = self._prefix_states.get(prefix)
+        if state is None:
+            prefix_ids = self.tokenizer(prefix, return_tensors="pt").input_ids.to(self.device)
+            with torch.inference_mode():
+                past = self.model(input_ids=prefix_ids, use_cache=True).past_key_values
+            if isinstance(past, DynamicCache):
+                past = past.to_legacy_cache()
+            state = (prefix_ids, past)
+            self._prefix_states[prefix] = state
+            print(f"🧠 Cached key/values for a {prefix_ids.shape[-1]}-token prompt prefix")
+        return state
+
+    def _prefixed_inputs(self, requests: List[GenerationRequest]) -> Tuple[Dict[str, torch.Tensor], DynamicCache, int]:
+        """
+        Build [padding][prefix][padding][suffix] rows plus a fresh cache holding each row's prefix,
+        and return how many prompt tokens came from cached prefixes. Shorter prefixes are left-padded
+        to the longest one with zero key/values; the attention mask hides all padding and Llama
+        derives position ids from its cumsum, so each row's cached positions line up with the
+        positions its prefix was prefilled at.
+        """
+        states = [self._prefix_state(r.prefix) for r in requests]
+        prefix_length = max(prefix_ids.shape[-1] for prefix_ids, _ in states)
+        suffix = self.tokenizer(
+            [str(r.prompt) for r in requests],
             return_tensors="pt",
             truncation=True,
-            max_length=1024,
-            padding=True
+            max_length=MAX_PROMPT_TOKENS - prefix_length,
+            padding=True,
+            add_special_tokens=False
         ).to(self.device)
 
-        outputs = self.model.generate(
-            **inputs,
+        def stack_rows(tensors: List[torch.Tensor], dim: int, value: int = 0) -> torch.Tensor:
+            if all(t is tensors[0] for t in tensors):
+                # One shared prefix: broadcast views instead of per-row copies
+                return tensors[0].expand(len(tensors), *tensors[0].shape[1:])
+            padding = [0] * (2 * (tensors[0].dim() - 1 - dim))
+            return torch.cat([F.pad(t, padding + [prefix_length - t.shape[dim], 0], value=value) for t in tensors])
+
+        prefix_ids = [ids for ids, _ in states]
+        inputs = {
+            "input_ids": torch.cat(
+                [stack_rows(prefix_ids, 1, self.tokenizer.pad_token_id), suffix['input_ids']], dim=-1
+            ),
+            "attention_mask": torch.cat(
+                [stack_rows([torch.ones_like(ids) for ids in prefix_ids], 1), suffix['attention_mask']], dim=-1
+            )
+        }
+        # Copy-on-use: generate() extends the cache by concatenation, which allocates new
+        # tensors, so neither the views nor the padded copies write back into a stored prefix
+        past_key_values = DynamicCache.from_legacy_cache(tuple(
+            (stack_rows([past[layer][0] for _, past in states], 2), stack_rows([past[layer][1] for _, past in states], 2))
+            for layer in range(len(states[0][1]))
+        ))
+        return inputs, past_key_values, sum(ids.shape[-1] for ids in prefix_ids)
+
+    def _generate_batch(self, requests: List[GenerationRequest]) -> List[str]:
+        """
+        Run one left-padded generate() over every prompt in the batch. Rows may differ in prefix,
+        temperature and schema; only top-p is shared (see GenerationRequest.sampling_key).
+        """
+        extra_kwargs: Dict[str, Any] = {}
+        cached_tokens = 0
+        if self.prefix_cache and all(r.prefix for r in requests):
+            inputs, extra_kwargs["past_key_values"], cached_tokens = self._prefixed_inputs(requests)
+        else:
+            inputs = self.tokenizer(
+                [r.prefix + str(r.prompt) for r in requests],
+                return_tensors="pt",
+                truncation=True,
+                max_length=MAX_PROMPT_TOKENS,
+                padding=True
+            ).to(self.device)
+
+        # Padding sits before each row's prefix and suffix, so every completion starts at the same offset
+        prompt_length = inputs['input_ids'].shape[-1]
+        step_timer = StepTimer()
+        stopping_criteria = StoppingCriteriaList([step_timer])
+        if any(r.stop_at_question for r in requests):
+            stopping_criteria.append(
+                QuestionStopCriteria(self.tokenizer, prompt_length, [r.stop_at_question for r in requests])
+            )
+        logits_processor = LogitsProcessorList()
+        for schema in dict.fromkeys(r.schema for r in requests if r.schema):
+            # Only the scheduler's worker thread gets here, so the lazy build needs no lock
+            if self._token_table is None:
+                self._token_table = TokenTable(self.tokenizer)
+            constraint = JsonConstraint(
+                self._token_table, SCHEMAS[schema], prompt_length, len(requests), self.tokenizer.eos_token_id,
+                rows=[r.schema == schema for r in requests]
+            )
+            logits_processor.append(constraint)
+            stopping_criteria.append(JsonStopCriteria(constraint))
+
+        try:
+            with torch.inference_mode():
+                if requests[0].prompt_lookup:
+                    # Always a batch of one (see GenerationRequest.sampling_key)
+                    outputs, lookup_stats = prompt_lookup_generate(
+                        self.model,
+                        inputs['input_ids'],
+                        requests[0].max_new_tokens,
+                        self.tokenizer.eos_token_id,
+                        logits_processor,
+                        LogitsProcessorList([
+                            TemperatureLogitsWarper(requests[0].temperature),
+                            TopPLogitsWarper(requests[0].top_p)
+                        ]),
+                        stopping_criteria,
+                        past_key_values=extra_kwargs.get("past_key_values"),
+                        streamer=requests[0].streamer,
+                        num_draft_tokens=config.PROMPT_LOOKUP_NUM_TOKENS,
+                        max_ngram=config.PROMPT_LOOKUP_MAX_NGRAM
+                    )
+                    lookup_stats.observe()
+                else:
+                    # Temperature is applied per row before generate()'s own top-p warper
+                    logits_processor.append(RowTemperature([r.temperature for r in requests]))
+                    outputs = self.model.generate(
+                        **inputs,
+                        max_new_tokens=max(r.max_new_tokens for r in requests),
+                        temperature=1.0,
+                        top_p=requests[0].top_p,
+                        do_sample=True,
+                        pad_token_id=self.tokenizer.eos_token_id,
+                        num_return_sequences=1,
+                        stopping_criteria=stopping_criteria,
+                        logits_processor=logits_processor,
+                        streamer=requests[0].streamer if len(requests) == 1 else None,
+                        **extra_kwargs
+                    )
+        except Exception:
+            # Unblock stream consumers; generate() only ends the streamer on success
+            for r in requests:
+                if r.streamer is not None:
+                    r.streamer.end()
+            raise
+
+        step_timer.observe()
+        metrics.LLM_BATCH_SIZE.observe(len(requests))
+        metrics.LLM_TOKENS.inc(int(inputs['attention_mask'].sum()) - cached_tokens, kind="prompt")
+        metrics.LLM_TOKENS.inc(cached_tokens, kind="cached_prefix")
+        metrics.LLM_TOKENS.inc(int((outputs[:, prompt_length:] != self.tokenizer.eos_token_id).sum()), kind="generated")
+
+        return [
+            self.tokenizer.decode(
+                outputs[i][prompt_length:prompt_length + r.max_new_tokens],
+                skip_special_tokens=True
+            )
+            for i, r in enumerate(requests)
+        ]
+
+    def _submit(self, prefix: str, prompt: str, max_new_tokens: int, temperature: float, top_p: float = 0.9,
+                stop_at_question: bool = False, schema: str = "", prompt_lookup: bool = False) -> Future:
+        """
+        :param prompt_lookup: Use prompt-lookup decoding if it is enabled (for outputs that copy from the prompt).
+        """
+        return self.scheduler.submit(
+            prompt, max_new_tokens, temperature, top_p,
+            stop_at_question=stop_at_question,
+            prefix=prefix,
+            schema=schema,
+            prompt_lookup=prompt_lookup and self.prompt_lookup
+        )
+
+    def _complete(self, **request) -> str:
+        """Submit one prompt (`_submit` keyword arguments) and wait for its completion."""
+        future = self._submit(**request)
+        with metrics.timed("llm"):
+            return future.result()
+
+    def _stream(self, prefix: str, prompt: str, max_new_tokens: int, temperature: float, top_p: float = 0.9,
+                stop_at_question: bool = False, schema: str = "", prompt_lookup: bool = False) -> Iterator[str]:
+        """Yield decoded text pieces as the model produces them."""
+        streamer = TextIteratorStreamer(
+            self.tokenizer,
+            skip_prompt=True,
+            skip_special_tokens=True,
+            timeout=STREAM_TOKEN_TIMEOUT
+        )
+        future = self.scheduler.submit(
+            prompt, max_new_tokens, temperature, top_p,
+            stop_at_question=stop_at_question,
+            streamer=streamer,
+            prefix=prefix,
+            schema=schema,
+            prompt_lookup=prompt_lookup and self.prompt_lookup
+        )
+        for text in streamer:
+            if text:
+                yield text
+        future.result()  # surface generation errors to the consumer
+
+    # --------------------------------------------------------------------------
+    # UPDATED PART — Better Question Generation (rest of class unchanged)
+    # --------------------------------------------------------------------------
+    def generate(self, resume_summary: str) -> List[str]:
+        response = self._complete(
+            QUESTIONS_SYSTEM_PROMPT,
+            self._questions_prompt(resume_summary),
             max_new_tokens=300,
-            temperature=0.7,
-            top_p=0.9,
-            do_sample=True,
-            pad_token_id=self.tokenizer.eos_token_id,
-            num_return_sequences=1
+            temperature=0.7
         )
+        return self.parse_questions(response)
 
-        response = self.tokenizer.decode(
-            outputs[0][inputs['input_ids'].shape[-1]:],
-            skip_special_tokens=True
+    def generate_variants(self, resume_summary: str, count: int) -> List[List[str]]:
+        """Sample `count` independent question sets; they are queued together so they share batches."""
+        return self.generate_many([resume_summary] * max(1, count))
+
+    def generate_many(self, resume_summaries: List[str]) -> List[List[str]]:
+        """Question sets for several resumes, queued at once so the scheduler batches them."""
+        futures = [
+            self.scheduler.submit(
+                self._questions_prompt(summary), 300, 0.7, 0.9,
+                prefix=QUESTIONS_SYSTEM_PROMPT
+            )
+            for summary in resume_summaries
+        ]
+        return [self.parse_questions(future.result()) for future in futures]
+
+    @staticmethod
+    def _questions_prompt(resume_summary: str) -> str:
+        return (
+            f"<|user|>\n"
+            f"Resume Summary:\n{resume_summary}\n\n"
+            f"Generate the questions.\n</s>\n"
+            f"<|assistant|>\n"
         )
 
+    @staticmethod
+    def parse_questions(response: str) -> List[str]:
         questions = []
-<<<<<<< HEAD
         for q in response.split("\n"):
             q = q.strip()
             if not q:
@@ -124,55 +550,48 @@ class QuestionGenerator:
             "How do you approach debugging issues in ML pipelines?"
         ]
     # --------------------------------------------------------------------------
-=======
-        for q in response.split('\n'):
-            q = q.strip()
-            if not q:
-                continue
-            if q[0].isdigit() and ('.' in q or ')' in q):
-                q = q.split('.', 1)[-1].split(')', 1)[-1].strip()
-            if '?' not in q:
-                q += '?'
-            questions.append(q)
-        
-        return questions[:5] or ["Can you explain your experience with the technologies mentioned in your resume?"]
->>>>>>> d5149f326e8f0ab22c2dfa1ba991c11400a0bf57
 
     def generate_follow_up(self, context: str) -> str:
-        prompt = (
-            f"<|system|>\n"
-            f"You are conducting a technical interview. Generate one insightful follow-up question "
-            f"based on this conversation context:\n\n"
-            f"{context}\n\n"
-            f"Return ONLY the question with no additional text or numbering.</s>\n"
-            f"<|user|>\n"
-            f"Please generate the follow-up question now.</s>\n"
-            f"<|assistant|>\n"
-        )
+        return self.parse_follow_up(self._complete(**self._follow_up_request(context)))
 
-        inputs = self.tokenizer(
-            str(prompt),
-            return_tensors="pt",
-            truncation=True,
-            max_length=1024,
-            padding=True
-        ).to(self.device)
+    def follow_up_and_evaluation(self, qa_context: str) -> Tuple[str, str]:
+        """
+        Follow-up question and evaluation JSON for one answer, queued together so they run as two
+        rows of the same generate() call (with prompt-lookup decoding on, one after the other).
+        Parse the evaluation with AnswerEvaluation.from_json.
+        """
+        follow_up = self._submit(**self._follow_up_request(qa_context))
+        evaluation = self._submit(**self._evaluation_request(qa_context))
+        with metrics.timed("llm"):
+            return self.parse_follow_up(follow_up.result()), evaluation.result()
 
-        outputs = self.model.generate(
-            **inputs,
+    def _follow_up_request(self, context: str) -> Dict[str, Any]:
+        """`_submit` arguments for a follow-up question."""
+        return dict(
+            prefix=FOLLOW_UP_SYSTEM_PROMPT,
+            prompt=self._follow_up_prompt(context),
             max_new_tokens=100,
             temperature=0.7,
-            top_p=0.9,
-            do_sample=True,
-            pad_token_id=self.tokenizer.eos_token_id
+            stop_at_question=True,
+            prompt_lookup=True
         )
 
-        response = self.tokenizer.decode(
-            outputs[0][inputs['input_ids'].shape[-1]:],
-            skip_special_tokens=True
-        ).strip()
+    def stream_follow_up(self, context: str) -> Iterator[str]:
+        """Stream the follow-up question text; generation stops at the first complete question."""
+        return self._stream(**self._follow_up_request(context))
+
+    @staticmethod
+    def _follow_up_prompt(context: str) -> str:
+        return (
+            f"<|user|>\n"
+            f"Conversation context:\n{context}\n\n"
+            f"Please generate the follow-up question now.</s>\n"
+            f"<|assistant|>\n"
+        )
 
-        for line in response.split('\n'):
+    @staticmethod
+    def parse_follow_up(response: str) -> str:
+        for line in response.strip().split('\n'):
             line = line.strip()
             if not line:
                 continue
@@ -184,75 +603,59 @@ class QuestionGenerator:
         
         return "Could you elaborate on that point further?"
 
+    def _evaluate(self, qa_context: str) -> str:
+        return self._complete(**self._evaluation_request(qa_context))
+
+    def _evaluation_request(self, qa_context: str) -> Dict[str, Any]:
+        """`_submit` arguments for a schema-constrained answer evaluation."""
+        return dict(
+            prefix=REVIEW_SYSTEM_PROMPT,
+            prompt=self._review_prompt(qa_context),
+            max_new_tokens=ANSWER_EVALUATION_TEMPLATE.max_tokens(),
+            temperature=0.3,
+            schema="answer_evaluation",
+            prompt_lookup=True
+        )
+
+    def evaluate_answer(self, qa_context: str) -> AnswerEvaluation:
+        """
+        Score an answer with decoding constrained to ANSWER_EVALUATION_TEMPLATE. The row stops as
+        soon as the object closes and can never exceed the template's token cap.
+        Raises ValueError if the output still fails to parse.
+        """
+        return AnswerEvaluation.from_json(self._evaluate(qa_context))
+
     def review_answer(self, qa_context: str) -> Dict[str, Union[int, str]]:
-        prompt = (
-            f"<|system|>\n"
-            f"Analyze this interview Q&A and provide:\n"
-            f"- Technical accuracy score (0-100)\n"
-            f"- Relevance score (0-100)\n"
-            f"- Confidence score (0-100)\n"
-            f"- 3 specific improvement suggestions\n"
-            f"- Expected ideal answer summary\n\n"
-            f"Context:\n{qa_context}\n\n"
-            f"Return JSON format with: technical_score, relevance_score, "
-            f"confidence_score, feedback, expected_answer, improvement_suggestions</s>\n"
+        return self.parse_review(self._evaluate(qa_context))
+
+    def stream_review(self, qa_context: str) -> Iterator[str]:
+        """Stream the constrained evaluation JSON; parse the joined pieces with `parse_review`."""
+        return self._stream(**self._evaluation_request(qa_context))
+
+    @staticmethod
+    def _review_prompt(qa_context: str) -> str:
+        return (
             f"<|user|>\n"
+            f"Context:\n{qa_context}\n\n"
             f"Please provide the evaluation now.</s>\n"
             f"<|assistant|>\n"
         )
 
-        inputs = self.tokenizer(
-            str(prompt),
-            return_tensors="pt",
-            truncation=True,
-            max_length=1024,
-            padding=True
-        ).to(self.device)
-
-        outputs = self.model.generate(
-            **inputs,
-            max_new_tokens=400,
-            temperature=0.3,
-            top_p=0.9,
-            do_sample=True,
-            pad_token_id=self.tokenizer.eos_token_id
-        )
-
-        response = self.tokenizer.decode(
-            outputs[0][inputs['input_ids'].shape[-1]:],
-            skip_special_tokens=True
-        ).strip()
-
+    @staticmethod
+    def parse_review(response: str) -> Dict[str, Union[int, str]]:
         try:
-<<<<<<< HEAD
-=======
-            # Ensure response is a string and clean
->>>>>>> d5149f326e8f0ab22c2dfa1ba991c11400a0bf57
-            if isinstance(response, list):
-                response = " ".join(map(str, response))
-            feedback_data = json.loads(response)
-            for score in ['technical_score', 'relevance_score', 'confidence_score']:
-                if score in feedback_data:
-                    feedback_data[score] = max(0, min(100, int(feedback_data[score])))
-        except (json.JSONDecodeError, ValueError, TypeError) as e:
+            return AnswerEvaluation.from_json(response).to_review()
+        except ValueError as e:
             print(f"⚠️ Error parsing feedback: {e}")
-            feedback_data = {
-                "technical_score": 70,
-                "relevance_score": 75,
-                "confidence_score": 65,
-                "feedback": "The answer was relevant but could benefit from more specific examples and technical depth.",
-                "expected_answer": "A strong answer would demonstrate specific experience with the technologies mentioned and provide concrete examples.",
-                "improvement_suggestions": [
+            return AnswerEvaluation(
+                feedback="The answer was relevant but could benefit from more specific examples and technical depth.",
+                technical_score=70,
+                relevance_score=75,
+                confidence_score=65,
+                improvement_suggestions=[
                     "Provide more technical details",
                     "Include specific examples",
                     "Structure your answer more clearly"
-                ]
-            }
-
-        feedback_data["proficiency"] = int(
-            (feedback_data["technical_score"] * 0.5) + 
-            (feedback_data["relevance_score"] * 0.3) +
-            (feedback_data["confidence_score"] * 0.2)
-        )
-
-        return feedback_data
+                ],
+                expected_answer="A strong answer would demonstrate specific experience with the technologies mentioned and provide concrete examples."
+            ).to_review()
@@ -1,7 +1,9 @@
 from dataclasses import dataclass
 import re
 import fitz  # PyMuPDF is better than PyPDF2 for text layout
-from typing import List, Dict
+from typing import List, Dict, Iterable, Iterator, Optional
+from keyword_index import KeywordIndex, load_keyword_index
+import config
 
 @dataclass
 class ResumeAnalysis:
@@ -11,70 +13,104 @@ class ResumeAnalysis:
     experience: List[str]
     contact: Dict[str, str]
 
+NAME_NOT_FOUND = "Name Not Found"
+
 class ResumeParser:
+    # Compiled once at class load and shared by every instance
+    NAME_PATTERN = re.compile(r"^[A-Z][a-z]+(?:\s[A-Z][a-z]+)*$")
+    EDUCATION_PATTERNS = [
+        re.compile(r"(B\.?Tech|M\.?Tech|Bachelor|Master).*?(Computer|Technology|Engineering)", re.IGNORECASE),
+        re.compile(r"(University|College)\s+\w+.*?", re.IGNORECASE),
+        re.compile(r"(BCA|MCA|B\.?Sc|M\.?Sc)", re.IGNORECASE)
+    ]
+    # Cheap prefilter: any line an education pattern can match contains one of these
+    EDUCATION_TRIGGER = re.compile(r"tech|bachelor|master|university|college|bca|mca|b\.?sc|m\.?sc", re.IGNORECASE)
+    EXPERIENCE_PATTERN = re.compile(r"(intern|experience|developer|engineer)", re.IGNORECASE)
+    EMAIL_PATTERN = re.compile(r'[\w\.-]+@[\w\.-]+')
+    PHONE_PATTERN = re.compile(r'(\+91[\-\s]?)?[6-9]\d{9}')
+    NAME_LINES = 5  # Assume name is in the top 5 lines
+
+    def __init__(self, skills_index: Optional[KeywordIndex] = None,
+                 max_pages: Optional[int] = None, max_text_bytes: Optional[int] = None):
+        """
+        :param skills_index: Skill dictionary; defaults to config.RESUME_SKILLS_FILE.
+        :param max_pages: Pages read before extraction stops (long portfolios are cut off).
+        :param max_text_bytes: Extracted text read before extraction stops.
+        """
+        self.skills_index = skills_index or load_keyword_index(config.RESUME_SKILLS_FILE)
+        self.max_pages = max_pages or config.RESUME_MAX_PAGES
+        self.max_text_bytes = max_text_bytes or config.RESUME_MAX_TEXT_KB * 1024
+
     def analyze(self, file_path: str) -> ResumeAnalysis:
-        text = self._extract_text(file_path)
+        with fitz.open(file_path) as doc:
+            return self._analyze_pages(self._iter_pages(doc))
+
+    def analyze_bytes(self, data: bytes) -> ResumeAnalysis:
+        """Parse an in-memory PDF (e.g. an upload) without going through a file."""
+        with fitz.open(stream=data, filetype="pdf") as doc:
+            return self._analyze_pages(self._iter_pages(doc))
+
+    def _iter_pages(self, doc) -> Iterator[str]:
+        """Yield page text lazily until the page or text-size cap is reached."""
+        budget = self.max_text_bytes
+        for index, page in enumerate(doc):
+            if index >= self.max_pages or budget <= 0:
+                print(f"✂️ Resume truncated after {index} of {doc.page_count} pages")
+                return
+            encoded = page.get_text().encode("utf-8")[:budget]
+            budget -= len(encoded)
+            yield encoded.decode("utf-8", errors="ignore")
+
+    def _analyze_pages(self, pages: Iterable[str]) -> ResumeAnalysis:
+        """
+        Split each page into lines once and dispatch every line to all extractors,
+        stopping once every section has a result.
+        """
+        name = NAME_NOT_FOUND
+        skills, education, experience = {}, {}, {}  # dicts as insertion-ordered sets
+        contact = {"email": "N/A", "phone": "N/A"}
+
+        for page_number, text in enumerate(pages):
+            lines = text.strip().split('\n')
+            if page_number == 0:
+                name = self._extract_name(lines)
+            # Skills may span lines ("machine\nlearning"), so the index scans the page text once
+            skills.update(dict.fromkeys(self.skills_index.found(text)))
 
-        name = self._extract_name(text)
-        skills = self._extract_skills(text)
-        education = self._extract_education(text)
-        experience = self._extract_experience(text)
-        contact = self._extract_contact(text)
+            for line in lines:
+                if self.EDUCATION_TRIGGER.search(line):
+                    self._extract_education(line, education)
+                if self.EXPERIENCE_PATTERN.search(line):
+                    experience[line.strip()] = None
+                if contact["email"] == "N/A" and '@' in line:
+                    email = self.EMAIL_PATTERN.search(line)
+                    if email:
+                        contact["email"] = email.group(0)
+                if contact["phone"] == "N/A":
+                    phone = self.PHONE_PATTERN.search(line)
+                    if phone:
+                        contact["phone"] = phone.group(0)
+
+            has_contact = any(value != "N/A" for value in contact.values())
+            if name != NAME_NOT_FOUND and has_contact and skills and education and experience:
+                break
 
         return ResumeAnalysis(
             name=name,
-            skills=skills,
-            education=education,
-            experience=experience,
+            skills=list(skills),
+            education=list(education),
+            experience=list(experience),
             contact=contact
         )
 
-    def _extract_text(self, file_path: str) -> str:
-        doc = fitz.open(file_path)
-        return " ".join(page.get_text() for page in doc)
-
-    def _extract_name(self, text: str) -> str:
-        lines = text.strip().split('\n')
-        for line in lines[:5]:  # Assume name is in the top 5 lines
+    def _extract_name(self, lines: List[str]) -> str:
+        for line in lines[:self.NAME_LINES]:
             line = line.strip()
-            if re.match(r"^[A-Z][a-z]+(?:\s[A-Z][a-z]+)*$", line):
+            if self.NAME_PATTERN.match(line):
                 return line
-        return "Name Not Found"
-
-    def _extract_skills(self, text: str) -> List[str]:
-        keywords = ['python', 'java', 'c++', 'sql', 'ml', 'ai', 'tensorflow', 'pytorch', 'flask', 'react', 'django', 'html', 'css', 'javascript']
-        found = [kw for kw in keywords if kw.lower() in text.lower()]
-        return list(set(found))
-
-    def _extract_education(self, text: str) -> List[str]:
-        patterns = [
-            r"(B\.?Tech|M\.?Tech|Bachelor|Master).*?(Computer|Technology|Engineering)",
-            r"(University|College)\s+\w+.*?",
-            r"(BCA|MCA|B\.?Sc|M\.?Sc)"
-        ]
-        return self._find_matches(text, patterns)
-
-    def _extract_experience(self, text: str) -> List[str]:
-        lines = text.split('\n')
-        experience_lines = [line.strip() for line in lines if re.search(r"(intern|experience|developer|engineer)", line, re.IGNORECASE)]
-        return list(set(experience_lines))
-
-    def _extract_contact(self, text: str) -> Dict[str, str]:
-        email = re.search(r'[\w\.-]+@[\w\.-]+', text)
-        phone = re.search(r'(\+91[\-\s]?)?[6-9]\d{9}', text)
-        return {
-            "email": email.group(0) if email else "N/A",
-            "phone": phone.group(0) if phone else "N/A"
-        }
+        return NAME_NOT_FOUND
 
-    def _find_matches(self, text: str, patterns: List[str]) -> List[str]:
-        matches = []
-        for pattern in patterns:
-            found = re.findall(pattern, text, re.IGNORECASE)
-            if found:
-                for match in found:
-                    if isinstance(match, tuple):
-                        matches.append(" ".join(match))
-                    else:
-                        matches.append(match)
-        return list(set(matches))
+    def _extract_education(self, line: str, found: Dict[str, None]):
+        for pattern in self.EDUCATION_PATTERNS:
+            for match in pattern.findall(line):
+                found[" ".join(match) if isinstance(match, tuple) else match] = None
@@ -0,0 +1,162 @@
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+# Characters Whisper leaves attached to word tokens (" Um," -> "um")
+TOKEN_STRIP = " .,!?;:\"'()[]-…"
+# Gaps shorter than this are ordinary articulation, not pauses
+MIN_PAUSE_SECONDS = 0.3
+
+
+@dataclass
+class SpeechAnalytics:
+    word_count: int = 0
+    duration_seconds: float = 0.0
+    words_per_minute: float = 0.0
+    # Sliding-window speaking rate (windows overlap by half)
+    wpm_windows: List[float] = field(default_factory=list)
+    wpm_min: float = 0.0
+    wpm_max: float = 0.0
+    wpm_cv: float = 0.0  # coefficient of variation across windows; high = uneven pace
+    pause_count: int = 0
+    pause_p50: float = 0.0
+    pause_p90: float = 0.0
+    pause_max: float = 0.0
+    long_silences: List[Tuple[float, float]] = field(default_factory=list)  # (start, end) seconds
+    long_silence_seconds: float = 0.0
+    filler_count: int = 0
+    filler_density: float = 0.0  # fillers per 100 words
+    probability_min: float = 0.0
+    probability_p10: float = 0.0
+    probability_p50: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def word_arrays(words: Sequence[Dict[str, Any]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Column arrays (starts, ends, probabilities, normalized tokens) from Whisper word dicts."""
+    count = len(words)
+    starts = np.fromiter((w.get("start", 0.0) for w in words), dtype=np.float64, count=count)
+    ends = np.fromiter((w.get("end", 0.0) for w in words), dtype=np.float64, count=count)
+    probs = np.fromiter((w.get("probability", 1.0) for w in words), dtype=np.float64, count=count)
+    tokens = np.char.strip(np.char.lower(np.array([w.get("word", "") for w in words], dtype=str)), TOKEN_STRIP)
+    return starts, ends, probs, tokens
+
+
+def count_fillers(tokens: np.ndarray, filler_terms: Iterable[str]) -> int:
+    """Count filler terms as whole-token n-grams, so "you know" matches across two word entries."""
+    by_length: Dict[int, List[str]] = {}
+    for term in filler_terms:
+        parts = term.lower().split()
+        if parts:
+            by_length.setdefault(len(parts), []).append(" ".join(parts))
+
+    total = 0
+    for n, terms in by_length.items():
+        if len(tokens) < n:
+            continue
+        grams = tokens[:len(tokens) - n + 1]
+        for offset in range(1, n):
+            grams = np.char.add(np.char.add(grams, " "), tokens[offset:len(tokens) - n + 1 + offset])
+        total += int(np.isin(grams, terms).sum())
+    return total
+
+
+def sliding_wpm(starts: np.ndarray, duration_start: float, duration_end: float,
+                window_seconds: float) -> np.ndarray:
+    """Words per minute in windows of `window_seconds` stepping by half a window."""
+    span = duration_end - duration_start
+    if span <= 0:
+        return np.zeros(0)
+    if span <= window_seconds:
+        return np.array([len(starts) / span * 60.0])
+    step = window_seconds / 2.0
+    window_starts = np.arange(duration_start, duration_end - window_seconds + step, step)
+    # Anchor a last window at the end so the tail is never left out
+    window_starts = np.unique(np.append(window_starts[window_starts <= duration_end - window_seconds],
+                                        duration_end - window_seconds))
+    window_ends = np.minimum(window_starts + window_seconds, duration_end)
+    # `starts` is sorted, so each window's word count is a difference of two binary searches
+    counts = np.searchsorted(starts, window_ends, side="left") - np.searchsorted(starts, window_starts, side="left")
+    return counts / (window_ends - window_starts) * 60.0
+
+
+def analyze_words(words: Sequence[Dict[str, Any]], filler_terms: Iterable[str] = (),
+                  window_seconds: float = 30.0, long_silence_seconds: float = 2.0,
+                  max_reported_silences: int = 20) -> SpeechAnalytics:
+    """
+    Pace, pauses, fillers and recognition confidence from Whisper word timestamps,
+    computed with array operations over the whole answer.
+    :param words: `words` from a transcription result (word, start, end, probability).
+    :param filler_terms: Filler words/phrases, e.g. the FILLER_WORDS dictionary terms.
+    :param window_seconds: Window length for the sliding words-per-minute series.
+    :param long_silence_seconds: Gaps at least this long are reported as long silences.
+    :param max_reported_silences: Longest silences listed (all are counted).
+    """
+    if not words:
+        return SpeechAnalytics()
+
+    starts, ends, probs, tokens = word_arrays(words)
+    order = np.argsort(starts, kind="stable")  # stitched incremental transcripts are usually sorted already
+    starts, ends, probs, tokens = starts[order], ends[order], probs[order], tokens[order]
+
+    word_count = len(starts)
+    duration = float(max(ends.max() - starts[0], 0.0))
+    wpm = word_count / duration * 60.0 if duration > 0 else 0.0
+    windows = sliding_wpm(starts, float(starts[0]), float(starts[0]) + duration, window_seconds)
+
+    gaps = np.clip(starts[1:] - ends[:-1], 0.0, None)
+    pauses = gaps[gaps >= MIN_PAUSE_SECONDS]
+    long_idx = np.flatnonzero(gaps >= long_silence_seconds)
+    longest = long_idx[np.argsort(gaps[long_idx])[::-1][:max_reported_silences]]
+    longest.sort()
+
+    fillers = count_fillers(tokens, filler_terms)
+    p10, p50 = np.percentile(probs, [10, 50])
+    pause_p50, pause_p90 = np.percentile(pauses, [50, 90]) if len(pauses) else (0.0, 0.0)
+
+    return SpeechAnalytics(
+        word_count=word_count,
+        duration_seconds=round(duration, 2),
+        words_per_minute=round(wpm, 1),
+        wpm_windows=np.round(windows, 1).tolist(),
+        wpm_min=round(float(windows.min()), 1) if len(windows) else 0.0,
+        wpm_max=round(float(windows.max()), 1) if len(windows) else 0.0,
+        wpm_cv=round(float(windows.std() / windows.mean()), 3) if len(windows) and windows.mean() > 0 else 0.0,
+        pause_count=int(len(pauses)),
+        pause_p50=round(float(pause_p50), 2),
+        pause_p90=round(float(pause_p90), 2),
+        pause_max=round(float(gaps.max()), 2) if len(gaps) else 0.0,
+        long_silences=[(round(float(ends[i]), 2), round(float(starts[i + 1]), 2)) for i in longest],
+        long_silence_seconds=round(float(gaps[long_idx].sum()), 2),
+        filler_count=fillers,
+        filler_density=round(fillers / word_count * 100.0, 2),
+        probability_min=round(float(probs.min()), 3),
+        probability_p10=round(float(p10), 3),
+        probability_p50=round(float(p50), 3)
+    )
+
+
+def speech_confidence(speech: SpeechAnalytics) -> int:
+    """
+    Speaking-confidence score (0-100) from delivery: fillers, pace, pace stability,
+    long silences and how clearly Whisper heard the words.
+    """
+    score = 90.0
+    score -= min(30.0, speech.filler_density * 2)  # same weight as the text-only filler rate
+
+    if speech.words_per_minute < 100:  # comfortable interview pace is roughly 100-170 wpm
+        score -= min(15.0, (100 - speech.words_per_minute) * 0.3)
+    elif speech.words_per_minute > 170:
+        score -= min(15.0, (speech.words_per_minute - 170) * 0.3)
+    if speech.wpm_cv > 0.35:
+        score -= 5
+
+    if speech.duration_seconds > 0:
+        score -= min(15.0, speech.long_silence_seconds / speech.duration_seconds * 50)
+    if speech.probability_p10 < 0.5:  # mumbled or hesitant words
+        score -= (0.5 - speech.probability_p10) * 20
+
+    return int(max(10, min(100, score)))
@@ -0,0 +1,78 @@
+import contextvars
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Tuple
+
+
+@dataclass
+class Stage:
+    name: str
+    fn: Callable[..., Any]  # called with the results of `deps` as keyword arguments
+    deps: List[str] = field(default_factory=list)
+
+
+class StageExecutor:
+    def __init__(self, max_workers: int = 8):
+        """
+        Run a small DAG of stages on a shared thread pool, starting every stage
+        as soon as its dependencies have finished.
+        :param max_workers: Threads shared by all concurrently executing pipelines.
+        """
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="stage")
+
+    def run(self, stages: List[Stage]) -> Tuple[Dict[str, Any], Dict[str, Dict[str, float]]]:
+        """
+        Execute the stages and return (results by stage name, timings by stage name).
+        Timings hold `start_ms` (offset from pipeline start) and `duration_ms`.
+        The first stage exception is re-raised once running stages have settled.
+        """
+        by_name = {stage.name: stage for stage in stages}
+        for stage in stages:
+            missing = [d for d in stage.deps if d not in by_name]
+            if missing:
+                raise ValueError(f"Stage '{stage.name}' depends on unknown stages {missing}")
+
+        results: Dict[str, Any] = {}
+        timings: Dict[str, Dict[str, float]] = {}
+        pipeline_start = time.perf_counter()
+        running = {}
+        pending = list(stages)
+        error = None
+
+        def timed(stage, kwargs):
+            start = time.perf_counter()
+            try:
+                return stage.fn(**kwargs)
+            finally:
+                timings[stage.name] = {
+                    "start_ms": round((start - pipeline_start) * 1000, 1),
+                    "duration_ms": round((time.perf_counter() - start) * 1000, 1)
+                }
+
+        while pending or running:
+            if error is None:
+                ready = [s for s in pending if all(d in results for d in s.deps)]
+                for stage in ready:
+                    pending.remove(stage)
+                    kwargs = {d: results[d] for d in stage.deps}
+                    # Each stage runs in a copy of the caller's context, so per-request
+                    # metrics recorded inside a stage are attributed to that request
+                    context = contextvars.copy_context()
+                    running[self.executor.submit(context.run, timed, stage, kwargs)] = stage.name
+            if not running:
+                if pending and error is None:
+                    raise ValueError(f"Stages {[s.name for s in pending]} have circular dependencies")
+                break
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                try:
+                    results[name] = future.result()
+                except Exception as e:
+                    error = error or e
+
+        if error is not None:
+            raise error
+        return results, timings
@@ -0,0 +1,221 @@
+import json
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+# Characters a constrained string value may never contain; keeping escapes out means the
+# generated object is always valid JSON without an escape-aware state machine
+STRING_FORBIDDEN = frozenset('"\\') | frozenset(chr(c) for c in range(32))
+
+
+# ------------------- TEMPLATE -------------------
+@dataclass(frozen=True)
+class Lit:
+    text: str
+
+
+@dataclass(frozen=True)
+class Int:
+    lo: int
+    hi: int
+
+    @property
+    def max_digits(self) -> int:
+        return len(str(self.hi))
+
+    def accepts(self, digits: str) -> bool:
+        """Whether `digits` is a prefix of some in-range integer."""
+        if not (digits.isascii() and digits.isdigit()) or len(digits) > self.max_digits:
+            return False
+        if len(digits) > 1 and digits[0] == "0":
+            return False
+        return int(digits) <= self.hi
+
+    def complete(self, digits: str) -> bool:
+        return bool(digits) and self.accepts(digits) and int(digits) >= self.lo
+
+
+@dataclass(frozen=True)
+class Str:
+    min_chars: int = 1  # must not exceed max_tokens, so a forced close is always reachable
+    max_tokens: int = 64
+
+
+@dataclass(frozen=True)
+class StrList:
+    count: int
+    item: Str
+
+
+Segment = Union[Lit, Int, Str]
+
+
+class JsonTemplate:
+    def __init__(self, fields: List[Tuple[str, Union[Int, Str, StrList]]]):
+        """
+        A fixed-shape JSON object: keys, punctuation and whitespace are literal, and only the
+        values are generated. Strings cannot contain quotes, backslashes or control characters.
+        :param fields: (key, value spec) pairs in output order.
+        """
+        self.fields = fields
+        parts: List[Segment] = [Lit("{")]
+        for i, (name, spec) in enumerate(fields):
+            parts.append(Lit(("" if i == 0 else ", ") + json.dumps(name) + ": "))
+            if isinstance(spec, Int):
+                parts.append(spec)
+            elif isinstance(spec, Str):
+                parts += [Lit('"'), spec, Lit('"')]
+            else:
+                parts.append(Lit("["))
+                for j in range(spec.count):
+                    parts += [Lit(('"' if j == 0 else ', "')), spec.item, Lit('"')]
+                parts.append(Lit("]"))
+        parts.append(Lit("}"))
+
+        # Adjacent literals are merged so every value is followed by exactly one literal
+        self.segments: List[Segment] = []
+        for part in parts:
+            if isinstance(part, Lit) and self.segments and isinstance(self.segments[-1], Lit):
+                self.segments[-1] = Lit(self.segments[-1].text + part.text)
+            else:
+                self.segments.append(part)
+
+    def max_tokens(self) -> int:
+        """
+        Hard cap on generated tokens for one object, whatever the tokenizer: every token carries at
+        least one character, an Int has at most `max_digits`, and a Str is closed after `max_tokens`.
+        """
+        return sum(
+            len(seg.text) if isinstance(seg, Lit) else seg.max_tokens if isinstance(seg, Str) else seg.max_digits
+            for seg in self.segments
+        )
+
+
+class JsonFSM:
+    def __init__(self, template: JsonTemplate):
+        """Tracks how far one generated row has progressed through a JsonTemplate."""
+        self.segments = template.segments
+        self.index = 0
+        self.offset = 0  # characters of the current literal consumed
+        self.buffer = ""  # characters of the current value
+        self.value_tokens = 0  # tokens that contributed to the current string value
+        self.failed = False
+        self.text = ""
+
+    @property
+    def done(self) -> bool:
+        return self.index >= len(self.segments)
+
+    @property
+    def segment(self) -> Optional[Segment]:
+        return None if self.done else self.segments[self.index]
+
+    def next_literal(self) -> str:
+        """Remaining text of the current literal, or all of the literal after the current value."""
+        if self.done:
+            return ""
+        if isinstance(self.segment, Lit):
+            return self.segment.text[self.offset:]
+        return self.segments[self.index + 1].text
+
+    def can_close_value(self) -> bool:
+        segment = self.segment
+        if isinstance(segment, Int):
+            return segment.complete(self.buffer)
+        if isinstance(segment, Str):
+            return len(self.buffer) >= segment.min_chars
+        return False
+
+    def advance(self, token_text: str) -> bool:
+        """Consume one generated token's text; returns False (and marks the row failed) if it doesn't fit."""
+        in_string = isinstance(self.segment, Str)
+        for ch in token_text:
+            if not self._consume(ch):
+                self.failed = True
+                return False
+        if in_string and isinstance(self.segment, Str):
+            self.value_tokens += 1
+        self.text += token_text
+        return True
+
+    def _consume(self, ch: str) -> bool:
+        while not self.done:
+            segment = self.segment
+            if isinstance(segment, Lit):
+                if segment.text[self.offset] != ch:
+                    return False
+                self.offset += 1
+                if self.offset == len(segment.text):
+                    self._next()
+                return True
+            if isinstance(segment, Int):
+                if segment.accepts(self.buffer + ch):
+                    self.buffer += ch
+                    return True
+                if not segment.complete(self.buffer):
+                    return False
+                self._next()  # the character starts the following literal
+                continue
+            # Str
+            if ch == '"' and self.can_close_value():
+                self._next()
+                continue
+            if ch in STRING_FORBIDDEN:
+                return False
+            self.buffer += ch
+            return True
+        return False  # nothing may follow the closing brace
+
+    def _next(self):
+        self.index += 1
+        self.offset = 0
+        self.buffer = ""
+        self.value_tokens = 0
+
+
+# ------------------- ANSWER EVALUATION -------------------
+ANSWER_EVALUATION_TEMPLATE = JsonTemplate([
+    ("feedback", Str(min_chars=20, max_tokens=80)),  # written first so the scores follow from it
+    ("technical_score", Int(0, 100)),
+    ("relevance_score", Int(0, 100)),
+    ("confidence_score", Int(0, 100)),
+    ("improvement_suggestions", StrList(3, Str(min_chars=10, max_tokens=32))),
+    ("expected_answer", Str(min_chars=20, max_tokens=80)),
+])
+
+SCHEMAS = {"answer_evaluation": ANSWER_EVALUATION_TEMPLATE}
+
+
+@dataclass
+class AnswerEvaluation:
+    feedback: str
+    technical_score: int
+    relevance_score: int
+    confidence_score: int
+    improvement_suggestions: List[str]
+    expected_answer: str
+
+    @property
+    def proficiency(self) -> int:
+        return int(self.technical_score * 0.5 + self.relevance_score * 0.3 + self.confidence_score * 0.2)
+
+    @classmethod
+    def from_json(cls, text: str) -> "AnswerEvaluation":
+        """Parse a completed ANSWER_EVALUATION_TEMPLATE object; raises ValueError if it is cut short."""
+        data = json.loads(text.strip())
+        try:
+            return cls(
+                feedback=str(data["feedback"]).strip(),
+                technical_score=max(0, min(100, int(data["technical_score"]))),
+                relevance_score=max(0, min(100, int(data["relevance_score"]))),
+                confidence_score=max(0, min(100, int(data["confidence_score"]))),
+                improvement_suggestions=[str(s).strip() for s in data["improvement_suggestions"]],
+                expected_answer=str(data["expected_answer"]).strip()
+            )
+        except (KeyError, TypeError) as e:
+            raise ValueError(f"Incomplete answer evaluation: {e}") from e
+
+    def to_review(self) -> Dict[str, Any]:
+        """The dict shape `QuestionGenerator.parse_review` returns."""
+        review = asdict(self)
+        review["proficiency"] = self.proficiency
+        return review
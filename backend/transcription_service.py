@@ -0,0 +1,140 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+import metrics
+
+
+@dataclass(frozen=True)
+class DecodingMode:
+    name: str
+    beam_size: Optional[int]  # None = greedy
+    word_timestamps: bool
+    int8: bool
+
+
+DECODING_MODES = {
+    "accurate": DecodingMode("accurate", beam_size=5, word_timestamps=True, int8=False),
+    "balanced": DecodingMode("balanced", beam_size=None, word_timestamps=True, int8=False),
+    "fast": DecodingMode("fast", beam_size=None, word_timestamps=False, int8=True),
+}
+
+
+class TranscriptionBusy(Exception):
+    """Raised when the transcription queue is full; callers should retry later."""
+
+
+# Per-process AudioTranscriber replicas keyed by weight precision, created on first use
+_worker_model_size = None
+_worker_transcribers = {}
+
+
+def _init_worker(model_size: str, torch_threads: int):
+    global _worker_model_size
+    import torch
+
+    torch.set_num_threads(torch_threads)
+    _worker_model_size = model_size
+
+
+def _worker_transcriber(int8: bool):
+    from voice_processor import AudioTranscriber
+
+    transcriber = _worker_transcribers.get(int8)
+    if transcriber is None:
+        transcriber = AudioTranscriber(_worker_model_size, int8=int8)
+        _worker_transcribers[int8] = transcriber
+    return transcriber
+
+
+def _warm_worker(int8: bool) -> bool:
+    return _worker_transcriber(int8) is not None
+
+
+def _transcribe_in_worker(audio_path: str, mode: DecodingMode) -> Dict[str, Any]:
+    transcriber = _worker_transcriber(mode.int8)
+    return transcriber.transcribe(
+        audio_path,
+        beam_size=mode.beam_size,
+        word_timestamps=mode.word_timestamps
+    )
+
+
+class TranscriptionService:
+    def __init__(self, model_size: str = "base", replicas: int = 2,
+                 max_queue: int = 8, default_mode: str = "balanced"):
+        """
+        Pool of Whisper replicas in separate processes with a bounded queue.
+        :param model_size: Whisper model size loaded by every replica.
+        :param replicas: Number of worker processes (each holds its own model).
+        :param max_queue: Requests allowed to wait beyond the ones being decoded.
+        :param default_mode: Name of the DecodingMode used when none is given.
+        """
+        if default_mode not in DECODING_MODES:
+            raise ValueError(f"Unknown decoding mode '{default_mode}'")
+
+        self.model_size = model_size
+        self.replicas = max(1, replicas)
+        self.default_mode = default_mode
+        self._slots = threading.BoundedSemaphore(self.replicas + max(0, max_queue))
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        self._in_flight = 0
+        self._in_flight_lock = threading.Lock()
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._pool_lock:
+            if self._pool is None:
+                torch_threads = max(1, (os.cpu_count() or 1) // self.replicas)
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.replicas,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(self.model_size, torch_threads)
+                )
+            return self._pool
+
+    def warm_up(self):
+        """Start every replica and load the default mode's weights in each."""
+        pool = self._get_pool()
+        int8 = DECODING_MODES[self.default_mode].int8
+        futures = [pool.submit(_warm_worker, int8) for _ in range(self.replicas)]
+        for future in futures:
+            future.result()
+
+    def submit(self, audio_path: str, mode: Optional[str] = None) -> Future:
+        """Queue a transcription; raises TranscriptionBusy instead of queueing without bound."""
+        decoding_mode = DECODING_MODES[mode or self.default_mode]
+        if not self._slots.acquire(blocking=False):
+            raise TranscriptionBusy("Transcription queue is full")
+
+        try:
+            future = self._get_pool().submit(_transcribe_in_worker, audio_path, decoding_mode)
+        except Exception:
+            self._slots.release()
+            raise
+        with self._in_flight_lock:
+            self._in_flight += 1
+        future.add_done_callback(self._release)
+        return future
+
+    def _release(self, _future: Future):
+        with self._in_flight_lock:
+            self._in_flight -= 1
+        self._slots.release()
+
+    def pending(self) -> int:
+        """Transcriptions queued or being decoded."""
+        with self._in_flight_lock:
+            return self._in_flight
+
+    def transcribe(self, audio_path: str, mode: Optional[str] = None) -> Dict[str, Any]:
+        with metrics.timed("whisper"):
+            return self.submit(audio_path, mode).result()
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
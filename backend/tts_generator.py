@@ -1,16 +1,28 @@
 import os
-from TTS.api import TTS
+from tts_service import AudioCache, TTSService
+import config
 
-tts = TTS(model_name="tts_models/en/ljspeech/tacotron2-DDC", progress_bar=False)
+tts_service = TTSService(
+    AudioCache(config.TTS_CACHE_DIR, max_bytes=config.TTS_CACHE_MAX_MB * 1024 * 1024),
+    model_name=config.TTS_MODEL_NAME,
+    max_workers=config.TTS_WORKERS
+)
 
-def generate_audio_questions(questions, output_dir="static/audio_questions"):
+def iter_audio_questions(questions, output_dir="static/audio_questions"):
+    """Yield (index, wav_path) for each question as soon as its audio is ready."""
     os.makedirs(output_dir, exist_ok=True)
-    audio_files = []
+    audio_files = [
+        os.path.join(output_dir, f"question_{i+1}.wav")
+        for i in range(len(questions))
+    ]
+    yield from tts_service.synthesize_iter(questions, audio_files)
 
-    for i, question in enumerate(questions):
-        filename = f"question_{i+1}.wav"
-        filepath = os.path.join(output_dir, filename)
-        tts.tts_to_file(text=question, file_path=filepath)
-        audio_files.append(filepath)
+def generate_audio_questions(questions, output_dir="static/audio_questions"):
+    os.makedirs(output_dir, exist_ok=True)
+    audio_files = [
+        os.path.join(output_dir, f"question_{i+1}.wav")
+        for i in range(len(questions))
+    ]
 
+    tts_service.synthesize_many(questions, audio_files)
     return audio_files
@@ -0,0 +1,222 @@
+import hashlib
+import multiprocessing
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Iterator, List, Optional, Tuple
+from artifact_store import atomic_output, temp_path_for
+import metrics
+
+WARM_UP_TIMEOUT = 600  # Seconds warm_up waits for every worker to load its model
+
+# Per-process Tacotron2 instance, created by the pool initializer
+_worker_tts = None
+_warm_barrier = None
+
+
+def _init_worker(model_name: str, torch_threads: int, warm_barrier):
+    global _worker_tts, _warm_barrier
+    import torch
+    from TTS.api import TTS
+
+    # Keep N workers from each grabbing every core
+    torch.set_num_threads(torch_threads)
+    _worker_tts = TTS(model_name=model_name, progress_bar=False)
+    _warm_barrier = warm_barrier
+
+
+def _warm_worker() -> bool:
+    # Blocking here keeps this worker from taking another warm-up task, so N tasks need N loaded workers
+    _warm_barrier.wait(WARM_UP_TIMEOUT)
+    return _worker_tts is not None
+
+
+def _remove_quietly(path: str):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _discard_output(future):
+    if not future.cancelled() and future.exception() is None:
+        _remove_quietly(future.result())
+
+
+def _synthesize_in_worker(text: str, file_path: str) -> str:
+    try:
+        _worker_tts.tts_to_file(text=text, file_path=file_path)
+    except BaseException:
+        _remove_quietly(file_path)
+        raise
+    return file_path
+
+
+class AudioCache:
+    def __init__(self, cache_dir: str, max_bytes: int):
+        """
+        Content-addressed on-disk cache of synthesized audio with size-based LRU eviction.
+        :param cache_dir: Directory holding cached clips.
+        :param max_bytes: Total size budget; least recently used clips are evicted beyond it.
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def path_for(self, text: str, voice: str, ext: str) -> str:
+        digest = hashlib.sha256(f"{voice}\0{text}".encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.{ext}")
+
+    def get(self, text: str, voice: str, ext: str) -> Optional[str]:
+        path = self.path_for(text, voice, ext)
+        try:
+            os.utime(path)  # mtime doubles as the LRU timestamp
+            return path
+        except FileNotFoundError:
+            return None
+
+    def put(self, text: str, voice: str, ext: str, src_path: str) -> str:
+        path = self.path_for(text, voice, ext)
+        with atomic_output(path) as tmp_path:
+            shutil.copyfile(src_path, tmp_path)
+        self._evict()
+        return path
+
+    def _evict(self):
+        with self._lock:
+            entries = []
+            total = 0
+            for entry in os.scandir(self.cache_dir):
+                if not entry.is_file() or entry.name.startswith("."):
+                    continue
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+
+            entries.sort()
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                    total -= size
+                except OSError:
+                    pass
+
+
+class TTSService:
+    def __init__(self, cache: AudioCache, model_name: str, max_workers: int):
+        """
+        Synthesize utterances concurrently, one Tacotron2 model per worker process,
+        and serve repeated texts from the audio cache.
+        :param cache: Shared audio cache.
+        :param model_name: Coqui TTS model loaded by each worker.
+        :param max_workers: Number of synthesis processes (bounded by available cores).
+        """
+        self.cache = cache
+        self.model_name = model_name
+        self.max_workers = max(1, min(max_workers, os.cpu_count() or 1))
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        # gTTS is network-bound, so threads are enough
+        self._io_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="gtts")
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._pool_lock:
+            if self._pool is None:
+                torch_threads = max(1, (os.cpu_count() or 1) // self.max_workers)
+                context = multiprocessing.get_context("spawn")
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=context,
+                    initializer=_init_worker,
+                    initargs=(self.model_name, torch_threads, context.Barrier(self.max_workers))
+                )
+            return self._pool
+
+    def warm_up(self):
+        """
+        Start every worker process and wait until each has loaded its model. Each warm-up task
+        waits on a barrier sized to the pool, so one idle worker cannot drain them all.
+        """
+        pool = self._get_pool()
+        futures = [pool.submit(_warm_worker) for _ in range(self.max_workers)]
+        for future in futures:
+            future.result()
+
+    def synthesize_iter(self, texts: List[str], output_paths: List[str]) -> Iterator[Tuple[int, str]]:
+        """
+        Write one WAV per text, synthesizing only cache misses (in parallel), and
+        yield (index, path) in input order as soon as each utterance is ready.
+        """
+        futures, pending = [], []
+        try:
+            for text, output_path in zip(texts, output_paths):
+                cached = self.cache.get(text, self.model_name, "wav")
+                metrics.CACHE_LOOKUPS.inc(cache="tts_audio", result="hit" if cached else "miss")
+                if cached:
+                    with atomic_output(output_path) as tmp_path:
+                        shutil.copyfile(cached, tmp_path)
+                    futures.append(None)
+                else:
+                    # Workers write to a temp sibling; readers never see a half-written WAV
+                    tmp_path = temp_path_for(output_path)
+                    future = self._get_pool().submit(_synthesize_in_worker, text, tmp_path)
+                    # Clip latency from submission, so it includes time queued behind other clips
+                    submitted = time.perf_counter()
+                    future.add_done_callback(lambda _, t=submitted: metrics.STAGE_SECONDS.observe(
+                        time.perf_counter() - t, stage="tts_clip"))
+                    futures.append(future)
+                    pending.append(future)
+
+            for i, (text, future) in enumerate(zip(texts, futures)):
+                if future is not None:
+                    pending.remove(future)
+                    tmp_path = future.result()  # a failed worker has already removed its temp file
+                    try:
+                        self.cache.put(text, self.model_name, "wav", tmp_path)
+                        os.replace(tmp_path, output_paths[i])
+                    finally:
+                        _remove_quietly(tmp_path)  # no-op once replaced
+                yield i, output_paths[i]
+        finally:
+            # After a failure or an abandoned iterator, drop queued clips and the output of running ones
+            for future in pending:
+                if not future.cancel():
+                    future.add_done_callback(_discard_output)
+
+    def synthesize_many(self, texts: List[str], output_paths: List[str]) -> List[str]:
+        """Write one WAV per text and return once all of them exist."""
+        for _ in self.synthesize_iter(texts, output_paths):
+            pass
+        return output_paths
+
+    def synthesize_gtts_many(self, texts: List[str], output_paths: List[str]) -> List[str]:
+        """Write one gTTS MP3 per text concurrently, reusing cached clips."""
+        futures = [
+            self._io_pool.submit(self._synthesize_gtts, text, output_path)
+            for text, output_path in zip(texts, output_paths)
+        ]
+        return [f.result() for f in futures]
+
+    def _synthesize_gtts(self, text: str, output_path: str) -> str:
+        from gtts import gTTS
+
+        cached = self.cache.get(text, "gtts-en", "mp3")
+        metrics.CACHE_LOOKUPS.inc(cache="gtts_audio", result="hit" if cached else "miss")
+        with atomic_output(output_path) as tmp_path:
+            if cached:
+                shutil.copyfile(cached, tmp_path)
+            else:
+                with metrics.timed("gtts_clip"):
+                    gTTS(text).save(tmp_path)
+                self.cache.put(text, "gtts-en", "mp3", tmp_path)
+        return output_path
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+        self._io_pool.shutdown(wait=False)
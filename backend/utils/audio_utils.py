@@ -0,0 +1,55 @@
+import struct
+import wave
+from typing import Iterator
+
+# Streamed WAVs don't know their final length; players treat this as "until EOF"
+STREAMING_DATA_SIZE = 0xFFFFFFFF - 36
+
+
+def wav_stream_header(sample_rate: int, channels: int = 1, sample_width: int = 2) -> bytes:
+    """
+    Build a 44-byte PCM WAV header for a stream of unknown length.
+    :param sample_rate: Frames per second.
+    :param channels: Number of interleaved channels.
+    :param sample_width: Bytes per sample (2 for 16-bit PCM).
+    :return: Header bytes to send before the first PCM chunk.
+    """
+    byte_rate = sample_rate * channels * sample_width
+    block_align = channels * sample_width
+    return (
+        b"RIFF" + struct.pack("<I", STREAMING_DATA_SIZE + 36) + b"WAVE"
+        + b"fmt " + struct.pack("<IHHIIHH", 16, 1, channels, sample_rate, byte_rate, block_align, sample_width * 8)
+        + b"data" + struct.pack("<I", STREAMING_DATA_SIZE)
+    )
+
+
+def wav_params(path: str):
+    """Return (sample_rate, channels, sample_width) of a WAV file."""
+    with wave.open(path, "rb") as wav:
+        return wav.getframerate(), wav.getnchannels(), wav.getsampwidth()
+
+
+def iter_wav_frames(path: str, chunk_frames: int = 4096) -> Iterator[bytes]:
+    """Yield the raw PCM data of a WAV file in fixed-size chunks."""
+    with wave.open(path, "rb") as wav:
+        while True:
+            frames = wav.readframes(chunk_frames)
+            if not frames:
+                break
+            yield frames
+
+
+def iter_silence(duration_ms: int, sample_rate: int, channels: int = 1,
+                 sample_width: int = 2, chunk_ms: int = 100) -> Iterator[bytes]:
+    """Yield `duration_ms` of PCM silence without materializing it in one buffer."""
+    bytes_per_ms = sample_rate * channels * sample_width / 1000.0
+    block_align = channels * sample_width
+    chunk = b"\x00" * (int(bytes_per_ms * chunk_ms) // block_align * block_align)
+    remaining = int(bytes_per_ms * duration_ms) // block_align * block_align
+    while remaining > 0:
+        if remaining >= len(chunk):
+            yield chunk
+            remaining -= len(chunk)
+        else:
+            yield chunk[:remaining]
+            remaining = 0
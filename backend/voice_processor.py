@@ -1,23 +1,57 @@
 import whisper
-from typing import Dict, Any, List
+import torch
+from typing import Dict, Any, List, Optional
+from keyword_index import load_keyword_index
+from speech_analytics import analyze_words
+import config
+
+
+def quantize_whisper_int8(model):
+    """
+    Dynamically quantize Whisper's linear layers to int8 for CPU inference.
+    Whisper subclasses nn.Linear, which quantize_dynamic does not recognise,
+    so those modules are downcast to plain nn.Linear first.
+    """
+    for module in model.modules():
+        if isinstance(module, whisper.model.Linear):
+            module.__class__ = torch.nn.Linear
+    return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
 
 
 class AudioTranscriber:
-    def __init__(self, model_size: str = "base"):
+    def __init__(self, model_size: str = "base", int8: bool = False):
         """
         Initialize the Whisper model for audio transcription.
         :param model_size: Size of the Whisper model to load (e.g., "base", "small", "medium", "large").
+        :param int8: Use dynamically int8-quantized weights (CPU only).
         """
-        self.model = whisper.load_model(model_size)
+        device = "cpu" if int8 else None
+        self.model = whisper.load_model(model_size, device=device)
+        if int8:
+            self.model = quantize_whisper_int8(self.model)
+        self.fp16 = self.model.device.type == "cuda"
 
-    def transcribe(self, audio_path: str) -> Dict[str, Any]:
+    def transcribe(self, audio_path: str, beam_size: Optional[int] = None,
+                   word_timestamps: bool = True) -> Dict[str, Any]:
         """
         Transcribe the audio file and return the result with timestamps and language.
         :param audio_path: Path to the input audio file.
+        :param beam_size: Beam width; None decodes greedily with temperature 0 and no fallback.
+        :param word_timestamps: Whether to compute word-level timestamps (extra cross-attention pass).
         :return: Dictionary containing transcribed text, detected language, and word-level timestamps.
         """
+        if beam_size:
+            decode_options = {"beam_size": beam_size, "best_of": beam_size}
+        else:
+            decode_options = {"temperature": 0.0}
+
         try:
-            result = self.model.transcribe(audio_path, word_timestamps=True)
+            result = self.model.transcribe(
+                audio_path,
+                word_timestamps=word_timestamps,
+                fp16=self.fp16,
+                **decode_options
+            )
             words = [word for segment in result.get("segments", []) for word in segment.get("words", [])]
 
             return {
@@ -36,6 +70,7 @@ class AudioTranscriber:
     def analyze(self, transcription: Dict[str, Any]) -> Dict[str, float]:
         """
         Analyze the transcribed speech for filler words, speech rate, and minimum confidence.
+        See speech_analytics.analyze_words for the full set of delivery metrics.
         :param transcription: Transcription result from `transcribe` method.
         :return: Dictionary containing analysis metrics.
         """
@@ -48,20 +83,11 @@ class AudioTranscriber:
             }
 
         try:
-            # Count filler words
-            filler_words = sum(1 for w in words if w["word"].lower() in {"um", "uh"})
-
-            # Calculate duration
-            duration = words[-1]["end"] - words[0]["start"]
-            speech_rate = len(words) / duration if duration > 0 else 0.0
-
-            # Confidence (minimum probability)
-            confidence = min(w.get("probability", 1.0) for w in words)
-
+            speech = analyze_words(words, load_keyword_index(config.FILLER_WORDS_FILE).terms)
             return {
-                "filler_words": filler_words,
-                "speech_rate": round(speech_rate, 2),
-                "confidence": round(confidence, 3)
+                "filler_words": speech.filler_count,
+                "speech_rate": round(speech.words_per_minute / 60.0, 2),
+                "confidence": speech.probability_min
             }
 
         except Exception as e:
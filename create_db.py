@@ -1,4 +1,10 @@
-from backend.app import app, db
+import os
+import sys
+
+# The backend modules import each other by bare name (they are run from backend/)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+
+from app import app, db
 
 with app.app_context():
     db.create_all()
@@ -11,7 +11,8 @@ document.getElementById('analyzeBtn').addEventListener('click', async () => {
             method: 'POST',
             body: formData
         });
-        const data = await response.json();
+        const queued = await response.json();
+        const data = await waitForQuestions(queued.status_url);
         initializeQuestionFlow(data.questions);
         displayResumeResults(data);
     } catch (err) {
@@ -20,6 +21,19 @@ document.getElementById('analyzeBtn').addEventListener('click', async () => {
     }
 });
 
+// Resume analysis runs as a background job; poll until its questions are ready
+async function waitForQuestions(statusUrl) {
+    while (true) {
+        const response = await fetch(statusUrl);
+        const job = await response.json();
+        if (!response.ok || job.status === 'failed') {
+            throw new Error(job.error || 'Resume analysis failed');
+        }
+        if (job.result && job.result.questions) return job.result;
+        await new Promise(resolve => setTimeout(resolve, 1000));
+    }
+}
+
 // State Variables
 let currentQuestionIndex = 0;
 let questions = [];
@@ -75,14 +89,43 @@ function playQuestionAudio(questionText) {
 // Audio Recording
 let mediaRecorder;
 let audioChunks = [];
+let answerStream = null;
+
+// Open a server-side stream so chunks are transcribed while the candidate is still speaking
+async function startAnswerStream() {
+    try {
+        const response = await fetch('/api/answer-stream', { method: 'POST' });
+        const data = await response.json();
+        return response.ok ? { id: data.stream_id, uploads: Promise.resolve(), failed: false } : null;
+    } catch (err) {
+        return null;
+    }
+}
+
+// Chunks are uploaded strictly in order; the server appends them to one recording
+function uploadAnswerChunk(stream, blob) {
+    stream.uploads = stream.uploads
+        .then(async () => {
+            const response = await fetch(`/api/answer-stream/${stream.id}/chunk`, {
+                method: 'POST',
+                body: blob
+            });
+            if (!response.ok) stream.failed = true;
+        })
+        .catch(() => { stream.failed = true; });
+}
 
 async function startRecording() {
     try {
         const stream = await navigator.mediaDevices.getUserMedia({ audio: true });
         mediaRecorder = new MediaRecorder(stream);
+        answerStream = await startAnswerStream();
 
         mediaRecorder.ondataavailable = e => {
             audioChunks.push(e.data);
+            if (answerStream && e.data.size > 0) {
+                uploadAnswerChunk(answerStream, e.data);
+            }
         };
 
         mediaRecorder.onstop = async () => {
@@ -91,7 +134,7 @@ async function startRecording() {
             audioChunks = [];
         };
 
-        mediaRecorder.start();
+        mediaRecorder.start(2000);  // emit a chunk every 2s
         document.getElementById('recordBtn').textContent = "⏹️ Stop Recording";
     } catch (err) {
         alert("Microphone access denied");
@@ -110,10 +153,23 @@ async function processRecording(audioBlob) {
     formData.append('audio', audioBlob, `response_q${currentQuestionIndex + 1}.mp3`);
 
     try {
-        const response = await fetch('/api/process-audio', {
-            method: 'POST',
-            body: formData
-        });
+        let response;
+        const stream = answerStream;
+        answerStream = null;
+        if (stream) await stream.uploads;
+
+        if (stream && !stream.failed) {
+            // Most of the answer is already transcribed; only the tail is left
+            response = await fetch(`/api/answer-stream/${stream.id}/finish`, {
+                method: 'POST',
+                body: new FormData()
+            });
+        } else {
+            response = await fetch('/api/process-audio', {
+                method: 'POST',
+                body: formData
+            });
+        }
         const data = await response.json();
         
         // Display feedback and follow-up